@@ -0,0 +1,103 @@
+'''
+Multithreaded resolve throughput for 1-64 threads, resolving a mix of
+singletons and transients from one provider. Every thread starts on an
+unbuilt provider so lazy plan compilation and singleton construction race
+at the start of each run.
+
+On a free-threaded (no-GIL) build throughput should scale with the number
+of cores, since the read path takes no locks; with the GIL it stays flat.
+
+Usage: python -m benchmarks.di_contention
+'''
+
+import sys
+import threading
+import time
+
+from framework.di.service_collection import ServiceCollection
+from framework.di.service_provider import ServiceProvider
+
+DURATION = 1.0
+THREADS = [1, 2, 4, 8, 16, 32, 64]
+TYPES = 32
+
+
+def create_type(name: str, dependencies: list[type]) -> type:
+    '''
+    Create a type whose constructor takes one annotated parameter per
+    dependency.
+    '''
+
+    namespace = {f'T{i}': dependency for i, dependency in enumerate(dependencies)}
+    params = ', '.join(f'p{i}: T{i}' for i in range(len(dependencies)))
+    source = f'''
+class {name}:
+    def __init__(self{', ' if params else ''}{params}):
+        pass
+'''
+    exec(source, namespace)
+    return namespace[name]
+
+
+def create_provider() -> tuple[ServiceProvider, list[type]]:
+    services = ServiceCollection()
+    types = []
+
+    for i in range(TYPES):
+        singleton = create_type(f'Singleton{i}', types[-1:])
+        services.add_singleton(singleton)
+        transient = create_type(f'Transient{i}', [singleton])
+        services.add_transient(transient)
+        types.extend([singleton, transient])
+
+    return ServiceProvider(services), types
+
+
+def measure(thread_count: int) -> float:
+    '''
+    Returns the total resolves per second across all threads.
+    '''
+
+    provider, types = create_provider()
+    barrier = threading.Barrier(thread_count + 1)
+    stop = threading.Event()
+    counts = [0] * thread_count
+
+    def run(index: int):
+        resolve = provider.resolve
+        count = 0
+        barrier.wait()
+        while not stop.is_set():
+            for _type in types:
+                resolve(_type)
+            count += len(types)
+        counts[index] = count
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if is_gil_enabled else 'disabled'}")
+    print(f"{'threads':<10}{'resolves/s':>14}{'scaling':>10}")
+
+    baseline = None
+    for thread_count in THREADS:
+        throughput = measure(thread_count)
+        baseline = baseline or throughput
+        print(f'{thread_count:<10}{throughput:>14,.0f}{throughput / baseline:>9.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+'''
+Resolve throughput for wide and deep transient graphs, comparing the
+interpreted resolution path (lookup, lifetime branching and recursive
+activation on every call) with the compiled activator table.
+
+Usage: python -m benchmarks.di_resolve
+'''
+
+import time
+
+from framework.di.dependencies import Lifetime
+from framework.di.service_collection import ServiceCollection
+from framework.di.service_provider import ServiceProvider
+from framework.logger import get_logger
+
+logger = get_logger(__name__)
+
+ITERATIONS = 20000
+
+
+def create_type(name: str, dependencies: list[type]) -> type:
+    '''
+    Create a type whose constructor takes one annotated parameter per
+    dependency.
+    '''
+
+    namespace = {f'T{i}': dependency for i, dependency in enumerate(dependencies)}
+    params = ', '.join(f'p{i}: T{i}' for i in range(len(dependencies)))
+    source = f'''
+class {name}:
+    def __init__(self{', ' if params else ''}{params}):
+        pass
+'''
+    exec(source, namespace)
+    return namespace[name]
+
+
+def create_wide_graph(width: int) -> tuple[ServiceCollection, type]:
+    services = ServiceCollection()
+    leaves = [create_type(f'Leaf{i}', []) for i in range(width)]
+    for leaf in leaves:
+        services.add_transient(leaf)
+
+    root = create_type('WideRoot', leaves)
+    services.add_transient(root)
+    return services, root
+
+
+def create_deep_graph(depth: int) -> tuple[ServiceCollection, type]:
+    services = ServiceCollection()
+    current = create_type('Level0', [])
+    services.add_transient(current)
+    for i in range(1, depth):
+        current = create_type(f'Level{i}', [current])
+        services.add_transient(current)
+    return services, current
+
+
+def interpreted_resolve(provider: ServiceProvider, _type: type):
+    '''
+    The per-call resolution path used before plans were compiled at build().
+    '''
+
+    logger.debug(f"Resolving service for type: {_type.__name__}")
+
+    registration = provider._get_registered_dependency(implementation_type=_type)
+    if registration.lifetime == Lifetime.Transient:
+        if registration.factory:
+            return registration.factory(provider)
+        return registration.activate(InterpretedProvider(provider))
+
+    return provider.resolve(_type)
+
+
+class InterpretedProvider:
+    def __init__(self, provider: ServiceProvider):
+        self._provider = provider
+
+    def resolve(self, _type: type):
+        return interpreted_resolve(self._provider, _type)
+
+
+def measure(fn, _type: type) -> float:
+    fn(_type)
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn(_type)
+    return ITERATIONS / (time.perf_counter() - start)
+
+
+def main():
+    scenarios = [
+        ('wide (16)', create_wide_graph(16)),
+        ('wide (64)', create_wide_graph(64)),
+        ('deep (8)', create_deep_graph(8)),
+        ('deep (32)', create_deep_graph(32)),
+    ]
+
+    print(f"{'graph':<12}{'interpreted/s':>16}{'compiled/s':>16}{'speedup':>10}")
+    for name, (services, root) in scenarios:
+        provider = ServiceProvider(services).build()
+
+        interpreted = measure(lambda t: interpreted_resolve(provider, t), root)
+        compiled = measure(provider.resolve, root)
+
+        print(f'{name:<12}{interpreted:>16,.0f}{compiled:>16,.0f}{compiled / interpreted:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+'''
+Validation time for a synthetic composition root of 5,000 registrations,
+comparing the previous list-based topological sort (queue.pop(0)) with the
+deque-based O(V+E) sort, the full cold validation, a rebuild that reuses
+the build order cached on the collection, and cycle diagnostics.
+
+Usage: python -m benchmarks.di_validate
+'''
+
+import random
+import time
+
+from framework.di.exceptions import DependencyCycleError
+from framework.di.service_collection import ServiceCollection
+from framework.di.service_provider import ServiceProvider
+
+REGISTRATIONS = 5000
+MAX_DEPENDENCIES = 4
+
+
+def create_type(name: str, dependencies: list[type]) -> type:
+    '''
+    Create a type whose constructor takes one annotated parameter per
+    dependency.
+    '''
+
+    namespace = {f'T{i}': dependency for i, dependency in enumerate(dependencies)}
+    params = ', '.join(f'p{i}: T{i}' for i in range(len(dependencies)))
+    source = f'''
+class {name}:
+    def __init__(self{', ' if params else ''}{params}):
+        pass
+'''
+    exec(source, namespace)
+    return namespace[name]
+
+
+def create_service_collection(count: int) -> ServiceCollection:
+    '''
+    Singletons depending on up to MAX_DEPENDENCIES earlier singletons.
+    '''
+
+    random.seed(0)
+    services = ServiceCollection()
+    types = []
+    for i in range(count):
+        dependencies = random.sample(types, min(len(types), random.randint(0, MAX_DEPENDENCIES)))
+        _type = create_type(f'Service{i}', dependencies)
+        services.add_singleton(_type)
+        types.append(_type)
+    return services
+
+
+def legacy_topological_sort(graph: dict) -> list:
+    '''
+    The topological sort used before the O(V+E) validator.
+    '''
+
+    result = []
+    in_degree = dict(graph['in_degree'])
+    queue = [node for node in graph['nodes']
+             if node.is_parameterless or in_degree.get(node, 0) == 0]
+    visited = set()
+
+    while queue:
+        current = queue.pop(0)
+        result.append(current)
+        visited.add(current)
+        for neighbor in graph['edges'][current]:
+            in_degree[neighbor] -= 1
+            if in_degree[neighbor] == 0:
+                queue.append(neighbor)
+
+    return result if len(visited) == len(graph['nodes']) else None
+
+
+def measure(fn, iterations: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    services = create_service_collection(REGISTRATIONS)
+    provider = ServiceProvider(services)
+    graph = provider._create_dependency_graph(provider._dependencies)
+    edges = sum(len(dependents) for dependents in graph['edges'].values())
+
+    print(f'{REGISTRATIONS} registrations, {edges} edges')
+    print(f"{'legacy sort':<28}{measure(lambda: legacy_topological_sort(graph)):>10.2f} ms")
+    print(f"{'deque sort':<28}{measure(lambda: provider._topological_sort(graph)):>10.2f} ms")
+
+    def validate_cold():
+        services._validated_build_order = None
+        ServiceProvider(services)._validate_and_order()
+
+    print(f"{'validate (cold)':<28}{measure(validate_cold):>10.2f} ms")
+
+    ServiceProvider(services)._validate_and_order()
+    print(f"{'validate (cached)':<28}{measure(lambda: ServiceProvider(services)._validate_and_order()):>10.2f} ms")
+
+    # Add a ring of registrations each requiring the next
+    cyclic = create_service_collection(REGISTRATIONS)
+    ring = [create_type(f'Ring{i}', [object]) for i in range(100)]
+    for i, _type in enumerate(ring):
+        _type.__init__.__annotations__['p0'] = ring[(i + 1) % len(ring)]
+    for _type in ring:
+        cyclic.add_singleton(_type)
+
+    def validate_cyclic():
+        try:
+            ServiceProvider(cyclic)._validate_and_order()
+        except DependencyCycleError:
+            pass
+
+    print(f"{'validate (with cycles)':<28}{measure(validate_cyclic):>10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
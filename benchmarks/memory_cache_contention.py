@@ -0,0 +1,84 @@
+'''
+Multithreaded MemoryCache throughput for 1-16 threads with a 90% read, 10%
+write mix over a bounded key space, comparing one shard (a single lock, as
+before lock striping) with the default sharded store. A third mode splits
+the threads across two namespaces, as two subsystems with their own caches
+would be, so they never share a lock.
+
+With the GIL, striping mostly removes lock handoff stalls between threads;
+on a free-threaded (no-GIL) build throughput should scale with the number
+of shards.
+
+Usage: python -m benchmarks.memory_cache_contention
+'''
+
+import random
+import sys
+import threading
+import time
+
+from framework.caching import MemoryCache
+
+DURATION = 1.0
+THREADS = [1, 2, 4, 8, 16]
+KEYS = 10_000
+WRITE_RATIO = 0.1
+
+
+def measure(caches: list[MemoryCache], thread_count: int) -> float:
+    '''
+    Returns the total operations per second across all threads. Thread i
+    uses caches[i % len(caches)].
+    '''
+
+    barrier = threading.Barrier(thread_count + 1)
+    stop = threading.Event()
+    counts = [0] * thread_count
+
+    def run(index: int):
+        cache = caches[index % len(caches)]
+        rng = random.Random(index)
+        keys = [f'key-{rng.randrange(KEYS)}' for _ in range(1024)]
+        writes = [rng.random() < WRITE_RATIO for _ in range(1024)]
+        count = 0
+        barrier.wait()
+        while not stop.is_set():
+            for key, write in zip(keys, writes):
+                if write:
+                    cache.set(key, count, ttl=60)
+                else:
+                    cache.get(key)
+            count += len(keys)
+        counts[index] = count
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    time.sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"python {sys.version.split()[0]}, GIL {'enabled' if is_gil_enabled else 'disabled'}")
+    print(f"{'threads':<10}{'1 shard ops/s':>16}{'sharded ops/s':>16}{'namespaces ops/s':>19}")
+
+    for thread_count in THREADS:
+        single = measure([MemoryCache(max_entries=KEYS, shards=1)], thread_count)
+        sharded = measure([MemoryCache(max_entries=KEYS)], thread_count)
+        namespaced = measure(
+            [MemoryCache(max_entries=KEYS, namespace=f'benchmark-{thread_count}-a'),
+             MemoryCache(max_entries=KEYS, namespace=f'benchmark-{thread_count}-b')],
+            thread_count)
+        print(f'{thread_count:<10}{single:>16,.0f}{sharded:>16,.0f}{namespaced:>19,.0f}')
+
+
+if __name__ == '__main__':
+    main()
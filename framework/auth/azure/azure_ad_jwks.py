@@ -5,7 +5,7 @@ import requests
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
-from framework.caching import MemoryCache
+from framework.caching import MemoryCache, memoize
 from framework.exceptions.nulls import ArgumentNullException
 from framework.logger.providers import get_logger
 from framework.utilities.iter_utils import first
@@ -30,7 +30,7 @@ class AzureJwksProvider:
         tenant_id: str
     ):
         self._tenant_id = tenant_id
-        self._cache = MemoryCache()
+        self._cache = MemoryCache(namespace='azure-jwks')
 
         ArgumentNullException.if_none_or_whitespace(tenant_id, 'tenant_id')
 
@@ -49,13 +49,15 @@ class AzureJwksProvider:
         decoded = base64.urlsafe_b64decode(self._ensure_bytes(val) + b'==')
         return int.from_bytes(decoded, 'big')
 
+    @memoize(maxsize=64, key=lambda self, jwk: (jwk['n'], jwk['e']))
     def _rsa_pem_from_jwk(
         self,
         jwk: str
     ) -> bytes:
         '''
         Decode the PEM data from the token signing keys
-        to use to verify
+        to use to verify, memoized by key modulus and
+        exponent
         '''
 
         return RSAPublicNumbers(
@@ -80,22 +82,31 @@ class AzureJwksProvider:
     def _get_azure_jwks(
         self
     ):
-        cached = self._cache.get(
-            key=f'{self.__class__.__name__}-jwks-discovery')
+        '''
+        Get the token signing keys from the discovery endpoint,
+        cached for a day. Concurrent requests on a miss share a
+        single fetch
+        '''
 
-        if cached is not None:
-            return cached
+        return self._cache.get_or_set(
+            key=f'{self.__class__.__name__}-jwks-discovery-{self._tenant_id}',
+            loader=self._fetch_azure_jwks,
+            ttl=60 * 60 * 24)
 
+    def _fetch_azure_jwks(
+        self
+    ):
         response = requests.get(
             url=f'https://login.microsoftonline.com/{self._tenant_id}/discovery/v2.0/keys')
 
-        data = response.json()
-        keys = data.get('keys')
+        # Raise rather than return an empty key set, so a failed fetch is
+        # only cached for the negative TTL rather than the full day
+        response.raise_for_status()
 
-        self._cache.set(
-            key=f'{self.__class__.__name__}-jwks-discovery',
-            value=keys,
-            ttl=60 * 60 * 24)
+        keys = response.json().get('keys')
+        if not keys:
+            raise AzureJwksKeyException(
+                f"No signing keys returned for tenant '{self._tenant_id}'")
 
         return keys
 
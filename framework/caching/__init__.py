@@ -1 +1,3 @@
-from framework.caching.memory_cache import MemoryCache
+from framework.caching.memoize import memoize, memoize_async
+from framework.caching.memory_cache import (CacheStats, EvictionPolicy,
+                                            MemoryCache)
@@ -0,0 +1,85 @@
+from typing import Hashable
+
+# Odd 64-bit multipliers, one per sketch row
+SEEDS = (
+    0x9E3779B97F4A7C15,
+    0xC2B2AE3D27D4EB4F,
+    0x165667B19E3779F9,
+    0xD6E8FEB86659FD93
+)
+
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+# Counters saturate at the largest 4-bit value
+MAX_COUNT = 15
+
+
+class FrequencySketch:
+    '''
+    A count-min sketch estimating how often each key has been seen, used by
+    the TinyLFU admission policy. Counters saturate at 15 and are halved
+    once the sketch has seen ten times its width in keys, so the estimates
+    favor recent popularity.
+    '''
+
+    def __init__(
+        self,
+        capacity: int
+    ):
+        '''
+        Initializes a FrequencySketch.
+
+        `capacity`: The expected number of distinct keys (the width of the
+            sketch is the next power of two).
+        '''
+
+        width = 1 << max(4, (max(capacity, 1) - 1).bit_length())
+
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in SEEDS]
+        self._sample_size = 10 * width
+        self._additions = 0
+
+    def _get_indexes(
+        self,
+        key: Hashable
+    ) -> list[int]:
+        hashed = hash(key) & MASK_64
+        return [(((hashed * seed) & MASK_64) >> 32) & self._mask
+                for seed in SEEDS]
+
+    def increment(
+        self,
+        key: Hashable
+    ) -> None:
+        '''
+        Records an occurrence of a key.
+
+        `key`: The key.
+        '''
+
+        for row, index in zip(self._rows, self._get_indexes(key)):
+            if row[index] < MAX_COUNT:
+                row[index] += 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._reset()
+
+    def frequency(
+        self,
+        key: Hashable
+    ) -> int:
+        '''
+        Returns the estimated number of recent occurrences of a key.
+
+        `key`: The key.
+        '''
+
+        return min(row[index] for row, index in zip(self._rows, self._get_indexes(key)))
+
+    def _reset(
+        self
+    ) -> None:
+        self._rows = [bytearray(count >> 1 for count in row) for row in self._rows]
+        self._additions //= 2
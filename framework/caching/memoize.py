@@ -0,0 +1,146 @@
+import asyncio
+import math
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional
+
+from framework.caching.memory_cache import CacheStats, MemoryCache
+
+# Separates positional from keyword arguments in a key
+KWARGS_MARK = object()
+
+# Argument types that are their own key when passed alone
+FAST_TYPES = {int, str}
+
+
+def make_key(
+    args: tuple,
+    kwargs: dict
+) -> Hashable:
+    '''
+    Returns the cache key for a call: the argument itself for a single int or
+    str, otherwise a flat tuple of the positional arguments followed by the
+    keyword arguments in the order they were passed.
+
+    `args`: The positional arguments.
+    `kwargs`: The keyword arguments.
+    '''
+
+    if kwargs:
+        return args + (KWARGS_MARK,) + tuple(kwargs.items())
+    if len(args) == 1 and type(args[0]) in FAST_TYPES:
+        return args[0]
+    return args
+
+
+def _create_cache(
+    ttl: Optional[float],
+    maxsize: Optional[int]
+) -> tuple[MemoryCache, float]:
+    if ttl is not None and ttl <= 0:
+        raise ValueError('ttl must be greater than zero')
+
+    cache = MemoryCache(max_entries=maxsize)
+    return cache, ttl if ttl is not None else math.inf
+
+
+def _bind_cache(
+    wrapper: Callable,
+    cache: MemoryCache,
+    get_key: Callable[..., Hashable]
+) -> None:
+    '''
+    Attaches the stats and invalidation functions of a memoized function.
+    '''
+
+    def cache_stats() -> CacheStats:
+        return cache.stats
+
+    def invalidate(*args, **kwargs) -> bool:
+        return cache.delete(get_key(*args, **kwargs))
+
+    wrapper.cache = cache
+    wrapper.cache_stats = cache_stats
+    wrapper.invalidate = invalidate
+    wrapper.clear = cache.clear
+
+
+def memoize(
+    ttl: Optional[float] = None,
+    maxsize: Optional[int] = 128,
+    key: Optional[Callable[..., Hashable]] = None,
+    negative_ttl: Optional[float] = None
+) -> Callable:
+    '''
+    Caches the results of a function in a MemoryCache private to the
+    function, keyed by its arguments. Concurrent calls with the same
+    arguments from several threads run the function once (see
+    MemoryCache.get_or_set()).
+
+    The decorated function exposes cache_stats() (hit, miss and eviction
+    counters), invalidate(*args, **kwargs) to drop the result of one call,
+    and clear() to drop every result.
+
+    `ttl`: The seconds a result is cached for (until evicted if None).
+    `maxsize`: The maximum number of cached results, evicting the least
+        recently used (unbounded if None).
+    `key`: Returns the cache key for the arguments of a call, e.g. for
+        unhashable arguments (see make_key() if None).
+    `negative_ttl`: The seconds an exception raised by the function is
+        cached for (not cached if None).
+    '''
+
+    def decorator(function: Callable) -> Callable:
+        cache, cache_ttl = _create_cache(ttl, maxsize)
+        get_key = key if key is not None else (lambda *args, **kwargs: make_key(args, kwargs))
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            return cache.get_or_set(
+                key=key(*args, **kwargs) if key is not None else make_key(args, kwargs),
+                loader=lambda: function(*args, **kwargs),
+                ttl=cache_ttl,
+                negative_ttl=negative_ttl)
+
+        _bind_cache(wrapper, cache, get_key)
+        return wrapper
+    return decorator
+
+
+def memoize_async(
+    ttl: Optional[float] = None,
+    maxsize: Optional[int] = 128,
+    key: Optional[Callable[..., Hashable]] = None,
+    negative_ttl: Optional[float] = None
+) -> Callable:
+    '''
+    Async variant of memoize() for coroutine functions. Concurrent calls with
+    the same arguments await a single in-flight call (see
+    MemoryCache.get_or_set_async()).
+
+    `ttl`: The seconds a result is cached for (until evicted if None).
+    `maxsize`: The maximum number of cached results, evicting the least
+        recently used (unbounded if None).
+    `key`: Returns the cache key for the arguments of a call, e.g. for
+        unhashable arguments (see make_key() if None).
+    `negative_ttl`: The seconds an exception raised by the function is
+        cached for (not cached if None).
+    '''
+
+    def decorator(function: Callable) -> Callable:
+        if not asyncio.iscoroutinefunction(function):
+            raise TypeError(f"memoize_async requires a coroutine function: '{function.__name__}'")
+
+        cache, cache_ttl = _create_cache(ttl, maxsize)
+        get_key = key if key is not None else (lambda *args, **kwargs: make_key(args, kwargs))
+
+        @wraps(function)
+        async def wrapper(*args, **kwargs) -> Any:
+            return await cache.get_or_set_async(
+                key=key(*args, **kwargs) if key is not None else make_key(args, kwargs),
+                loader=lambda: function(*args, **kwargs),
+                ttl=cache_ttl,
+                negative_ttl=negative_ttl)
+
+        _bind_cache(wrapper, cache, get_key)
+        return wrapper
+    return decorator
@@ -1,33 +1,817 @@
+import asyncio
+import heapq
+import math
+import random
+import sys
 import time
-from threading import Lock
-from typing import Any
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from threading import Event, Lock, Thread
+from typing import Any, Awaitable, Callable, Optional
+
+from framework.caching.frequency_sketch import FrequencySketch
+from framework.logger import get_logger
+
+logger = get_logger(__name__)
+
+# The container depth get_size() descends into
+SIZE_DEPTH = 2
+
+# The width in seconds of the expiry buckets: every key in a bucket is swept
+# together once the end of the bucket has passed
+EXPIRY_RESOLUTION = 1.0
+
+# The number of expiry index slots a write sweeps at most
+WRITE_SWEEP_LIMIT = 8
+
+# The number of expiry index slots swept per lock acquisition by sweep()
+SWEEP_BATCH_SIZE = 256
+
+# The seconds a failed get_or_set() load is cached for by default, and the
+# seconds before a failed background refresh is retried
+NEGATIVE_TTL = 1.0
+
+# The number of threads running background refreshes of sync loaders
+REFRESH_WORKERS = 4
+
+# The number of shards of a store, and the smallest bounds of a shard when
+# the shard count is reduced to fit small bounds
+DEFAULT_SHARD_COUNT = 16
+MIN_SHARD_ENTRIES = 64
+MIN_SHARD_BYTES = 64 * 1024
+
+
+class EvictionPolicy:
+    # Evict the least recently used entry
+    LRU = 'lru'
+    # Evict the least recently used entry, but only admit a new key if it has
+    # been seen more often recently than the entry it would evict
+    TinyLFU = 'tinylfu'
+
+
+def get_size(
+    value: Any,
+    depth: int = SIZE_DEPTH
+) -> int:
+    '''
+    Returns the approximate size of a value in bytes: the size of the object
+    itself plus, for dicts, lists, tuples and sets, the sizes of their items
+    down to a limited depth.
+
+    `value`: The value to measure.
+    `depth`: The number of container levels to descend into.
+    '''
+
+    size = sys.getsizeof(value)
+    if depth <= 0:
+        return size
+
+    if isinstance(value, dict):
+        size += sum(get_size(key, depth - 1) + get_size(item, depth - 1)
+                    for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(get_size(item, depth - 1) for item in value)
+
+    return size
+
+
+# The thread pool created by get_refresh_executor()
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refresh_executor_lock = Lock()
+
+
+def get_refresh_executor() -> ThreadPoolExecutor:
+    '''
+    Returns the thread pool running background refreshes of sync loaders,
+    creating it on first use.
+    '''
+
+    global _refresh_executor
+    with _refresh_executor_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(
+                max_workers=REFRESH_WORKERS,
+                thread_name_prefix='memory-cache-refresh')
+        return _refresh_executor
 
 
 class CacheValue:
     def __init__(
         self,
         value: Any,
-        ttl: int
+        ttl: int,
+        size: int = 0,
+        error: Optional[Exception] = None,
+        soft_ttl: Optional[float] = None
     ):
         self.value = value
         self.ttl = ttl
+        self.size = size
+        # The error of a failed load, cached in place of a value
+        self.error = error
         self.timestamp = time.time()
         self.expiration = self.timestamp + self.ttl
 
+        # Refresh state of entries loaded by get_or_set() with a soft TTL or
+        # early expiration: the loader, the event loop of an async loader,
+        # the time after which a refresh is due, the XFetch beta and the
+        # seconds the load took, and whether a refresh is running
+        self.soft_ttl = soft_ttl
+        self.refresh: Optional[Callable] = None
+        self.refresh_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.refresh_after = (self.timestamp + soft_ttl
+                              if soft_ttl is not None else self.expiration)
+        self.beta: Optional[float] = None
+        self.delta = 0.0
+        self.refreshing = False
+
     def is_expired(
         self
     ) -> bool:
         return self.timestamp + self.ttl < time.time()
 
+    def is_refresh_due(
+        self,
+        now: float
+    ) -> bool:
+        '''
+        Indicates whether a background refresh of the entry is due: once the
+        soft TTL has passed or, with XFetch early expiration, with a
+        probability that rises as expiry approaches, scaled by how long the
+        value took to load (beta * delta).
+
+        `now`: The current time.
+        '''
+
+        if self.refreshing:
+            return False
+        if self.beta is not None:
+            return now - self.delta * self.beta * math.log(1.0 - random.random()) >= self.refresh_after
+        return now >= self.refresh_after
+
+    def get_value(
+        self
+    ) -> Any:
+        '''
+        Returns the cached value, or raises the cached error of a failed load.
+        '''
+
+        if self.error is not None:
+            raise self.error
+        return self.value
+
     def remaining_ttl(
         self
     ) -> float:
-        return time.time() - self.timestamp + self.ttl
+        return self.expiration - time.time()
+
+
+class CacheStats:
+    '''
+    Counters for a cache store.
+    '''
+
+    def __init__(
+        self
+    ):
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+        self.rejections = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def to_dict(
+        self
+    ) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'expirations': self.expirations,
+            'evictions': self.evictions,
+            'evicted_bytes': self.evicted_bytes,
+            'rejections': self.rejections,
+            'refreshes': self.refreshes,
+            'refresh_failures': self.refresh_failures
+        }
+
+
+class CacheStore:
+    '''
+    An LRU-ordered store of cache entries, optionally bounded by entry count
+    and approximate size in bytes. Reads move an entry to the most recently
+    used end and writes evict from the least recently used end, both in O(1).
+
+    Expiry is indexed in buckets of EXPIRY_RESOLUTION seconds: a set of keys
+    per bucket, and a min-heap of bucket ends. A key is added to and removed
+    from its bucket in O(1) as it is written, evicted or expires on read, so
+    the index only holds live keys. Every write sweeps a few slots of the
+    index, and sweep() (or the background sweeper) removes the rest in
+    bounded batches, so keys that are never read again are reclaimed without
+    long pauses.
+    '''
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: str = EvictionPolicy.LRU
+    ):
+        '''
+        Initializes a CacheStore.
+
+        `max_entries`: The maximum number of entries (unbounded if None).
+        `max_bytes`: The maximum approximate size of the entries in bytes
+            (unbounded if None).
+        `policy`: The EvictionPolicy applied when the store is full.
+        '''
+
+        if max_entries is not None and max_entries < 1:
+            raise ValueError('max_entries must be greater than zero')
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError('max_bytes must be greater than zero')
+        if policy not in (EvictionPolicy.LRU, EvictionPolicy.TinyLFU):
+            raise ValueError(f"Unknown eviction policy '{policy}'")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[str, CacheValue] = OrderedDict()
+        self.lock = Lock()
+        self.size = 0
+        self.stats = CacheStats()
+
+        self._sketch = (FrequencySketch(max_entries or 1024)
+                        if policy == EvictionPolicy.TinyLFU else None)
+
+        # The in-flight get_or_set() loads by key
+        self.flights: dict[str, Future] = dict()
+
+        # The keys expiring in each bucket by bucket number, and a min-heap
+        # of the bucket numbers (a number may appear more than once)
+        self._resolution = EXPIRY_RESOLUTION
+        self._expiry_buckets: dict[int, set[str]] = dict()
+        self._expiry_heap: list[int] = []
+
+    def get(
+        self,
+        key: str
+    ) -> Optional[CacheValue]:
+        '''
+        Returns the live entry for a key, removing it if it has expired.
+
+        `key`: The key.
+        '''
+
+        with self.lock:
+            if self._sketch is not None:
+                self._sketch.increment(key)
+
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            if entry.is_expired():
+                self._remove(key, entry)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry
+
+    def set(
+        self,
+        key: str,
+        entry: CacheValue
+    ) -> bool:
+        '''
+        Stores an entry, evicting least recently used entries to stay within
+        the bounds. Returns False if the entry was not admitted.
+
+        `key`: The key.
+        `entry`: The entry.
+        '''
+
+        with self.lock:
+            return self._set(key, entry)
+
+    def join_flight(
+        self,
+        key: str
+    ) -> tuple[Optional[CacheValue], Optional[Future], bool]:
+        '''
+        Returns the live entry for a key if there is one. Otherwise returns
+        the in-flight load of the key, started by this call if there was
+        none, and whether this call started it (the caller must then end it
+        with complete_flight()).
+
+        `key`: The key.
+        '''
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and not entry.is_expired():
+                return entry, None, False
+
+            flight = self.flights.get(key)
+            if flight is not None:
+                return None, flight, False
+
+            flight = self.flights[key] = Future()
+            return None, flight, True
+
+    def complete_flight(
+        self,
+        key: str,
+        entry: Optional[CacheValue]
+    ) -> None:
+        '''
+        Ends the in-flight load of a key, storing its entry (if any) in the
+        same step so that a caller arriving after the load never misses both.
+
+        `key`: The key.
+        `entry`: The loaded entry, or None to store nothing.
+        '''
+
+        with self.lock:
+            del self.flights[key]
+            if entry is not None:
+                self._set(key, entry)
+
+    def delete(
+        self,
+        key: str
+    ) -> bool:
+        '''
+        Removes the entry for a key. Returns False if there was none.
+
+        `key`: The key.
+        '''
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+            self._remove(key, entry)
+            return True
+
+    def clear(
+        self
+    ) -> None:
+        '''
+        Removes every entry.
+        '''
+
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self._expiry_buckets.clear()
+            self._expiry_heap.clear()
+
+    def begin_refresh(
+        self,
+        key: str,
+        entry: CacheValue
+    ) -> bool:
+        '''
+        Claims the background refresh of an entry. Returns False if a refresh
+        is already running or the entry has been replaced or removed, so an
+        entry is refreshed by exactly one caller.
+
+        `key`: The key.
+        `entry`: The entry to refresh.
+        '''
+
+        with self.lock:
+            if entry.refreshing or self.entries.get(key) is not entry:
+                return False
+            entry.refreshing = True
+            return True
+
+    def complete_refresh(
+        self,
+        key: str,
+        entry: CacheValue,
+        refreshed: CacheValue
+    ) -> None:
+        '''
+        Stores the refreshed entry unless the key has been set to another
+        entry while the refresh ran.
+
+        `key`: The key.
+        `entry`: The entry that was refreshed.
+        `refreshed`: The refreshed entry.
+        '''
+
+        with self.lock:
+            current = self.entries.get(key)
+            if current is None or current is entry:
+                self._set(key, refreshed)
+            self.stats.refreshes += 1
+
+    def fail_refresh(
+        self,
+        entry: CacheValue,
+        retry_after: float
+    ) -> None:
+        '''
+        Releases the refresh of an entry after a failed load. The stale value
+        is served until its hard TTL, and the refresh is retried after
+        retry_after seconds.
+
+        `entry`: The entry that failed to refresh.
+        `retry_after`: The seconds before the next refresh attempt.
+        '''
+
+        with self.lock:
+            entry.refresh_after = time.time() + retry_after
+            entry.refreshing = False
+            self.stats.refresh_failures += 1
+
+    def _set(
+        self,
+        key: str,
+        entry: CacheValue
+    ) -> bool:
+        if self._sketch is not None:
+            self._sketch.increment(key)
+
+        existing = self.entries.get(key)
+        if existing is not None:
+            self._remove(key, existing)
+
+        if self.max_bytes is not None and entry.size > self.max_bytes:
+            self.stats.rejections += 1
+            return False
+
+        if (existing is None
+                and self._sketch is not None
+                and self._is_full(entry)
+                and not self._admit(key)):
+            self.stats.rejections += 1
+            return False
+
+        while self.entries and self._is_full(entry):
+            victim_key, victim = next(iter(self.entries.items()))
+            self._remove(victim_key, victim)
+            self.stats.evictions += 1
+            self.stats.evicted_bytes += victim.size
+
+        self.entries[key] = entry
+        self.size += entry.size
+        self._add_expiry(key, entry)
+
+        self._sweep(time.time(), WRITE_SWEEP_LIMIT)
+        return True
+
+    def sweep(
+        self,
+        limit: Optional[int] = None
+    ) -> int:
+        '''
+        Removes expired entries in batches of SWEEP_BATCH_SIZE, releasing the
+        lock between batches. Returns the number of entries removed.
+
+        `limit`: The maximum number of expiry index slots to visit (all
+            expired entries if None).
+        '''
+
+        removed = 0
+        while limit is None or limit > 0:
+            batch = SWEEP_BATCH_SIZE if limit is None else min(limit, SWEEP_BATCH_SIZE)
+            with self.lock:
+                swept, visited = self._sweep(time.time(), batch)
+            removed += swept
+            if visited < batch:
+                break
+            if limit is not None:
+                limit -= visited
+        return removed
+
+    def _add_expiry(
+        self,
+        key: str,
+        entry: CacheValue
+    ) -> None:
+        # Entries without a TTL never expire
+        if entry.expiration == math.inf:
+            return
+
+        bucket_number = math.ceil(entry.expiration / self._resolution)
+        bucket = self._expiry_buckets.get(bucket_number)
+        if bucket is None:
+            bucket = self._expiry_buckets[bucket_number] = set()
+            heapq.heappush(self._expiry_heap, bucket_number)
+        bucket.add(key)
+
+    def _remove_expiry(
+        self,
+        key: str,
+        entry: CacheValue
+    ) -> None:
+        if entry.expiration == math.inf:
+            return
+
+        bucket_number = math.ceil(entry.expiration / self._resolution)
+        bucket = self._expiry_buckets.get(bucket_number)
+        if bucket is not None:
+            bucket.discard(key)
+            # Emptied buckets are dropped now; the heap entry is skipped when
+            # it is reached
+            if not bucket:
+                del self._expiry_buckets[bucket_number]
+
+    def _sweep(
+        self,
+        now: float,
+        limit: int
+    ) -> tuple[int, int]:
+        '''
+        Removes the expired entries of every bucket that has ended, visiting
+        at most limit slots (keys or heap entries). Must be called holding
+        the lock. Returns the number of entries removed and slots visited.
+        '''
+
+        heap = self._expiry_heap
+        removed = 0
+        visited = 0
+
+        while heap and visited < limit:
+            bucket_number = heap[0]
+            if bucket_number * self._resolution > now:
+                break
+
+            visited += 1
+            bucket = self._expiry_buckets.get(bucket_number)
+            if not bucket:
+                heapq.heappop(heap)
+                self._expiry_buckets.pop(bucket_number, None)
+                continue
+
+            key = bucket.pop()
+            entry = self.entries.pop(key)
+            self.size -= entry.size
+            self.stats.expirations += 1
+            removed += 1
+
+        return removed, visited
+
+    def _is_full(
+        self,
+        entry: CacheValue
+    ) -> bool:
+        return ((self.max_entries is not None and len(self.entries) >= self.max_entries)
+                or (self.max_bytes is not None and self.size + entry.size > self.max_bytes))
+
+    def _admit(
+        self,
+        key: str
+    ) -> bool:
+        '''
+        TinyLFU admission: a new key is only admitted over the least recently
+        used entry if it has been seen more often recently.
+        '''
+
+        victim_key = next(iter(self.entries))
+        return self._sketch.frequency(key) > self._sketch.frequency(victim_key)
+
+    def _remove(
+        self,
+        key: str,
+        entry: CacheValue
+    ) -> None:
+        del self.entries[key]
+        self.size -= entry.size
+        self._remove_expiry(key, entry)
+
+
+def get_shard_count(
+    max_entries: Optional[int],
+    max_bytes: Optional[int]
+) -> int:
+    '''
+    Returns the default number of shards for a store: DEFAULT_SHARD_COUNT,
+    reduced for small bounds so every shard keeps at least MIN_SHARD_ENTRIES
+    entries and MIN_SHARD_BYTES bytes (bounds are split evenly across shards,
+    so eviction stays close to a global LRU).
+
+    `max_entries`: The maximum number of entries, or None.
+    `max_bytes`: The maximum approximate size in bytes, or None.
+    '''
+
+    count = DEFAULT_SHARD_COUNT
+    if max_entries is not None:
+        count = min(count, max_entries // MIN_SHARD_ENTRIES)
+    if max_bytes is not None:
+        count = min(count, max_bytes // MIN_SHARD_BYTES)
+    return max(count, 1)
+
+
+class ShardedCacheStore:
+    '''
+    A cache store split into shards by key hash, each with its own lock,
+    LRU order, bounds and expiry index, so that threads working on different
+    keys rarely contend for the same lock.
+    '''
+
+    @property
+    def stats(
+        self
+    ) -> CacheStats:
+        '''
+        The counters of every shard combined.
+        '''
+
+        stats = CacheStats()
+        for shard in self.shards:
+            for name, value in shard.stats.to_dict().items():
+                setattr(stats, name, getattr(stats, name) + value)
+        return stats
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: str = EvictionPolicy.LRU,
+        shards: Optional[int] = None
+    ):
+        '''
+        Initializes a ShardedCacheStore.
+
+        `max_entries`: The maximum number of entries (unbounded if None).
+        `max_bytes`: The maximum approximate size of the entries in bytes
+            (unbounded if None).
+        `policy`: The EvictionPolicy applied when a shard is full.
+        `shards`: The number of shards (see get_shard_count() if None).
+        '''
+
+        if shards is None:
+            shards = get_shard_count(max_entries, max_bytes)
+        if shards < 1:
+            raise ValueError('shards must be greater than zero')
+
+        self.max_bytes = max_bytes
+        self.shards = [
+            CacheStore(
+                max_entries=math.ceil(max_entries / shards) if max_entries is not None else None,
+                max_bytes=math.ceil(max_bytes / shards) if max_bytes is not None else None,
+                policy=policy)
+            for _ in range(shards)]
+
+        self._lock = Lock()
+        self._sweeper: Optional[Thread] = None
+        self._sweeper_stopped = Event()
+
+    def get_shard(
+        self,
+        key: str
+    ) -> CacheStore:
+        '''
+        Returns the shard holding a key.
+
+        `key`: The key.
+        '''
+
+        shards = self.shards
+        return shards[hash(key) % len(shards)] if len(shards) > 1 else shards[0]
+
+    def sweep(
+        self
+    ) -> int:
+        '''
+        Removes every expired entry from each shard in turn. Returns the
+        number of entries removed.
+        '''
+
+        return sum(shard.sweep() for shard in self.shards)
+
+    def clear(
+        self
+    ) -> None:
+        '''
+        Removes every entry from each shard in turn.
+        '''
+
+        for shard in self.shards:
+            shard.clear()
+
+    def start_sweeper(
+        self,
+        interval: float
+    ) -> None:
+        '''
+        Starts a daemon thread sweeping expired entries every interval
+        seconds, if one is not already running.
+
+        `interval`: The seconds between sweeps.
+        '''
+
+        with self._lock:
+            if self._sweeper is not None:
+                return
+
+            self._sweeper_stopped.clear()
+            self._sweeper = Thread(
+                target=self._run_sweeper,
+                args=(interval,),
+                name='memory-cache-sweeper',
+                daemon=True)
+            self._sweeper.start()
+
+    def stop_sweeper(
+        self
+    ) -> None:
+        '''
+        Stops the background sweeper thread and waits for it to exit.
+        '''
+
+        with self._lock:
+            sweeper = self._sweeper
+            self._sweeper = None
+            self._sweeper_stopped.set()
+
+        if sweeper is not None:
+            sweeper.join()
+
+    def _run_sweeper(
+        self,
+        interval: float
+    ) -> None:
+        while not self._sweeper_stopped.wait(interval):
+            self.sweep()
+
+    def __len__(
+        self
+    ) -> int:
+        return sum(len(shard.entries) for shard in self.shards)
 
 
 class MemoryCache:
-    lock = Lock()
-    cache: dict[str, CacheValue] = dict()
+    # The stores of named namespaces, shared by every cache created with the
+    # same namespace
+    _namespaces: dict[str, ShardedCacheStore] = dict()
+    _namespaces_lock = Lock()
+
+    @property
+    def stats(
+        self
+    ) -> CacheStats:
+        '''
+        The hit, miss, expiration and eviction counters of the cache's store.
+        '''
+
+        return self._store.stats
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: str = EvictionPolicy.LRU,
+        sizeof: Callable[[Any], int] = get_size,
+        namespace: Optional[str] = None,
+        shards: Optional[int] = None
+    ):
+        '''
+        Initializes a MemoryCache. Each cache has its own store unless it is
+        created with a namespace, in which case every cache of the namespace
+        shares one store (created with the bounds of the first cache of the
+        namespace).
+
+        `max_entries`: The maximum number of entries, evicting the least
+            recently used entry when exceeded (unbounded if None).
+        `max_bytes`: The maximum approximate size of the cached keys and
+            values in bytes (unbounded if None).
+        `policy`: The EvictionPolicy: LRU, or TinyLFU to only admit new keys
+            seen more often recently than the entry they would evict.
+        `sizeof`: Returns the approximate size of a value in bytes.
+        `namespace`: The name of a store shared across caches, or None for a
+            store private to this cache.
+        `shards`: The number of independently locked shards of the store
+            (see get_shard_count() if None).
+        '''
+
+        if namespace is None:
+            self._store = ShardedCacheStore(
+                max_entries=max_entries,
+                max_bytes=max_bytes,
+                policy=policy,
+                shards=shards)
+        else:
+            with self._namespaces_lock:
+                store = self._namespaces.get(namespace)
+                if store is None:
+                    store = self._namespaces[namespace] = ShardedCacheStore(
+                        max_entries=max_entries,
+                        max_bytes=max_bytes,
+                        policy=policy,
+                        shards=shards)
+            self._store = store
+
+        self._sizeof = sizeof
 
     def get(
         self,
@@ -42,16 +826,10 @@ class MemoryCache:
         undefined or expired.
         '''
 
-        cached = self.cache.get(key)
-
-        # Return none for an undefined key
-        if cached is None:
-            return cached
-
-        # Return none for an expired key
-        if cached.is_expired():
-            del self.cache[key]
+        cached = self._get_entry(self._store.get_shard(key), key)
 
+        # Return none for an undefined or expired key, or a failed load
+        if cached is None or cached.error is not None:
             return None
 
         return cached.value
@@ -64,16 +842,352 @@ class MemoryCache:
     ):
         '''
         Sets a key-value pair in the cache with a specified time-to-live (ttl).
+        In a cache bounded by size, a value larger than the bound of its
+        shard is not cached.
 
         `key`: The key to set in the cache.
         `value`: The value to associate with the key.
         `ttl`: The time-to-live (in seconds) for the key-value pair.
         '''
 
-        self.lock.acquire()
+        self._store.get_shard(key).set(key, self._create_entry(key, value, ttl))
+
+    def delete(
+        self,
+        key: str
+    ) -> bool:
+        '''
+        Removes a key from the cache. Returns False if the key was not cached.
+
+        `key`: The key to remove.
+        '''
+
+        return self._store.get_shard(key).delete(key)
+
+    def clear(
+        self
+    ) -> None:
+        '''
+        Removes every key from the cache's store.
+        '''
+
+        self._store.clear()
+
+    def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: int,
+        negative_ttl: Optional[float] = NEGATIVE_TTL,
+        soft_ttl: Optional[float] = None,
+        beta: Optional[float] = None
+    ) -> Any:
+        '''
+        Returns the value of a key, loading and caching it on a miss. Only one
+        load of a key runs at a time across threads and coroutines (see
+        get_or_set_async()); concurrent callers wait for and share its result.
+        A load that raises is cached for negative_ttl seconds, during which
+        callers get the same error without loading again.
+
+        With a soft TTL, a read (get() or get_or_set()) of a value older than
+        the soft TTL returns the stale value and starts exactly one background
+        refresh on a worker thread; only a value older than the hard TTL is
+        loaded on the caller's path. With beta, the refresh starts early with
+        a probability that rises as expiry approaches (XFetch), spreading
+        refreshes of a hot key across callers and processes. A failed refresh
+        is logged and retried after NEGATIVE_TTL seconds.
+
+        Do not call from a coroutine while the key may be loading through
+        get_or_set_async() on the same event loop, since waiting blocks the
+        loop.
+
+        `key`: The key.
+        `loader`: Returns the value of the key.
+        `ttl`: The time-to-live (in seconds) of the loaded value.
+        `negative_ttl`: The seconds a failed load is cached for (not cached
+            if None or zero).
+        `soft_ttl`: The seconds after which the value is refreshed in the
+            background (not refreshed if None).
+        `beta`: The XFetch early expiration factor (1.0 is typical; larger
+            values refresh earlier), or None.
+        '''
+
+        shard = self._store.get_shard(key)
+        while True:
+            entry = self._get_entry(shard, key)
+            if entry is None:
+                entry, flight, is_owner = shard.join_flight(key)
+            if entry is not None:
+                return entry.get_value()
+
+            if not is_owner:
+                try:
+                    return flight.result()
+                except CancelledError:
+                    # The load was abandoned without a result: load again
+                    continue
+
+            start = time.perf_counter()
+            try:
+                value = loader()
+            except BaseException as ex:
+                self._fail_flight(shard, key, flight, ex, negative_ttl)
+                raise
+
+            entry = self._create_entry(key, value, ttl, soft_ttl)
+            if soft_ttl is not None or beta is not None:
+                self._set_refresh(entry, loader, None, beta, time.perf_counter() - start)
+
+            shard.complete_flight(key, entry)
+            flight.set_result(value)
+            return value
+
+    async def get_or_set_async(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        negative_ttl: Optional[float] = NEGATIVE_TTL,
+        soft_ttl: Optional[float] = None,
+        beta: Optional[float] = None
+    ) -> Any:
+        '''
+        Async variant of get_or_set(), awaiting the loader. Loads of a key
+        from get_or_set() and get_or_set_async() share one flight, so a key
+        is loaded once whether the callers are threads or coroutines. If the
+        coroutine running the load is cancelled, a waiting caller starts the
+        load again. Background refreshes run as tasks on the event loop of
+        the load.
+
+        `key`: The key.
+        `loader`: Returns an awaitable of the value of the key.
+        `ttl`: The time-to-live (in seconds) of the loaded value.
+        `negative_ttl`: The seconds a failed load is cached for (not cached
+            if None or zero).
+        `soft_ttl`: The seconds after which the value is refreshed in the
+            background (not refreshed if None).
+        `beta`: The XFetch early expiration factor (1.0 is typical; larger
+            values refresh earlier), or None.
+        '''
+
+        shard = self._store.get_shard(key)
+        while True:
+            entry = self._get_entry(shard, key)
+            if entry is None:
+                entry, flight, is_owner = shard.join_flight(key)
+            if entry is not None:
+                return entry.get_value()
+
+            if not is_owner:
+                try:
+                    # Shielded so that cancelling this caller does not cancel
+                    # the flight the other callers are waiting on
+                    return await asyncio.shield(asyncio.wrap_future(flight))
+                except asyncio.CancelledError:
+                    if not flight.cancelled():
+                        raise
+                    continue
+
+            start = time.perf_counter()
+            try:
+                value = await loader()
+            except BaseException as ex:
+                self._fail_flight(shard, key, flight, ex, negative_ttl)
+                raise
+
+            entry = self._create_entry(key, value, ttl, soft_ttl)
+            if soft_ttl is not None or beta is not None:
+                self._set_refresh(
+                    entry, loader, asyncio.get_running_loop(), beta, time.perf_counter() - start)
+
+            shard.complete_flight(key, entry)
+            flight.set_result(value)
+            return value
+
+    def _get_entry(
+        self,
+        shard: CacheStore,
+        key: str
+    ) -> Optional[CacheValue]:
+        '''
+        Returns the live entry for a key, starting its background refresh if
+        one is due.
+        '''
+
+        entry = shard.get(key)
+        if entry is not None and entry.refresh is not None and entry.is_refresh_due(time.time()):
+            self._begin_refresh(shard, key, entry)
+        return entry
+
+    def _set_refresh(
+        self,
+        entry: CacheValue,
+        loader: Callable,
+        loop: Optional[asyncio.AbstractEventLoop],
+        beta: Optional[float],
+        delta: float
+    ) -> None:
+        entry.refresh = loader
+        entry.refresh_loop = loop
+        entry.beta = beta
+        entry.delta = delta
+
+    def _begin_refresh(
+        self,
+        shard: CacheStore,
+        key: str,
+        entry: CacheValue
+    ) -> None:
+        if not shard.begin_refresh(key, entry):
+            return
+
+        if entry.refresh_loop is None:
+            get_refresh_executor().submit(self._refresh, shard, key, entry)
+            return
+
+        coroutine = self._refresh_async(shard, key, entry)
+        try:
+            asyncio.run_coroutine_threadsafe(coroutine, entry.refresh_loop)
+        except RuntimeError:
+            # The event loop of the async loader has been closed
+            coroutine.close()
+            shard.fail_refresh(entry, NEGATIVE_TTL)
+
+    def _refresh(
+        self,
+        shard: CacheStore,
+        key: str,
+        entry: CacheValue
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            value = entry.refresh()
+        except Exception as ex:
+            logger.warning(f"Failed to refresh cache key '{key}': {ex}")
+            shard.fail_refresh(entry, NEGATIVE_TTL)
+            return
+
+        self._complete_refresh(shard, key, entry, value, time.perf_counter() - start)
+
+    async def _refresh_async(
+        self,
+        shard: CacheStore,
+        key: str,
+        entry: CacheValue
+    ) -> None:
+        start = time.perf_counter()
+        try:
+            value = await entry.refresh()
+        except Exception as ex:
+            logger.warning(f"Failed to refresh cache key '{key}': {ex}")
+            shard.fail_refresh(entry, NEGATIVE_TTL)
+            return
+
+        self._complete_refresh(shard, key, entry, value, time.perf_counter() - start)
+
+    def _complete_refresh(
+        self,
+        shard: CacheStore,
+        key: str,
+        entry: CacheValue,
+        value: Any,
+        delta: float
+    ) -> None:
+        refreshed = self._create_entry(key, value, entry.ttl, entry.soft_ttl)
+        self._set_refresh(refreshed, entry.refresh, entry.refresh_loop, entry.beta, delta)
+        shard.complete_refresh(key, entry, refreshed)
+
+    def _fail_flight(
+        self,
+        shard: CacheStore,
+        key: str,
+        flight: Future,
+        ex: BaseException,
+        negative_ttl: Optional[float]
+    ) -> None:
+        '''
+        Ends a failed load. An error is cached and passed to the waiting
+        callers; a load interrupted by cancellation (or any other
+        BaseException) is abandoned and the waiting callers load again.
+        '''
+
+        if not isinstance(ex, Exception):
+            shard.complete_flight(key, None)
+            flight.cancel()
+            return
+
+        shard.complete_flight(key, CacheValue(
+            value=None,
+            ttl=negative_ttl,
+            error=ex) if negative_ttl else None)
+        flight.set_exception(ex)
 
-        self.cache[key] = CacheValue(
+    def _create_entry(
+        self,
+        key: str,
+        value: Any,
+        ttl: int,
+        soft_ttl: Optional[float] = None
+    ) -> CacheValue:
+        # Only measured when the cache is bounded by size
+        size = (self._sizeof(key) + self._sizeof(value)
+                if self._store.max_bytes is not None else 0)
+
+        return CacheValue(
             value=value,
-            ttl=ttl)
+            ttl=ttl,
+            size=size,
+            soft_ttl=soft_ttl)
 
-        self.lock.release()
+    def sweep(
+        self
+    ) -> int:
+        '''
+        Removes every expired entry from the cache's store in bounded
+        batches. Returns the number of entries removed.
+        '''
+
+        return self._store.sweep()
+
+    def start_sweeper(
+        self,
+        interval: float = 1.0
+    ) -> None:
+        '''
+        Starts a background thread sweeping expired entries from the cache's
+        store (one per store, shared by every cache of a namespace).
+
+        `interval`: The seconds between sweeps.
+        '''
+
+        self._store.start_sweeper(interval)
+
+    def stop_sweeper(
+        self
+    ) -> None:
+        '''
+        Stops the background sweeper thread of the cache's store.
+        '''
+
+        self._store.stop_sweeper()
+
+    async def run_sweeper_async(
+        self,
+        interval: float = 1.0
+    ) -> None:
+        '''
+        Sweeps expired entries every interval seconds until cancelled, for
+        applications that run it as a task on their event loop instead of a
+        thread. Each batch holds a shard lock only briefly.
+
+        `interval`: The seconds between sweeps.
+        '''
+
+        while True:
+            await asyncio.sleep(interval)
+            self._store.sweep()
+
+    def __len__(
+        self
+    ) -> int:
+        return len(self._store)
@@ -0,0 +1,624 @@
+import asyncio
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Awaitable, Callable, Iterator, List, Optional
+
+from framework.caching.memory_cache import CacheStats
+
+# Identifies a shared cache file and its layout version
+MAGIC = b'FWSMC001'
+
+# The file header: magic, segment count, slots per segment and slot size,
+# padded to HEADER_SIZE bytes
+HEADER = struct.Struct('<8sIII')
+HEADER_SIZE = 64
+
+# The slot header: state, key length, value length, expiration (a Unix
+# timestamp) and key hash, followed by the key and the pickled value
+SLOT = struct.Struct('<BxHIdQ')
+
+EMPTY = 0
+USED = 1
+DELETED = 2
+
+# The number of slots probed for a key from its home slot; a write to a
+# full probe window overwrites the entry expiring first
+PROBE_LIMIT = 8
+
+DEFAULT_SLOTS = 4096
+DEFAULT_SLOT_SIZE = 2048
+DEFAULT_SEGMENTS = 16
+
+# Distinguishes a cached None from a miss
+MISSING = object()
+
+
+def get_directory() -> str:
+    '''
+    Returns the directory shared cache files are created in: /dev/shm where
+    it exists, so the table lives in memory, otherwise the temp directory.
+    '''
+
+    if os.path.isdir('/dev/shm'):
+        return '/dev/shm'
+    return tempfile.gettempdir()
+
+
+def get_key_hash(
+    key: bytes
+) -> int:
+    '''
+    Returns the 64-bit hash of a key. hash() is salted per process, so it
+    cannot locate a key in a table shared by several processes.
+
+    `key`: The encoded key.
+    '''
+
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+class SharedTable:
+    '''
+    A fixed-size hash table of pickled entries in a memory-mapped file,
+    split into segments that are each guarded by a thread lock and a
+    byte-range lock on the file, so one segment is written at a time across
+    threads and processes. A key is stored in one of PROBE_LIMIT slots from
+    its home slot in its segment. Deleted and expired slots are reused by
+    later writes, so the table needs no sweeping.
+
+    Entries are written with the slot marked deleted and the header written
+    last, so a process that dies mid-write leaves a deleted slot rather than
+    a torn entry.
+    '''
+
+    @property
+    def stats(
+        self
+    ) -> CacheStats:
+        '''
+        The counters of every segment combined, for this process.
+        '''
+
+        stats = CacheStats()
+        for segment_stats in self._stats:
+            for name, value in segment_stats.to_dict().items():
+                setattr(stats, name, getattr(stats, name) + value)
+        return stats
+
+    def __init__(
+        self,
+        path: str,
+        slots: int,
+        slot_size: int,
+        segments: int
+    ):
+        '''
+        Opens the table at a path, creating it if it does not exist. An
+        existing table keeps the layout it was created with.
+
+        `path`: The path of the table file.
+        `slots`: The total number of slots.
+        `slot_size`: The size of a slot in bytes.
+        `segments`: The number of independently locked segments.
+        '''
+
+        if slot_size <= SLOT.size:
+            raise ValueError(f'slot_size must be greater than {SLOT.size}')
+
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                header = os.pread(self._fd, HEADER.size, 0)
+                if len(header) < HEADER.size or header[:len(MAGIC)] == bytes(len(MAGIC)):
+                    # A new file, or one whose creator died before writing
+                    # the header
+                    segments = max(1, segments)
+                    header = HEADER.pack(
+                        MAGIC, segments, max(1, math.ceil(slots / segments)), slot_size)
+                    os.ftruncate(self._fd, 0)
+                    os.ftruncate(self._fd, HEADER_SIZE + self._get_table_size(header))
+                    os.pwrite(self._fd, header, 0)
+                elif header[:len(MAGIC)] != MAGIC:
+                    raise ValueError(f"'{path}' is not a shared cache file")
+
+                _, self.segments, self.slots, self.slot_size = HEADER.unpack(header)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+            self._map = mmap.mmap(self._fd, HEADER_SIZE + self._get_table_size(header))
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+        self._locks = [Lock() for _ in range(self.segments)]
+        self._stats = [CacheStats() for _ in range(self.segments)]
+
+        # The loads in flight in this process, by key
+        self.flights: dict[str, Future] = dict()
+        self.flights_lock = Lock()
+
+    @staticmethod
+    def _get_table_size(
+        header: bytes
+    ) -> int:
+        _, segments, slots, slot_size = HEADER.unpack(header)
+        return segments * slots * slot_size
+
+    @contextmanager
+    def _lock(
+        self,
+        segment: int
+    ) -> Iterator[None]:
+        # Record locks are held per process, so the thread lock keeps the
+        # threads of this process out of the segment too
+        with self._locks[segment]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, segment)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, segment)
+
+    def _get_offsets(
+        self,
+        segment: int,
+        key_hash: int
+    ) -> List[int]:
+        base = HEADER_SIZE + segment * self.slots * self.slot_size
+        home = (key_hash >> 32) % self.slots
+        return [base + ((home + index) % self.slots) * self.slot_size
+                for index in range(min(PROBE_LIMIT, self.slots))]
+
+    def _is_key(
+        self,
+        offset: int,
+        key: bytes,
+        key_hash: int
+    ) -> bool:
+        state, key_length, _, _, slot_hash = SLOT.unpack_from(self._map, offset)
+        start = offset + SLOT.size
+        return (state == USED
+                and slot_hash == key_hash
+                and key_length == len(key)
+                and self._map[start:start + key_length] == key)
+
+    def _find(
+        self,
+        offsets: List[int],
+        key: bytes,
+        key_hash: int
+    ) -> Optional[int]:
+        for offset in offsets:
+            if self._map[offset] == EMPTY:
+                return None
+            if self._is_key(offset, key, key_hash):
+                return offset
+        return None
+
+    def get(
+        self,
+        key: bytes
+    ) -> Optional[bytes]:
+        '''
+        Returns the pickled value of a key, or None if it is not cached or
+        has expired.
+
+        `key`: The encoded key.
+        '''
+
+        key_hash = get_key_hash(key)
+        segment = key_hash % self.segments
+        stats = self._stats[segment]
+
+        with self._lock(segment):
+            offset = self._find(self._get_offsets(segment, key_hash), key, key_hash)
+            if offset is None:
+                stats.misses += 1
+                return None
+
+            _, key_length, value_length, expiration, _ = SLOT.unpack_from(self._map, offset)
+            if expiration <= time.time():
+                self._map[offset] = DELETED
+                stats.expirations += 1
+                stats.misses += 1
+                return None
+
+            start = offset + SLOT.size + key_length
+            stats.hits += 1
+            return self._map[start:start + value_length]
+
+    def set(
+        self,
+        key: bytes,
+        value: bytes,
+        ttl: float
+    ) -> bool:
+        '''
+        Writes the pickled value of a key. Returns False if the key and value
+        do not fit in a slot.
+
+        `key`: The encoded key.
+        `value`: The pickled value.
+        `ttl`: The time-to-live in seconds.
+        '''
+
+        key_hash = get_key_hash(key)
+        segment = key_hash % self.segments
+        stats = self._stats[segment]
+
+        if SLOT.size + len(key) + len(value) > self.slot_size:
+            stats.rejections += 1
+            return False
+
+        now = time.time()
+        with self._lock(segment):
+            target = free = victim = None
+            victim_expiration = math.inf
+
+            for offset in self._get_offsets(segment, key_hash):
+                state, _, _, expiration, _ = SLOT.unpack_from(self._map, offset)
+                if state == EMPTY:
+                    free = free if free is not None else offset
+                    break
+                if state == DELETED:
+                    free = free if free is not None else offset
+                    continue
+                if self._is_key(offset, key, key_hash):
+                    target = offset
+                    break
+                if expiration <= now and free is None:
+                    free = offset
+                if victim is None or expiration < victim_expiration:
+                    victim, victim_expiration = offset, expiration
+
+            if target is None:
+                target = free
+            if target is None:
+                target = victim
+                stats.evictions += 1
+                stats.evicted_bytes += self.slot_size
+
+            self._map[target] = DELETED
+            start = target + SLOT.size
+            self._map[start:start + len(key)] = key
+            self._map[start + len(key):start + len(key) + len(value)] = value
+            SLOT.pack_into(self._map, target, USED, len(key), len(value), now + ttl, key_hash)
+
+        return True
+
+    def delete(
+        self,
+        key: bytes
+    ) -> bool:
+        '''
+        Removes a key. Returns False if the key was not cached.
+
+        `key`: The encoded key.
+        '''
+
+        key_hash = get_key_hash(key)
+        segment = key_hash % self.segments
+
+        with self._lock(segment):
+            offset = self._find(self._get_offsets(segment, key_hash), key, key_hash)
+            if offset is None:
+                return False
+
+            self._map[offset] = DELETED
+            return True
+
+    def clear(
+        self
+    ) -> None:
+        '''
+        Removes every key.
+        '''
+
+        segment_size = self.slots * self.slot_size
+        for segment in range(self.segments):
+            base = HEADER_SIZE + segment * segment_size
+            with self._lock(segment):
+                self._map[base:base + segment_size] = bytes(segment_size)
+
+    def close(
+        self
+    ) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+    def __len__(
+        self
+    ) -> int:
+        now = time.time()
+        count = 0
+
+        for segment in range(self.segments):
+            base = HEADER_SIZE + segment * self.slots * self.slot_size
+            with self._lock(segment):
+                for slot in range(self.slots):
+                    state, _, _, expiration, _ = SLOT.unpack_from(
+                        self._map, base + slot * self.slot_size)
+                    if state == USED and expiration > now:
+                        count += 1
+
+        return count
+
+
+class SharedMemoryCache:
+    '''
+    A cache with the MemoryCache API whose entries live in a memory-mapped
+    file shared by every process on the host that opens the same name, e.g.
+    the worker processes of a server, so each value is fetched and stored
+    once per host rather than once per worker.
+
+    Keys are strings and values are pickled, so a value is copied on every
+    read, and mutating it does not change the cached value. Each key and
+    value must fit in a slot (see SharedTable). Writes and deletes are atomic
+    across processes. Concurrent loads of a key in get_or_set() run once per
+    process. Requires POSIX file locking.
+
+    The file is only readable by its owner and holds pickles, so only share
+    a cache between processes that trust each other.
+    '''
+
+    # The tables opened by this process, by path, so caches of the same name
+    # share one mapping and one set of locks
+    _tables: dict[str, SharedTable] = dict()
+    _tables_lock = Lock()
+
+    @property
+    def stats(
+        self
+    ) -> CacheStats:
+        '''
+        The hit, miss, expiration and eviction counters of the cache in this
+        process.
+        '''
+
+        return self._table.stats
+
+    def __init__(
+        self,
+        name: str,
+        slots: int = DEFAULT_SLOTS,
+        slot_size: int = DEFAULT_SLOT_SIZE,
+        segments: int = DEFAULT_SEGMENTS,
+        directory: Optional[str] = None
+    ):
+        '''
+        Initializes a SharedMemoryCache, creating its file if no process has.
+        The file keeps the layout of the process that created it.
+
+        `name`: The name of the cache, shared by the processes using it.
+        `slots`: The maximum number of entries.
+        `slot_size`: The maximum size of a key and its pickled value, plus
+            the 24-byte slot header, in bytes.
+        `segments`: The number of independently locked segments.
+        `directory`: The directory of the cache file (see get_directory()
+            if None).
+        '''
+
+        path = os.path.join(directory or get_directory(), f'framework-cache-{name}')
+
+        with self._tables_lock:
+            table = self._tables.get(path)
+            if table is None:
+                table = self._tables[path] = SharedTable(
+                    path=path,
+                    slots=slots,
+                    slot_size=slot_size,
+                    segments=segments)
+
+        self._table = table
+
+    def get(
+        self,
+        key: str
+    ) -> Any:
+        '''
+        Retrieves the value associated with the given key from the cache.
+
+        `key` (str): The key to retrieve the value for.
+
+        Returns the value associated with the key, or None if the key is
+        undefined or expired.
+        '''
+
+        value = self._get(key)
+        return None if value is MISSING else value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int
+    ) -> bool:
+        '''
+        Sets a key-value pair in the cache with a specified time-to-live (ttl).
+        Returns False if the key and pickled value do not fit in a slot, in
+        which case the value is not cached.
+
+        `key`: The key to set in the cache.
+        `value`: The value to associate with the key.
+        `ttl`: The time-to-live (in seconds) for the key-value pair.
+        '''
+
+        return self._table.set(
+            key.encode(),
+            pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+            ttl)
+
+    def delete(
+        self,
+        key: str
+    ) -> bool:
+        '''
+        Removes a key from the cache. Returns False if the key was not cached.
+
+        `key`: The key to remove.
+        '''
+
+        return self._table.delete(key.encode())
+
+    def clear(
+        self
+    ) -> None:
+        '''
+        Removes every key from the cache, in every process.
+        '''
+
+        self._table.clear()
+
+    def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: int
+    ) -> Any:
+        '''
+        Returns the cached value of a key, or loads, caches and returns it on
+        a miss. Concurrent misses of a key in this process share one load;
+        an exception raised by the loader is raised to every waiting caller
+        and not cached.
+
+        `key`: The key.
+        `loader`: Returns the value of the key.
+        `ttl`: The time-to-live (in seconds) of the loaded value.
+        '''
+
+        value = self._get(key)
+        if value is not MISSING:
+            return value
+
+        flight, is_owner = self._join_flight(key)
+        if not is_owner:
+            return flight.result()
+
+        try:
+            value = loader()
+        except BaseException as ex:
+            self._complete_flight(key, flight, error=ex)
+            raise
+
+        self.set(key, value, ttl)
+        self._complete_flight(key, flight, value=value)
+        return value
+
+    async def get_or_set_async(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int
+    ) -> Any:
+        '''
+        Async variant of get_or_set(), awaiting the loader.
+
+        `key`: The key.
+        `loader`: Returns an awaitable of the value of the key.
+        `ttl`: The time-to-live (in seconds) of the loaded value.
+        '''
+
+        value = self._get(key)
+        if value is not MISSING:
+            return value
+
+        flight, is_owner = self._join_flight(key)
+        if not is_owner:
+            return await asyncio.shield(asyncio.wrap_future(flight))
+
+        try:
+            value = await loader()
+        except BaseException as ex:
+            self._complete_flight(key, flight, error=ex)
+            raise
+
+        self.set(key, value, ttl)
+        self._complete_flight(key, flight, value=value)
+        return value
+
+    def close(
+        self
+    ) -> None:
+        '''
+        Unmaps the cache file in this process, closing every cache of the
+        same name in it. The file and its entries remain for other processes.
+        '''
+
+        with self._tables_lock:
+            if self._tables.get(self._table.path) is self._table:
+                del self._tables[self._table.path]
+                self._table.close()
+
+    def unlink(
+        self
+    ) -> None:
+        '''
+        Closes the cache and removes its file. Processes that still have it
+        open keep using the removed file; processes opening the name later
+        create a new one.
+        '''
+
+        self.close()
+        try:
+            os.unlink(self._table.path)
+        except FileNotFoundError:
+            pass
+
+    def _get(
+        self,
+        key: str
+    ) -> Any:
+        data = self._table.get(key.encode())
+        if data is None:
+            return MISSING
+
+        try:
+            return pickle.loads(data)
+        except Exception:
+            # A value pickled by an incompatible version of its class
+            self._table.delete(key.encode())
+            return MISSING
+
+    def _join_flight(
+        self,
+        key: str
+    ) -> tuple[Future, bool]:
+        with self._table.flights_lock:
+            flight = self._table.flights.get(key)
+            if flight is not None:
+                return flight, False
+
+            flight = self._table.flights[key] = Future()
+            return flight, True
+
+    def _complete_flight(
+        self,
+        key: str,
+        flight: Future,
+        value: Any = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        with self._table.flights_lock:
+            self._table.flights.pop(key, None)
+
+        if error is not None:
+            flight.set_exception(error)
+        else:
+            flight.set_result(value)
+
+    def __len__(
+        self
+    ) -> int:
+        return len(self._table)
@@ -0,0 +1,460 @@
+import asyncio
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from uuid import uuid4
+
+from framework.caching.memory_cache import MemoryCache
+from framework.clients.cache_client import CacheClientAsync
+from framework.logger import get_logger
+from redis.asyncio import Redis
+
+logger = get_logger(__name__)
+
+# The Redis channel invalidation messages are published on
+DEFAULT_INVALIDATION_CHANNEL = 'framework:cache:invalidation'
+
+# The seconds between attempts to resubscribe after the subscription fails
+RESUBSCRIBE_DELAY = 1.0
+
+# The kinds of value kept in L1 for a key: the raw string and the
+# deserialized JSON value
+L1_STRING = 'string'
+L1_JSON = 'json'
+
+# Receives the source id and invalidated keys of a message (keys is None to
+# invalidate every key)
+InvalidationHandler = Callable[[Optional[str], Optional[List[str]]], None]
+
+
+class CacheInvalidationBus:
+    '''
+    Delivers cache invalidation messages between TieredCache instances in
+    one process, for tests and single-process deployments.
+    RedisInvalidationBus delivers them across processes.
+    '''
+
+    def __init__(
+        self
+    ):
+        self._handlers: List[InvalidationHandler] = []
+
+    async def publish(
+        self,
+        source: str,
+        keys: List[str]
+    ) -> None:
+        '''
+        Publishes the invalidation of keys.
+
+        `source`: The id of the publishing cache.
+        `keys`: The invalidated keys.
+        '''
+
+        self._dispatch(source, keys)
+
+    async def subscribe(
+        self,
+        handler: InvalidationHandler
+    ) -> None:
+        '''
+        Calls a handler for every invalidation message.
+
+        `handler`: The handler.
+        '''
+
+        self._handlers.append(handler)
+
+    async def unsubscribe(
+        self,
+        handler: InvalidationHandler
+    ) -> None:
+        '''
+        Stops calling a handler.
+
+        `handler`: The handler.
+        '''
+
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+
+    async def aclose(
+        self
+    ) -> None:
+        self._handlers.clear()
+
+    def _dispatch(
+        self,
+        source: Optional[str],
+        keys: Optional[List[str]]
+    ) -> None:
+        for handler in list(self._handlers):
+            try:
+                handler(source, keys)
+            except Exception as ex:
+                logger.exception(f'Cache invalidation handler failed: {ex}')
+
+
+class RedisInvalidationBus(CacheInvalidationBus):
+    '''
+    Delivers cache invalidation messages across processes over a Redis
+    pub/sub channel. A message published while a subscriber is disconnected
+    is lost, so after resubscribing the subscribers are told to invalidate
+    every key.
+    '''
+
+    def __init__(
+        self,
+        client: Redis,
+        channel: str = DEFAULT_INVALIDATION_CHANNEL
+    ):
+        '''
+        Initializes a RedisInvalidationBus.
+
+        `client`: The Redis client.
+        `channel`: The pub/sub channel.
+        '''
+
+        super().__init__()
+
+        self._client = client
+        self._channel = channel
+        self._listener: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    async def publish(
+        self,
+        source: str,
+        keys: List[str]
+    ) -> None:
+        await self._client.publish(
+            self._channel,
+            json.dumps({'source': source, 'keys': keys}))
+
+    async def subscribe(
+        self,
+        handler: InvalidationHandler
+    ) -> None:
+        '''
+        Calls a handler for every invalidation message, starting the channel
+        listener on first use and waiting for the subscription so that no
+        message published afterwards is missed.
+
+        `handler`: The handler.
+        '''
+
+        await super().subscribe(handler)
+
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+        await self._subscribed.wait()
+
+    async def aclose(
+        self
+    ) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+        await super().aclose()
+
+    async def _listen(
+        self
+    ) -> None:
+        reconnecting = False
+
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                self._subscribed.set()
+
+                if reconnecting:
+                    self._dispatch(None, None)
+
+                async for message in pubsub.listen():
+                    if message.get('type') != 'message':
+                        continue
+
+                    data = json.loads(message['data'])
+                    self._dispatch(data.get('source'), data.get('keys'))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.warning(f"Cache invalidation subscription to '{self._channel}' failed: {ex}")
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+            reconnecting = True
+            await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+
+class TieredCache:
+    '''
+    A two-tier cache: a process-local MemoryCache (L1) in front of Redis
+    through CacheClientAsync (L2). Reads are served from L1 when possible,
+    and concurrent L1 misses of a key share one L2 read. JSON values are
+    kept deserialized in L1, so L1 hits skip json.loads too (callers must
+    not mutate them). Misses are not kept in L1.
+
+    Writes and deletes go to L2, drop the key from L1 and publish an
+    invalidation message; every other TieredCache on the bus drops the key
+    from its L1, so the tiers stay coherent. If a message is lost, an L1
+    value is stale for at most l1_ttl seconds.
+
+    To register with the service container, use a factory, e.g.
+    `add_singleton(TieredCache, factory=lambda provider: TieredCache(
+    provider.resolve(CacheClientAsync)))`, and call start() on startup.
+    '''
+
+    def __init__(
+        self,
+        cache_client: CacheClientAsync,
+        bus: Optional[CacheInvalidationBus] = None,
+        l1_ttl: int = 60,
+        max_entries: int = 10000
+    ):
+        '''
+        Initializes a TieredCache.
+
+        `cache_client`: The L2 cache client.
+        `bus`: The invalidation bus (a RedisInvalidationBus on the cache
+            client's Redis connection if None).
+        `l1_ttl`: The maximum seconds a value is kept in L1.
+        `max_entries`: The maximum number of values kept in L1.
+        '''
+
+        self._cache_client = cache_client
+        self._bus = bus if bus is not None else RedisInvalidationBus(cache_client.client)
+        self._l1_ttl = l1_ttl
+        self._memory_cache = MemoryCache(max_entries=max_entries)
+        # The L2 read in flight for each L1 key, shared by concurrent misses
+        # and dropped when the key is invalidated
+        self._loads: Dict[Tuple[str, str], asyncio.Task] = dict()
+
+        self._id = uuid4().hex
+        # Incremented on every invalidation, so an L2 read that overlaps an
+        # invalidation is not cached in L1
+        self._generation = 0
+        self._started = False
+
+    async def start(
+        self
+    ) -> None:
+        '''
+        Subscribes to invalidation messages from other caches. Until started,
+        values are not kept in L1, though concurrent reads of a key still
+        share one L2 read.
+        '''
+
+        if not self._started:
+            await self._bus.subscribe(self._on_invalidated)
+            self._started = True
+
+    async def aclose(
+        self
+    ) -> None:
+        '''
+        Unsubscribes from invalidation messages and clears L1.
+        '''
+
+        if self._started:
+            await self._bus.unsubscribe(self._on_invalidated)
+            self._started = False
+        self._invalidate_all()
+
+    async def get_cache(
+        self,
+        key: str
+    ) -> Union[str, None]:
+        '''
+        Fetch a string value from cache and return value or `None` if no
+        cached value exists
+
+        `key`: The key to fetch from cache
+        '''
+
+        return await self._get(
+            key=key,
+            kind=L1_STRING,
+            loader=lambda: self._cache_client.get_cache(key=key))
+
+    async def get_json(
+        self,
+        key: str
+    ) -> Union[dict, Iterable, None]:
+        '''
+        Fetch a serialized cache value and return the deserialized object
+        or `None` if no cached value exists
+
+        `key`: The key to fetch from cache
+        '''
+
+        return await self._get(
+            key=key,
+            kind=L1_JSON,
+            loader=lambda: self._cache_client.get_json(key=key))
+
+    async def set_cache(
+        self,
+        key: str,
+        value: str,
+        ttl=60
+    ) -> None:
+        '''
+        Cache a string value at the specified cache key
+
+        `key`: The key to cache the value at
+        `value`: The value to cache
+        `ttl`: The time-to-live for the cached value (in minutes)
+        '''
+
+        await self._cache_client.set_cache(
+            key=key,
+            value=value,
+            ttl=ttl)
+        await self._invalidate([key])
+
+    async def set_json(
+        self,
+        key: str,
+        value: Union[dict, Iterable],
+        ttl: int = 60
+    ) -> None:
+        '''
+        Cache a serializable JSON value at the specified cache key
+
+        `key`: The key to cache the value at
+        `value`: The value to cache
+        `ttl`: The time-to-live for the cached value (in minutes)
+        '''
+
+        await self._cache_client.set_json(
+            key=key,
+            value=value,
+            ttl=ttl)
+        await self._invalidate([key])
+
+    async def delete_key(
+        self,
+        key: str
+    ) -> None:
+        '''
+        Delete a key from the cache
+
+        `key`: The key to delete
+        '''
+
+        await self._cache_client.delete_key(
+            key=key)
+        await self._invalidate([key])
+
+    async def delete_keys(
+        self,
+        keys: List[str]
+    ) -> None:
+        '''
+        Delete a key from the cache
+
+        `keys`: A list of keys to delete
+        '''
+
+        await self._cache_client.delete_keys(
+            keys=keys)
+        await self._invalidate(keys)
+
+    async def _get(
+        self,
+        key: str,
+        kind: str,
+        loader: Callable
+    ) -> Any:
+        l1_key = (kind, key)
+
+        if self._started:
+            value = self._memory_cache.get(l1_key)
+            if value is not None:
+                return value
+
+        load = self._loads.get(l1_key)
+        if load is None:
+            load = asyncio.ensure_future(self._load(l1_key, loader))
+            self._loads[l1_key] = load
+
+        # Shielded so a cancelled reader does not cancel the read the other
+        # readers share
+        return await asyncio.shield(load)
+
+    async def _load(
+        self,
+        l1_key: Tuple[str, str],
+        loader: Callable
+    ) -> Any:
+        generation = self._generation
+
+        try:
+            value = await loader()
+        finally:
+            # An invalidation drops or replaces the read, so only remove it if
+            # it is still the current one
+            if self._loads.get(l1_key) is asyncio.current_task():
+                del self._loads[l1_key]
+
+        # Keep the value out of L1 if it is None (a miss, or an L2 error the
+        # client logged, which must not be pinned for l1_ttl), or if the key
+        # was invalidated while L2 was read, so the value may predate the
+        # write
+        if value is not None and self._generation == generation and self._started:
+            self._memory_cache.set(l1_key, value, ttl=self._l1_ttl)
+
+        return value
+
+    async def _invalidate(
+        self,
+        keys: List[str]
+    ) -> None:
+        self._invalidate_local(keys)
+
+        try:
+            await self._bus.publish(self._id, keys)
+        except Exception as ex:
+            logger.exception(f"Failed to publish cache invalidation for keys '{keys}': {ex}")
+
+    def _invalidate_local(
+        self,
+        keys: List[str]
+    ) -> None:
+        self._generation += 1
+        for key in keys:
+            for kind in (L1_STRING, L1_JSON):
+                # Later reads start a fresh L2 read instead of joining one
+                # that may return the value from before the invalidation
+                self._loads.pop((kind, key), None)
+                self._memory_cache.delete((kind, key))
+
+    def _invalidate_all(
+        self
+    ) -> None:
+        self._generation += 1
+        self._loads.clear()
+        self._memory_cache.clear()
+
+    def _on_invalidated(
+        self,
+        source: Optional[str],
+        keys: Optional[List[str]]
+    ) -> None:
+        if source == self._id:
+            return
+
+        if keys is None:
+            self._invalidate_all()
+        else:
+            self._invalidate_local(keys)
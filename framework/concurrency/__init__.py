@@ -1 +1 @@
-from framework.concurrency.concurrency import TaskCollection
+from framework.concurrency.concurrency import BackgroundEventLoop, TaskCollection
@@ -1,4 +1,5 @@
 import asyncio
+import threading
 from typing import Any
 
 
@@ -61,3 +62,78 @@ class TaskCollection:
 
         if any(self._tasks):
             return await asyncio.gather(*self._tasks)
+
+
+class BackgroundEventLoop:
+    '''
+    An event loop running on a dedicated daemon thread, used to run
+    coroutines to completion from synchronous code (including code that is
+    itself called from a running event loop). The loop and thread are
+    started on first use and reused until the instance is closed.
+    '''
+
+    def __init__(
+        self
+    ):
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(
+        self
+    ) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name='background-event-loop',
+                    daemon=True)
+                self._thread.start()
+        return self._loop
+
+    def run(
+        self,
+        coro
+    ) -> Any:
+        '''
+        Run a coroutine on the background loop and block until it completes.
+
+        `coro`: The coroutine to run.
+
+        Returns the result of the coroutine.
+        '''
+
+        loop = self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def close(
+        self
+    ) -> None:
+        '''
+        Stop the background loop and wait for its thread to exit.
+        '''
+
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is None:
+            return
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def __enter__(
+        self
+    ) -> 'BackgroundEventLoop':
+        return self
+
+    def __exit__(
+        self,
+        exc_type,
+        exc_value,
+        traceback
+    ) -> None:
+        self.close()
@@ -0,0 +1,108 @@
+from typing import Any, Generic, TypeVar
+
+T = TypeVar('T')
+
+
+class Lazy(Generic[T]):
+    '''
+    Deferred injection of a dependency. Annotate a constructor parameter as
+    `Lazy[T]` to receive a proxy that resolves `T` on first attribute access
+    and caches the instance, so construction is only paid for on the code
+    paths that use it. Use `value` (or `get_async()` for async factories) to
+    get the instance itself.
+    '''
+
+    __slots__ = ('_provider', '_type', '_instance', '_resolved')
+
+    @property
+    def value(self) -> T:
+        '''
+        The resolved instance, resolving it on first access.
+        '''
+
+        if not self._resolved:
+            self._instance = self._provider.resolve(self._type)
+            self._resolved = True
+        return self._instance
+
+    @property
+    def is_resolved(self) -> bool:
+        '''
+        Indicates whether the dependency has been resolved.
+        '''
+
+        return self._resolved
+
+    def __init__(
+        self,
+        provider,
+        _type: type
+    ):
+        '''
+        Initializes a Lazy proxy.
+
+        `provider`: A ServiceProvider or ServiceScope used to resolve the dependency.
+        `_type`: The type of the dependency.
+        '''
+
+        self._provider = provider
+        self._type = _type
+        self._instance = None
+        self._resolved = False
+
+    async def get_async(self) -> T:
+        '''
+        Resolves the instance asynchronously, supporting async factories.
+        '''
+
+        if not self._resolved:
+            self._instance = await self._provider.resolve_async(self._type)
+            self._resolved = True
+        return self._instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.value, name)
+
+    def __repr__(self) -> str:
+        return f'Lazy[{self._type.__name__}]'
+
+
+class Factory(Generic[T]):
+    '''
+    Deferred injection of a dependency factory. Annotate a constructor
+    parameter as `Factory[T]` to receive a callable that resolves a `T` each
+    time it is called. A singleton may hold a `Factory[T]` for a transient `T`.
+    '''
+
+    __slots__ = ('_provider', '_type')
+
+    def __init__(
+        self,
+        provider,
+        _type: type
+    ):
+        '''
+        Initializes a Factory.
+
+        `provider`: A ServiceProvider or ServiceScope used to resolve the dependency.
+        `_type`: The type of the dependency.
+        '''
+
+        self._provider = provider
+        self._type = _type
+
+    def __call__(self) -> T:
+        return self._provider.resolve(self._type)
+
+    async def create_async(self) -> T:
+        '''
+        Resolves an instance asynchronously, supporting async factories.
+        '''
+
+        return await self._provider.resolve_async(self._type)
+
+    def __repr__(self) -> str:
+        return f'Factory[{self._type.__name__}]'
+
+
+DEFERRED_TYPES = (Lazy, Factory)
@@ -6,10 +6,11 @@ class Lifetime:
     Singleton = 'singleton'
     Transient = 'transient'
     Scoped = 'scoped'
+    Pooled = 'pooled'
 
 
 class ConstructorDependency:
-    __slots__ = ('name', 'dependency_type')
+    __slots__ = ('name', 'dependency_type', 'deferred')
 
     @property
     def type_name(self) -> str:
@@ -19,20 +20,60 @@ class ConstructorDependency:
 
         return self.dependency_type.__name__
 
+    @property
+    def is_deferred(self) -> bool:
+        '''
+        Indicates whether the dependency is injected as a Lazy or Factory.
+        '''
+
+        return self.deferred is not None
+
     def __init__(
         self,
         name: str,
-        _type: type
+        _type: type,
+        deferred: type = None
     ):
         '''
         Initializes a ConstructorDependency object.
 
         `name` (str): The name of the dependency.
         `_type` (type): The type of the dependency.
+        `deferred` (type, optional): Lazy or Factory if the dependency is
+            injected deferred.
         '''
 
         self.name = name
         self.dependency_type = _type
+        self.deferred = deferred
+
+    def resolve(
+        self,
+        provider
+    ) -> Any:
+        '''
+        Resolve the value to inject for the dependency.
+
+        `provider`: A ServiceProvider or ServiceScope used to resolve the dependency.
+        '''
+
+        if self.deferred is not None:
+            return self.deferred(provider, self.dependency_type)
+        return provider.resolve(self.dependency_type)
+
+    async def resolve_async(
+        self,
+        provider
+    ) -> Any:
+        '''
+        Async variant of resolve.
+
+        `provider`: A ServiceProvider or ServiceScope used to resolve the dependency.
+        '''
+
+        if self.deferred is not None:
+            return self.deferred(provider, self.dependency_type)
+        return await provider.resolve_async(self.dependency_type)
 
     def __repr__(
         self
@@ -41,13 +82,16 @@ class ConstructorDependency:
         A string representation of the ConstructorDependency object.
         '''
 
+        if self.deferred is not None:
+            return f'{self.deferred.__name__}[{self.dependency_type.__name__}]'
         return self.dependency_type.__name__
 
 
 class DependencyRegistration:
     __slots__ = (
         'dependency_type', 'lifetime', 'implementation_type', 'instance',
-        'factory', 'eager', 'constructor_params', '_type_name', '_required_types', '_resolver_fn'
+        'factory', 'eager', 'constructor_params', 'max_size', 'reset', 'key',
+        '_type_name', '_required_types', '_resolver_fn'
     )
 
     @property
@@ -67,13 +111,23 @@ class DependencyRegistration:
         return self.factory is not None
 
     @property
-    def required_types(self) -> bool:
+    def required_types(self) -> list[type]:
         '''
-        The list of required dependency types.
+        The list of dependency types required to construct the dependency.
+        Deferred (Lazy/Factory) dependencies are not required at construction.
         '''
 
         return self._required_types
 
+    @property
+    def deferred_dependencies(self) -> list[ConstructorDependency]:
+        '''
+        The constructor dependencies injected as Lazy or Factory.
+        '''
+
+        return [dependency for dependency in self.constructor_params
+                if dependency.is_deferred]
+
     @property
     def built(self) -> bool:
         '''
@@ -98,7 +152,10 @@ class DependencyRegistration:
         instance: Any = None,
         factory: Callable = None,
         eager: bool = False,
-        constructor_params: list[ConstructorDependency] = None
+        constructor_params: list[ConstructorDependency] = None,
+        max_size: int = None,
+        reset: Callable = None,
+        key: Any = None
     ):
         '''
         Initializes a DependencyRegistration object.
@@ -111,6 +168,9 @@ class DependencyRegistration:
         `eager`: Whether a singleton should be constructed at build() time
             instead of lazily on first resolve().
         `constructor_params`: The constructor parameters of the dependency.
+        `max_size`: The maximum number of pooled instances retained for reuse.
+        `reset`: A hook called with a pooled instance when it is returned.
+        `key`: The key of a keyed registration, or None.
         '''
 
         self.dependency_type = dependency_type
@@ -120,6 +180,9 @@ class DependencyRegistration:
         self.factory = factory
         self.eager = eager
         self.constructor_params = constructor_params
+        self.max_size = max_size
+        self.reset = reset
+        self.key = key
         self._resolver_fn = None
 
         self.configure_dependency()
@@ -132,9 +195,29 @@ class DependencyRegistration:
         '''
 
         self._required_types = [
-            dependency.dependency_type for dependency in self.constructor_params]
+            dependency.dependency_type for dependency in self.constructor_params
+            if not dependency.is_deferred]
         self._type_name = self.implementation_type.__name__
 
+    def copy(
+        self
+    ) -> 'DependencyRegistration':
+        '''
+        Returns an unbuilt copy of the registration.
+        '''
+
+        return DependencyRegistration(
+            dependency_type=self.dependency_type,
+            lifetime=self.lifetime,
+            implementation_type=self.implementation_type,
+            instance=None,
+            factory=self.factory,
+            eager=self.eager,
+            constructor_params=self.constructor_params,
+            max_size=self.max_size,
+            reset=self.reset,
+            key=self.key)
+
     def get_activate_constructor_params(
         self,
         provider
@@ -148,7 +231,7 @@ class DependencyRegistration:
         constructor_params = dict()
 
         for param in self.constructor_params:
-            constructor_params[param.name] = provider.resolve(param.dependency_type)
+            constructor_params[param.name] = param.resolve(provider)
 
         return constructor_params
 
@@ -177,12 +260,53 @@ class DependencyRegistration:
 
         return instance
 
+    async def get_activate_constructor_params_async(
+        self,
+        provider
+    ) -> dict[str, Any]:
+        '''
+        Gets the activated constructor parameters for the dependency,
+        resolving independent parameters concurrently. Parameters that are
+        already resolved (built singletons, cached scoped instances) and
+        deferred parameters are filled in directly so that only parameters
+        which may actually await are scheduled as tasks.
+
+        `provider`: A ServiceProvider or ServiceScope used to resolve dependencies.
+        '''
+
+        constructor_params = dict()
+        pending = []
+
+        for param in self.constructor_params:
+            if param.deferred is not None:
+                constructor_params[param.name] = param.resolve(provider)
+                continue
+
+            instance = provider.try_get_resolved(param.dependency_type)
+            if instance is not None:
+                constructor_params[param.name] = instance
+            else:
+                pending.append(param)
+
+        if len(pending) == 1:
+            param = pending[0]
+            constructor_params[param.name] = await param.resolve_async(provider)
+        elif pending:
+            values = await asyncio.gather(*[
+                param.resolve_async(provider) for param in pending])
+            for param, value in zip(pending, values):
+                constructor_params[param.name] = value
+
+        return constructor_params
+
     async def activate_async(
         self,
         provider=None
     ) -> Any:
         '''
         Async variant of activate, supporting coroutine constructors.
+        Constructor params that are not already resolved are resolved
+        concurrently.
 
         `provider`: A ServiceProvider or ServiceScope used to resolve constructor dependencies.
         '''
@@ -193,9 +317,7 @@ class DependencyRegistration:
         if not self.constructor_params:
             instance = self.implementation_type()
         else:
-            kwargs = {}
-            for param in self.constructor_params:
-                kwargs[param.name] = await provider.resolve_async(param.dependency_type)
+            kwargs = await self.get_activate_constructor_params_async(provider)
             instance = self.implementation_type(**kwargs)
 
         if self.lifetime == Lifetime.Singleton:
@@ -0,0 +1,92 @@
+import asyncio
+import inspect
+import time
+from typing import Any, List, Optional
+
+from framework.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+async def dispose_instance_async(
+    instance: Any,
+    exc_type=None,
+    exc_value=None,
+    traceback=None
+) -> None:
+    '''
+    Disposes an instance: exits it if it is an async context manager,
+    otherwise awaits aclose() or calls close() (awaiting the result of an
+    async close()), then calls dispose() if it exposes it.
+
+    `instance`: The instance to dispose.
+    `exc_type`, `exc_value`, `traceback`: The exception passed to __aexit__.
+    '''
+
+    if hasattr(instance, '__aexit__'):
+        await instance.__aexit__(exc_type, exc_value, traceback)
+    elif callable(getattr(instance, 'aclose', None)):
+        await instance.aclose()
+    elif callable(getattr(instance, 'close', None)):
+        result = instance.close()
+        if inspect.isawaitable(result):
+            await result
+
+    if callable(getattr(instance, 'dispose', None)):
+        instance.dispose()
+
+
+async def _dispose_logged(instance: Any, exc_type, exc_value, traceback) -> None:
+    try:
+        await dispose_instance_async(instance, exc_type, exc_value, traceback)
+    except Exception as ex:
+        logger.warning(f"Error disposing '{type(instance).__name__}': {ex}")
+
+
+async def dispose_levels_async(
+    levels: List[List[Any]],
+    timeout: Optional[float] = None,
+    exc_type=None,
+    exc_value=None,
+    traceback=None
+) -> List[Any]:
+    '''
+    Disposes levels of instances one level after another, and the instances
+    within a level concurrently. An instance that fails to dispose is logged
+    and does not stop the others. Disposals still running when the deadline
+    passes are cancelled and later levels are not started.
+
+    Returns the instances that were not disposed before the deadline.
+
+    `levels`: The instances to dispose, in the order the levels are disposed.
+    `timeout`: The deadline in seconds for disposing every level (unbounded
+        if None).
+    `exc_type`, `exc_value`, `traceback`: The exception passed to __aexit__.
+    '''
+
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    for index, level in enumerate(levels):
+        if not level:
+            continue
+
+        remaining = None
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return [instance for level in levels[index:] for instance in level]
+
+        tasks = {
+            asyncio.ensure_future(_dispose_logged(instance, exc_type, exc_value, traceback)): instance
+            for instance in level}
+        _, pending = await asyncio.wait(tasks, timeout=remaining)
+
+        if pending:
+            # Not awaited, so a disposal that ignores cancellation cannot
+            # hold up shutdown past the deadline
+            for task in pending:
+                task.cancel()
+            return ([tasks[task] for task in pending]
+                    + [instance for level in levels[index + 1:] for instance in level])
+
+    return []
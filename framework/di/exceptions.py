@@ -7,24 +7,45 @@ class RegistrationNotFoundForInstantiationError(Exception):
 
 
 class RegistrationNotFoundError(Exception):
-    def __init__(self, implementation_type):
-        super().__init__(
-            f"Failed to locate registration for type '{implementation_type.__name__}'")
+    def __init__(self, implementation_type, key=None):
+        if key is not None:
+            super().__init__(
+                f"Failed to locate registration for type '{implementation_type.__name__}' with key '{key}'")
+        else:
+            super().__init__(
+                f"Failed to locate registration for type '{implementation_type.__name__}'")
 
 
 class InvalidDependencyChainError(Exception):
-    def __init__(self):
+    def __init__(self, message=None):
+        super().__init__(
+            message or "Dependency chain is not valid, check your registration types")
+
+
+class DependencyCycleError(InvalidDependencyChainError):
+    def __init__(self, cycles):
+        self.cycles = cycles
+        super().__init__(
+            "Dependency chain is not valid, dependency cycles detected: " + '; '.join(
+                ' -> '.join(_type.__name__ for _type in cycle) for cycle in cycles))
+
+
+class PooledDependencyInjectionError(Exception):
+    def __init__(self, required_type, registration):
         super().__init__(
-            "Dependency chain is not valid, check your registration types")
+            f"Cannot inject dependency '{required_type.__name__}' with pooled "
+            f"lifetime into singleton '{registration.type_name}'")
 
 
 class TransientDependencyInjectionError(Exception):
     def __init__(self, required_type, registration):
         super().__init__(
-            f"Cannot inject dependency '{required_type.__name__}' with transient lifetime into singleton '{registration.type_name}'")
+            f"Cannot inject dependency '{required_type.__name__}' with transient "
+            f"lifetime into singleton '{registration.type_name}'")
 
 
-class InvalidDependencyChainError(Exception):
-    def __init__(self):
+class ScopedDependencyInjectionError(Exception):
+    def __init__(self, required_type, registration):
         super().__init__(
-            "Dependency chain is not valid, check your registration types")
+            f"Cannot inject dependency '{required_type.__name__}' with scoped "
+            f"lifetime into singleton '{registration.type_name}'")
@@ -0,0 +1,109 @@
+from typing import Any, Dict, TypeVar, get_args, get_origin
+
+from framework.di.dependencies import ConstructorDependency, DependencyRegistration
+
+
+def is_open_generic(_type: Any) -> bool:
+    '''
+    Indicates whether a type is a generic parameterized only by type
+    variables, e.g. `Repository[T]`.
+
+    `_type`: The type to check.
+    '''
+
+    args = get_args(_type)
+    return (get_origin(_type) is not None
+            and len(args) > 0
+            and all(isinstance(arg, TypeVar) for arg in args))
+
+
+def get_type_name(_type: Any) -> str:
+    '''
+    Returns the name of a type, including the type arguments of a
+    parameterized generic, e.g. `Repository[User]`.
+
+    `_type`: The type to name.
+    '''
+
+    args = get_args(_type)
+    if get_origin(_type) is None or not args:
+        return getattr(_type, '__name__', repr(_type))
+
+    return f"{get_type_name(get_origin(_type))}[{', '.join(get_type_name(arg) for arg in args)}]"
+
+
+def get_qualified_type_name(_type: Any) -> str:
+    '''
+    Returns the name of a type qualified with its module, including the
+    type arguments of a parameterized generic, e.g.
+    `app.repositories.Repository[app.models.User]`.
+
+    `_type`: The type to name.
+    '''
+
+    origin = get_origin(_type)
+    base = origin if origin is not None else _type
+    name = getattr(base, '__qualname__', None) or get_type_name(base)
+
+    args = get_args(_type)
+    if origin is not None and args:
+        name = f"{name}[{', '.join(get_qualified_type_name(arg) for arg in args)}]"
+
+    module = getattr(base, '__module__', None)
+    if module is None or module == 'builtins':
+        return name
+    return f'{module}.{name}'
+
+
+def substitute(annotation: Any, type_arguments: Dict[TypeVar, Any]) -> Any:
+    '''
+    Replaces the type variables in an annotation with their type arguments.
+
+    `annotation`: A type variable, a generic parameterized by type variables,
+        or any other annotation (returned unchanged).
+    `type_arguments`: The type argument of each type variable. Type
+        variables without an argument are left in place.
+    '''
+
+    if isinstance(annotation, TypeVar):
+        return type_arguments.get(annotation, annotation)
+
+    parameters = getattr(annotation, '__parameters__', ())
+    if not parameters:
+        return annotation
+
+    return annotation[tuple(type_arguments.get(parameter, parameter) for parameter in parameters)]
+
+
+def close_registration(
+    registration: DependencyRegistration,
+    closed_type: Any
+) -> DependencyRegistration:
+    '''
+    Returns the registration of a closed generic (e.g. `Repository[User]`)
+    from the open generic registration it was created from. Type variables in
+    the implementation type and in the constructor param annotations are
+    replaced with the closed type's arguments.
+
+    `registration`: The open generic registration.
+    `closed_type`: The closed generic type being resolved.
+    '''
+
+    type_arguments = dict(zip(
+        registration.dependency_type.__parameters__,
+        get_args(closed_type)))
+
+    constructor_params = [
+        ConstructorDependency(
+            name=param.name,
+            _type=substitute(param.dependency_type, type_arguments),
+            deferred=param.deferred)
+        for param in registration.constructor_params]
+
+    return DependencyRegistration(
+        dependency_type=closed_type,
+        lifetime=registration.lifetime,
+        implementation_type=substitute(registration.implementation_type, type_arguments),
+        constructor_params=constructor_params,
+        max_size=registration.max_size,
+        reset=registration.reset)
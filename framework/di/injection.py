@@ -0,0 +1,215 @@
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from framework.di.dependencies import Lifetime
+from framework.di.generics import get_type_name
+from framework.di.service_collection import get_signature
+from framework.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class HandlerResolver:
+    '''
+    Resolves every injected param of a handler in a single pass for one
+    provider. Singleton params are resolved on the first call and reused, so
+    a handler whose params are all singletons resolves nothing per request.
+    '''
+
+    def __init__(
+        self,
+        provider: Any,
+        params: Dict[str, Any],
+        container_param: Optional[str],
+        strict: bool
+    ):
+        '''
+        Initializes a HandlerResolver.
+
+        `provider`: The root provider the resolver is bound to.
+        `params`: The registered type of each injected param.
+        `container_param`: The name of the param that receives the current
+            container, or None.
+        `strict`: Raise when a param fails to resolve instead of leaving it
+            to the caller.
+        '''
+
+        self.provider = provider
+        self._container_param = container_param
+        self._strict = strict
+
+        self._singleton_params: List[Tuple[str, Any]] = []
+        scoped_params = []
+        for name, _type in params.items():
+            registration = provider._find_registration(_type)
+            if registration.lifetime == Lifetime.Singleton:
+                self._singleton_params.append((name, _type))
+            else:
+                scoped_params.append((name, _type))
+
+        self._scoped_params = tuple(scoped_params)
+        self._singletons: Optional[Dict[str, Any]] = None
+        self._is_static = not scoped_params and container_param is None
+
+    def _on_error(self, name: str, _type: Any, ex: Exception) -> None:
+        if self._strict:
+            raise ValueError(
+                f"Failed to resolve dependency '{get_type_name(_type)}' "
+                f"for '{name}': {ex}")
+        logger.debug(f"Skipping DI for '{name}': {ex}")
+
+    def _resolve_singletons(self) -> Dict[str, Any]:
+        singletons = dict()
+        for name, _type in self._singleton_params:
+            try:
+                singletons[name] = self.provider.resolve(_type)
+            except Exception as ex:
+                self._on_error(name, _type, ex)
+        # Only reuse a complete set, so a failed singleton is retried on the
+        # next call
+        if len(singletons) == len(self._singleton_params):
+            self._singletons = singletons
+        return singletons
+
+    async def _resolve_singletons_async(self) -> Dict[str, Any]:
+        singletons = dict()
+        for name, _type in self._singleton_params:
+            try:
+                singletons[name] = await self.provider.resolve_async(_type)
+            except Exception as ex:
+                self._on_error(name, _type, ex)
+        # Only reuse a complete set, so a failed singleton is retried on the
+        # next call
+        if len(singletons) == len(self._singleton_params):
+            self._singletons = singletons
+        return singletons
+
+    def resolve(self, container: Any, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        '''
+        Returns the call kwargs with the injected params added. Params passed
+        by the caller are never replaced.
+
+        `container`: The current container (request scope or provider).
+        `kwargs`: The kwargs passed by the caller.
+        '''
+
+        singletons = self._singletons
+        if singletons is None:
+            singletons = self._resolve_singletons()
+        if self._is_static:
+            return {**singletons, **kwargs} if singletons else kwargs
+
+        injected = dict(singletons)
+        if self._container_param is not None:
+            injected[self._container_param] = container
+        for name, _type in self._scoped_params:
+            if name not in kwargs:
+                try:
+                    injected[name] = container.resolve(_type)
+                except Exception as ex:
+                    self._on_error(name, _type, ex)
+
+        injected.update(kwargs)
+        return injected
+
+    async def resolve_async(self, container: Any, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        '''
+        Returns the call kwargs with the injected params added, resolving
+        through the async resolve path. Params passed by the caller are never
+        replaced.
+
+        `container`: The current container (request scope or provider).
+        `kwargs`: The kwargs passed by the caller.
+        '''
+
+        singletons = self._singletons
+        if singletons is None:
+            singletons = await self._resolve_singletons_async()
+        if self._is_static:
+            return {**singletons, **kwargs} if singletons else kwargs
+
+        injected = dict(singletons)
+        if self._container_param is not None:
+            injected[self._container_param] = container
+        for name, _type in self._scoped_params:
+            if name not in kwargs:
+                try:
+                    injected[name] = await container.resolve_async(_type)
+                except Exception as ex:
+                    self._on_error(name, _type, ex)
+
+        injected.update(kwargs)
+        return injected
+
+
+class HandlerInjectionPlan:
+    '''
+    The injection plan of a handler, computed once when the handler is
+    decorated: the params that receive registered dependencies and the param
+    (if any) that receives the current container. The plan is bound to a
+    provider on first use, since route handlers are usually decorated before
+    the provider is built.
+    '''
+
+    def __init__(
+        self,
+        fn: Callable,
+        container_param: Optional[str] = None,
+        strict: bool = False
+    ):
+        '''
+        Initializes a HandlerInjectionPlan.
+
+        `fn`: The handler.
+        `container_param`: The name of a param that receives the current
+            container if the handler declares it.
+        `strict`: Require every annotated param to be registered.
+        '''
+
+        self.signature = get_signature(fn)
+        self.container_param = (container_param
+                                if container_param in self.signature.parameters
+                                else None)
+
+        self._strict = strict
+        self._annotated = [
+            (name, param.annotation)
+            for name, param in self.signature.parameters.items()
+            if param.annotation is not inspect.Parameter.empty
+            and name != self.container_param]
+        self._resolver: Optional[HandlerResolver] = None
+
+    def get_injectable_params(self, provider: Any) -> Dict[str, Any]:
+        '''
+        Returns the registered type of each param the provider can inject.
+
+        `provider`: The root service provider.
+        '''
+
+        params = dict()
+        for name, annotation in self._annotated:
+            if provider._find_registration(annotation) is not None:
+                params[name] = annotation
+            elif self._strict:
+                raise ValueError(
+                    f"Failed to resolve dependency '{get_type_name(annotation)}' "
+                    f"for parameter '{name}': dependency is not registered")
+        return params
+
+    def get_resolver(self, provider: Any) -> HandlerResolver:
+        '''
+        Returns the resolver of the plan for a provider, creating it on first
+        use (or when a different provider is used).
+
+        `provider`: The root service provider.
+        '''
+
+        resolver = self._resolver
+        if resolver is None or resolver.provider is not provider:
+            resolver = HandlerResolver(
+                provider=provider,
+                params=self.get_injectable_params(provider),
+                container_param=self.container_param,
+                strict=self._strict)
+            self._resolver = resolver
+        return resolver
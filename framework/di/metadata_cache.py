@@ -0,0 +1,326 @@
+import hashlib
+import json
+import os
+import sys
+from threading import Lock
+from typing import Dict, List, Optional
+
+from framework.di.deferred import DEFERRED_TYPES
+from framework.di.dependencies import ConstructorDependency, DependencyRegistration
+from framework.logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_VERSION = 2
+
+# The number of build orders kept in the cache file
+MAX_BUILD_ORDERS = 16
+
+DEFERRED_TYPE_LOOKUP = {deferred.__name__: deferred for deferred in DEFERRED_TYPES}
+
+
+def get_type_key(_type: type) -> Optional[str]:
+    '''
+    Returns a stable key for a type from its module and qualified name, or
+    None if the type cannot be located again by name (e.g. a local class or
+    a parameterized generic).
+    '''
+
+    module = getattr(_type, '__module__', None)
+    qualname = getattr(_type, '__qualname__', None)
+
+    if not isinstance(_type, type) or module is None or qualname is None:
+        return None
+    if '<locals>' in qualname:
+        return None
+
+    return f'{module}:{qualname}'
+
+
+def load_type(key: str) -> Optional[type]:
+    '''
+    Returns the type for a key created by get_type_key, or None if the type
+    no longer exists or its module has not been imported.
+    '''
+
+    module_name, qualname = key.split(':', 1)
+    target = sys.modules.get(module_name)
+
+    for name in qualname.split('.'):
+        target = getattr(target, name, None)
+        if target is None:
+            return None
+
+    return target if isinstance(target, type) else None
+
+
+class RegistrationMetadataCache:
+    '''
+    An on-disk cache of the constructor parameters computed for registered
+    types and of the validated build order of a set of registrations, so
+    that a restart with unchanged sources skips signature introspection and
+    graph validation.
+
+    Constructor entries are keyed by module and qualified type name and are
+    invalidated when the source file (mtime and size) of any module in the
+    type's MRO changes. Build orders are keyed by a hash of every
+    registration (in registration order, since a later registration of a
+    type replaces an earlier one) and the source fingerprints of its types,
+    and are stored as positions in the list of registrations.
+    '''
+
+    def __init__(
+        self,
+        path: str
+    ):
+        '''
+        Initializes a RegistrationMetadataCache.
+
+        `path`: The path of the JSON cache file.
+        '''
+
+        self._path = path
+        self._lock = Lock()
+        self._loaded = False
+        self._dirty = False
+        self._types: Dict[str, Dict] = dict()
+        self._build_orders: Dict[str, List[int]] = dict()
+        self._module_fingerprints: Dict[str, Optional[list]] = dict()
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+
+        self._loaded = True
+        if not os.path.exists(self._path):
+            return
+
+        try:
+            with open(self._path, 'r') as file:
+                data = json.loads(file.read())
+        except Exception as ex:
+            logger.warning(f"Failed to read registration metadata cache '{self._path}': {ex}")
+            return
+
+        if data.get('version') != CACHE_VERSION:
+            return
+
+        self._types = data.get('types', dict())
+        self._build_orders = data.get('build_orders', dict())
+
+    def _get_module_fingerprint(self, module_name: str) -> Optional[list]:
+        if module_name not in self._module_fingerprints:
+            module = sys.modules.get(module_name)
+            path = getattr(module, '__file__', None)
+
+            fingerprint = None
+            if path is not None:
+                try:
+                    stat = os.stat(path)
+                    fingerprint = [module_name, stat.st_mtime_ns, stat.st_size]
+                except OSError:
+                    pass
+            elif module_name == 'builtins':
+                fingerprint = [module_name]
+
+            self._module_fingerprints[module_name] = fingerprint
+
+        return self._module_fingerprints[module_name]
+
+    def _get_type_fingerprint(self, _type: type) -> Optional[list]:
+        '''
+        The source fingerprints of every module in the type's MRO, since an
+        inherited constructor may be defined in another module.
+        '''
+
+        fingerprints = []
+        for base in _type.__mro__:
+            if base is object:
+                continue
+            fingerprint = self._get_module_fingerprint(base.__module__)
+            if fingerprint is None:
+                return None
+            if fingerprint not in fingerprints:
+                fingerprints.append(fingerprint)
+        return fingerprints
+
+    def get_constructor_params(
+        self,
+        _type: type
+    ) -> Optional[List[ConstructorDependency]]:
+        '''
+        Returns the cached constructor parameters for a type, or None if
+        there is no valid entry.
+
+        `_type`: The implementation type.
+        '''
+
+        key = get_type_key(_type)
+        if key is None:
+            return None
+
+        with self._lock:
+            self._load()
+            entry = self._types.get(key)
+            if entry is None or entry.get('fingerprint') != self._get_type_fingerprint(_type):
+                return None
+
+        params = []
+        for name, type_key, deferred in entry['params']:
+            dependency_type = load_type(type_key)
+            if dependency_type is None:
+                return None
+
+            params.append(ConstructorDependency(
+                name=name,
+                _type=dependency_type,
+                deferred=DEFERRED_TYPE_LOOKUP.get(deferred)))
+        return params
+
+    def set_constructor_params(
+        self,
+        _type: type,
+        params: List[ConstructorDependency]
+    ) -> None:
+        '''
+        Caches the constructor parameters computed for a type. Types whose
+        parameters cannot be located again by name are not cached.
+
+        `_type`: The implementation type.
+        `params`: The constructor parameters.
+        '''
+
+        key = get_type_key(_type)
+        if key is None:
+            return
+
+        serialized = []
+        for param in params:
+            type_key = get_type_key(param.dependency_type)
+            if type_key is None:
+                return
+            serialized.append([
+                param.name,
+                type_key,
+                param.deferred.__name__ if param.deferred is not None else None])
+
+        with self._lock:
+            self._load()
+            fingerprint = self._get_type_fingerprint(_type)
+            if fingerprint is None:
+                return
+
+            self._types[key] = dict(
+                fingerprint=fingerprint,
+                params=serialized)
+            self._dirty = True
+
+    def _get_registrations_hash(
+        self,
+        registrations: List[DependencyRegistration]
+    ) -> Optional[str]:
+        entries = []
+        for registration in registrations:
+            dependency_key = get_type_key(registration.dependency_type)
+            implementation_key = get_type_key(registration.implementation_type)
+            if dependency_key is None or implementation_key is None:
+                return None
+
+            fingerprint = self._get_type_fingerprint(registration.implementation_type)
+            if fingerprint is None:
+                return None
+
+            entries.append([
+                dependency_key,
+                implementation_key,
+                repr(registration.key),
+                registration.lifetime,
+                registration.is_factory,
+                [repr(param) for param in registration.constructor_params],
+                fingerprint])
+
+        return hashlib.sha1(json.dumps(entries).encode()).hexdigest()
+
+    def get_build_order(
+        self,
+        registrations: List[DependencyRegistration]
+    ) -> Optional[List[DependencyRegistration]]:
+        '''
+        Returns the cached build order for a set of registrations, or None if
+        the registrations (or their sources) have changed since it was cached.
+
+        `registrations`: Every registration in the collection.
+        '''
+
+        with self._lock:
+            self._load()
+            registrations_hash = self._get_registrations_hash(registrations)
+            order = self._build_orders.get(registrations_hash)
+
+        if order is None:
+            return None
+
+        try:
+            return [registrations[index] for index in order]
+        except (IndexError, TypeError):
+            return None
+
+    def set_build_order(
+        self,
+        registrations: List[DependencyRegistration],
+        build_order: List[DependencyRegistration]
+    ) -> None:
+        '''
+        Caches the validated build order for a set of registrations.
+
+        `registrations`: Every registration in the collection.
+        `build_order`: The validated build order.
+        '''
+
+        with self._lock:
+            self._load()
+            registrations_hash = self._get_registrations_hash(registrations)
+            if registrations_hash is None:
+                return
+
+            positions = {id(registration): index
+                         for index, registration in enumerate(registrations)}
+
+            self._build_orders.pop(registrations_hash, None)
+            self._build_orders[registrations_hash] = [
+                positions[id(registration)]
+                for registration in build_order]
+
+            while len(self._build_orders) > MAX_BUILD_ORDERS:
+                del self._build_orders[next(iter(self._build_orders))]
+
+            self._dirty = True
+
+    def save(self) -> None:
+        '''
+        Writes the cache file if anything has changed since it was loaded.
+        The file is replaced atomically so concurrent readers never see a
+        partial write.
+        '''
+
+        with self._lock:
+            if not self._dirty:
+                return
+
+            data = dict(
+                version=CACHE_VERSION,
+                types=self._types,
+                build_orders=self._build_orders)
+
+            directory = os.path.dirname(os.path.abspath(self._path))
+            temp_path = os.path.join(
+                directory, f'.{os.path.basename(self._path)}.{os.getpid()}.tmp')
+
+            try:
+                os.makedirs(directory, exist_ok=True)
+                with open(temp_path, 'w') as file:
+                    file.write(json.dumps(data))
+                os.replace(temp_path, self._path)
+                self._dirty = False
+            except Exception as ex:
+                logger.warning(f"Failed to write registration metadata cache '{self._path}': {ex}")
@@ -0,0 +1,210 @@
+import time
+from bisect import bisect_left
+from threading import Lock
+from typing import Any, Callable, Dict
+
+from framework.di.dependencies import DependencyRegistration, Lifetime
+from framework.di.generics import get_type_name
+
+# Upper bounds (in seconds) of the construction time histogram buckets
+HISTOGRAM_BUCKETS = (0.0001, 0.001, 0.01, 0.1, 1.0, float('inf'))
+
+
+class TypeStats:
+    '''
+    Resolution counters for a single registered type. Counters are plain
+    integers updated without locking, so under heavy contention they are
+    approximate rather than exact.
+    '''
+
+    __slots__ = ('lifetime', 'resolves', 'constructions', 'singleton_hits',
+                 'scoped_hits', 'construction_time', 'histogram')
+
+    def __init__(
+        self,
+        lifetime: str
+    ):
+        self.lifetime = lifetime
+        self.reset()
+
+    def reset(self) -> None:
+        '''
+        Zeroes the counters.
+        '''
+
+        self.resolves = 0
+        self.constructions = 0
+        self.singleton_hits = 0
+        self.scoped_hits = 0
+        self.construction_time = 0.0
+        self.histogram = [0] * len(HISTOGRAM_BUCKETS)
+
+    def record_construction(
+        self,
+        elapsed: float
+    ) -> None:
+        '''
+        Records a construction and its wall time.
+
+        `elapsed`: The construction time in seconds.
+        '''
+
+        self.constructions += 1
+        self.construction_time += elapsed
+        self.histogram[bisect_left(HISTOGRAM_BUCKETS, elapsed)] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        '''
+        Returns the counters as a dictionary.
+        '''
+
+        stats = dict(
+            lifetime=self.lifetime,
+            resolves=self.resolves,
+            constructions=self.constructions,
+            construction_time=self.construction_time,
+            construction_histogram={
+                ('+Inf' if bound == float('inf') else str(bound)): count
+                for bound, count in zip(HISTOGRAM_BUCKETS, self.histogram)})
+
+        if self.lifetime == Lifetime.Singleton:
+            stats['singleton_hits'] = self.singleton_hits
+        elif self.lifetime == Lifetime.Scoped:
+            stats['scoped_hits'] = self.scoped_hits
+        elif self.lifetime == Lifetime.Transient:
+            stats['transient_activations'] = self.constructions
+
+        return stats
+
+
+class _StatsMeasurement:
+    __slots__ = ('_type_stats', '_start')
+
+    def __init__(self, type_stats: TypeStats):
+        self._type_stats = type_stats
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self._type_stats.record_construction(
+                time.perf_counter() - self._start)
+
+
+class ResolutionStats:
+    '''
+    Per-type resolution counters for a ServiceProvider. Counting is compiled
+    into the resolution plans only when stats are enabled, so a provider
+    without stats pays nothing.
+    '''
+
+    def __init__(self):
+        # Counters by (type, key); every unkeyed registration of a type
+        # shares the type's counters
+        self._types: Dict[tuple, TypeStats] = dict()
+        self._lock = Lock()
+
+    def get(
+        self,
+        registration: DependencyRegistration
+    ) -> TypeStats:
+        '''
+        Returns (creating if needed) the counters for a registration.
+
+        `registration`: The registration to get the counters for.
+        '''
+
+        stats_key = (registration.dependency_type, registration.key)
+        type_stats = self._types.get(stats_key)
+        if type_stats is None:
+            with self._lock:
+                type_stats = self._types.setdefault(
+                    stats_key,
+                    TypeStats(registration.lifetime))
+        return type_stats
+
+    def wrap_resolve(
+        self,
+        registration: DependencyRegistration,
+        activator: Callable[[], Any]
+    ) -> Callable[[], Any]:
+        '''
+        Wraps an activator so every resolve is counted, along with whether a
+        singleton was served from its cache.
+
+        `registration`: The registration the activator resolves.
+        `activator`: The activator to wrap.
+        '''
+
+        type_stats = self.get(registration)
+
+        if registration.lifetime == Lifetime.Singleton:
+            def counted_singleton_activator():
+                type_stats.resolves += 1
+                if registration.instance is not None:
+                    type_stats.singleton_hits += 1
+                return activator()
+            return counted_singleton_activator
+
+        def counted_activator():
+            type_stats.resolves += 1
+            return activator()
+        return counted_activator
+
+    def wrap_construct(
+        self,
+        registration: DependencyRegistration,
+        construct: Callable[[], Any]
+    ) -> Callable[[], Any]:
+        '''
+        Wraps a constructor so every construction is counted and timed.
+
+        `registration`: The registration the constructor creates.
+        `construct`: The constructor to wrap.
+        '''
+
+        type_stats = self.get(registration)
+        perf_counter = time.perf_counter
+
+        def timed_construct():
+            start = perf_counter()
+            instance = construct()
+            type_stats.record_construction(perf_counter() - start)
+            return instance
+        return timed_construct
+
+    def measure(
+        self,
+        registration: DependencyRegistration
+    ) -> _StatsMeasurement:
+        '''
+        Returns a context manager that counts and times a construction.
+
+        `registration`: The registration being constructed.
+        '''
+
+        return _StatsMeasurement(self.get(registration))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        '''
+        Returns a snapshot of the counters keyed by type name, with the key
+        of keyed registrations in brackets.
+        '''
+
+        with self._lock:
+            types = list(self._types.items())
+
+        return {(get_type_name(dependency_type) if key is None else f'{get_type_name(dependency_type)}[{key!r}]'):
+                type_stats.to_dict()
+                for (dependency_type, key), type_stats in types}
+
+    def reset(self) -> None:
+        '''
+        Zeroes all counters. Counters are reset in place since compiled
+        plans hold on to them.
+        '''
+
+        with self._lock:
+            for type_stats in self._types.values():
+                type_stats.reset()
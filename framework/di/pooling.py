@@ -0,0 +1,124 @@
+from collections import deque
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+from framework.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ObjectPool:
+    '''
+    A bounded pool of reusable instances for pooled registrations.
+
+    Checkouts reuse an idle instance when one is available and construct a new
+    one otherwise. At most `max_size` instances are kept for reuse: a checkout
+    made while `max_size` instances are already in use is counted as an
+    exhaustion and served by an overflow instance that is discarded when it is
+    returned, so resolution never blocks.
+    '''
+
+    @property
+    def max_size(self) -> int:
+        '''
+        The maximum number of instances retained for reuse.
+        '''
+
+        return self._max_size
+
+    def __init__(
+        self,
+        create: Callable[[], Any],
+        max_size: int,
+        reset: Optional[Callable[[Any], None]] = None
+    ):
+        '''
+        Initializes an ObjectPool.
+
+        `create`: A zero-argument callable that constructs a new instance.
+        `max_size`: The maximum number of instances retained for reuse.
+        `reset`: An optional hook called with an instance when it is returned;
+            instances whose reset raises are discarded.
+        '''
+
+        if max_size is None or max_size < 1:
+            raise ValueError('max_size must be greater than zero')
+
+        self._create = create
+        self._max_size = max_size
+        self._reset = reset
+
+        self._idle = deque()
+        self._lock = Lock()
+
+        self._in_use = 0
+        self._created = 0
+        self._reused = 0
+        self._returned = 0
+        self._discarded = 0
+        self._exhausted = 0
+
+    def acquire(self) -> Any:
+        '''
+        Check out an instance from the pool.
+        '''
+
+        with self._lock:
+            if self._in_use >= self._max_size:
+                self._exhausted += 1
+            self._in_use += 1
+
+            if self._idle:
+                self._reused += 1
+                return self._idle.pop()
+
+        try:
+            instance = self._create()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+            raise
+
+        with self._lock:
+            self._created += 1
+        return instance
+
+    def release(self, instance: Any) -> None:
+        '''
+        Return a checked out instance to the pool.
+
+        `instance`: The instance to return.
+        '''
+
+        keep = True
+        if self._reset is not None:
+            try:
+                self._reset(instance)
+            except Exception as ex:
+                logger.warning(f"Error resetting pooled instance, discarding: {ex}")
+                keep = False
+
+        with self._lock:
+            self._in_use -= 1
+            self._returned += 1
+
+            if keep and len(self._idle) < self._max_size:
+                self._idle.append(instance)
+            else:
+                self._discarded += 1
+
+    def stats(self) -> Dict[str, int]:
+        '''
+        Returns a snapshot of the pool counters.
+        '''
+
+        with self._lock:
+            return dict(
+                max_size=self._max_size,
+                idle=len(self._idle),
+                in_use=self._in_use,
+                created=self._created,
+                reused=self._reused,
+                returned=self._returned,
+                discarded=self._discarded,
+                exhausted=self._exhausted)
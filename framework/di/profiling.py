@@ -0,0 +1,295 @@
+import json
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from framework.di.generics import get_qualified_type_name, get_type_name
+
+
+class ConstructionRecord:
+    __slots__ = ('dependency_type', 'parent', 'stack', 'start', 'duration', 'child_time')
+
+    @property
+    def type_name(self) -> str:
+        '''
+        The name of the constructed type.
+        '''
+
+        return get_type_name(self.dependency_type)
+
+    @property
+    def self_time(self) -> float:
+        '''
+        The wall time spent in this construction excluding nested constructions.
+        '''
+
+        return max(self.duration - self.child_time, 0.0)
+
+    def __init__(
+        self,
+        dependency_type: type,
+        parent: Optional['ConstructionRecord'],
+        start: float
+    ):
+        '''
+        Initializes a ConstructionRecord object.
+
+        `dependency_type`: The type being constructed.
+        `parent`: The record of the construction this one is nested in, if any.
+        `start`: The perf_counter value when construction started.
+        '''
+
+        self.dependency_type = dependency_type
+        self.parent = parent
+        self.stack = (parent.stack if parent is not None else ()) + (dependency_type,)
+        self.start = start
+        self.duration = 0.0
+        self.child_time = 0.0
+
+
+class _Measurement:
+    __slots__ = ('_profiler', '_dependency_type', '_record', '_token')
+
+    def __init__(self, profiler: 'ConstructionProfiler', dependency_type: type):
+        self._profiler = profiler
+        self._dependency_type = dependency_type
+
+    def __enter__(self) -> ConstructionRecord:
+        current = self._profiler._current
+        self._record = ConstructionRecord(
+            dependency_type=self._dependency_type,
+            parent=current.get(),
+            start=time.perf_counter())
+        self._token = current.set(self._record)
+        return self._record
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        record = self._record
+        record.duration = time.perf_counter() - record.start
+        self._profiler._current.reset(self._token)
+
+        if record.parent is not None:
+            record.parent.child_time += record.duration
+
+        self._profiler._add_record(record)
+
+
+class ConstructionProfiler:
+    '''
+    Records the wall time of every construction performed by a ServiceProvider,
+    including constructions nested inside other constructors. The current
+    construction is tracked in a context variable so nesting is attributed
+    correctly across threads and asyncio tasks.
+    '''
+
+    @property
+    def records(self) -> List[ConstructionRecord]:
+        '''
+        Returns a snapshot of the recorded constructions in completion order.
+        '''
+
+        with self._lock:
+            return list(self._records)
+
+    def __init__(self):
+        self._records: List[ConstructionRecord] = []
+        self._lock = Lock()
+        self._current: ContextVar[Optional[ConstructionRecord]] = ContextVar(
+            f'construction_profiler_{id(self)}', default=None)
+
+    def measure(self, dependency_type: type) -> _Measurement:
+        '''
+        Returns a context manager that records the construction of a type.
+
+        `dependency_type`: The type being constructed.
+        '''
+
+        return _Measurement(self, dependency_type)
+
+    def wrap(self, dependency_type: type, construct: Callable[[], Any]) -> Callable[[], Any]:
+        '''
+        Wraps a zero-argument constructor so every call is recorded.
+
+        `dependency_type`: The type the constructor creates.
+        `construct`: The constructor to wrap.
+        '''
+
+        def measured_construct():
+            with _Measurement(self, dependency_type):
+                return construct()
+        return measured_construct
+
+    def reset(self) -> None:
+        '''
+        Discards all recorded constructions.
+        '''
+
+        with self._lock:
+            self._records.clear()
+
+    def _add_record(self, record: ConstructionRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def report(self, graph: Optional[Dict] = None) -> 'ConstructionReport':
+        '''
+        Aggregates the recorded constructions per type.
+
+        `graph`: A dependency graph from ServiceProvider._create_dependency_graph,
+            used to compute the critical path.
+        '''
+
+        return ConstructionReport(
+            records=self.records,
+            graph=graph)
+
+
+class ConstructionReport:
+    '''
+    Per-type self and inclusive construction times, the critical path through
+    the dependency graph and the collapsed construction stacks.
+    '''
+
+    def __init__(
+        self,
+        records: List[ConstructionRecord],
+        graph: Optional[Dict] = None
+    ):
+        nodes = graph['nodes'] if graph is not None else []
+        self._names = self._get_names(
+            [record.dependency_type for record in records]
+            + [node.dependency_type for node in nodes])
+        self._times = self._aggregate(records)
+
+        self.types = {self._names[_type]: entry for _type, entry in self._times.items()}
+        self.stacks = self._collapse(records)
+        self.critical_path, self.critical_path_time = self._get_critical_path(graph)
+
+    def _get_names(self, types: Iterable[Any]) -> Dict[Any, str]:
+        '''
+        Names every type by its short name, qualified with its module where
+        types from different modules share a short name.
+        '''
+
+        types = set(types)
+        counts = Counter(get_type_name(_type) for _type in types)
+        return {
+            _type: (get_type_name(_type) if counts[get_type_name(_type)] == 1
+                    else get_qualified_type_name(_type))
+            for _type in types}
+
+    def _aggregate(self, records: List[ConstructionRecord]) -> Dict[Any, Dict]:
+        types = dict()
+        for record in records:
+            entry = types.setdefault(record.dependency_type, dict(
+                count=0,
+                self_time=0.0,
+                inclusive_time=0.0))
+            entry['count'] += 1
+            entry['self_time'] += record.self_time
+            entry['inclusive_time'] += record.duration
+
+        return dict(sorted(
+            types.items(),
+            key=lambda item: item[1]['inclusive_time'],
+            reverse=True))
+
+    def _collapse(self, records: List[ConstructionRecord]) -> Dict[str, float]:
+        stacks = defaultdict(float)
+        for record in records:
+            stacks[';'.join(self._names[_type] for _type in record.stack)] += record.self_time
+        return dict(stacks)
+
+    def _get_critical_path(self, graph: Optional[Dict]) -> tuple[List[str], float]:
+        '''
+        Finds the most expensive chain of dependencies, weighting every type by
+        its self time. This is the lower bound on startup time if everything
+        else were constructed in parallel.
+        '''
+
+        if graph is None:
+            return [], 0.0
+
+        dependencies = defaultdict(list)
+        in_degree = defaultdict(int)
+        for dependency, dependents in graph['edges'].items():
+            for dependent in dependents:
+                dependencies[dependent].append(dependency)
+                in_degree[dependent] += 1
+
+        cost = dict()
+        previous = dict()
+        queue = [node for node in graph['nodes'] if in_degree[node] == 0]
+        while queue:
+            node = queue.pop()
+            own_time = self._times.get(node.dependency_type, dict()).get('self_time', 0.0)
+
+            best = max(dependencies[node], key=lambda d: cost[d], default=None)
+            cost[node] = own_time + (cost[best] if best is not None else 0.0)
+            previous[node] = best
+
+            for dependent in graph['edges'][node]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        if not cost:
+            return [], 0.0
+
+        node = max(cost, key=cost.get)
+        total = cost[node]
+        path = []
+        while node is not None:
+            path.append(self._names[node.dependency_type])
+            node = previous[node]
+
+        return path[::-1], total
+
+    def to_dict(self) -> Dict:
+        '''
+        Returns the report as a JSON-serializable dictionary (times in seconds).
+        '''
+
+        return dict(
+            types=self.types,
+            critical_path=self.critical_path,
+            critical_path_time=self.critical_path_time)
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        '''
+        Returns the report serialized as JSON.
+        '''
+
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_collapsed(self) -> str:
+        '''
+        Returns the construction stacks in the collapsed-stack format consumed
+        by flamegraph tooling, weighted by self time in microseconds.
+        '''
+
+        return '\n'.join(
+            f'{stack} {round(self_time * 1_000_000)}'
+            for stack, self_time in self.stacks.items())
+
+    def dump_json(self, path: str) -> None:
+        '''
+        Writes the report to a JSON file.
+
+        `path`: The file to write.
+        '''
+
+        with open(path, 'w') as file:
+            file.write(self.to_json())
+
+    def dump_collapsed(self, path: str) -> None:
+        '''
+        Writes the collapsed construction stacks to a file.
+
+        `path`: The file to write.
+        '''
+
+        with open(path, 'w') as file:
+            file.write(self.to_collapsed())
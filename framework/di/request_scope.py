@@ -0,0 +1,142 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from framework.logger import get_logger
+
+logger = get_logger(__name__)
+
+# The active request scope. Each request runs in its own task (ASGI/Quart) or
+# thread context (Flask), so a context variable gives every in-flight request
+# its own scope without any per-route or per-request bookkeeping.
+_request_scope: ContextVar[Optional['ServiceScope']] = ContextVar(
+    'di_request_scope', default=None)
+
+
+def get_request_scope() -> Optional['ServiceScope']:
+    '''
+    Returns the scope of the current request, or None outside of a request.
+    '''
+
+    return _request_scope.get()
+
+
+def begin_request_scope(
+    provider: 'ServiceProvider'
+) -> 'ServiceScope':
+    '''
+    Create a scope and make it the current request scope.
+
+    `provider`: The root service provider.
+    '''
+
+    scope = provider.create_scope()
+    _request_scope.set(scope)
+    return scope
+
+
+def end_request_scope() -> None:
+    '''
+    Dispose the current request scope and clear it.
+    '''
+
+    scope = _request_scope.get()
+    if scope is not None:
+        _request_scope.set(None)
+        scope.dispose()
+
+
+async def end_request_scope_async() -> None:
+    '''
+    Asynchronously dispose the current request scope and clear it.
+    '''
+
+    scope = _request_scope.get()
+    if scope is not None:
+        _request_scope.set(None)
+        await scope.dispose_async()
+
+
+@asynccontextmanager
+async def request_scope(
+    provider: 'ServiceProvider'
+):
+    '''
+    Run a block within a new request scope, disposing it asynchronously when
+    the block exits.
+
+    `provider`: The root service provider.
+    '''
+
+    scope = provider.create_scope()
+    token = _request_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _request_scope.reset(token)
+        await scope.dispose_async()
+
+
+class RequestScopeMiddleware:
+    '''
+    ASGI middleware that runs every HTTP and websocket request within its own
+    request scope.
+    '''
+
+    def __init__(
+        self,
+        app,
+        provider: 'ServiceProvider'
+    ):
+        self._app = app
+        self._provider = provider
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] not in ('http', 'websocket'):
+            return await self._app(scope, receive, send)
+
+        async with request_scope(self._provider):
+            await self._app(scope, receive, send)
+
+
+def use_request_scope_flask(
+    app,
+    provider: 'ServiceProvider'
+) -> None:
+    '''
+    Install Flask hooks that create a request scope before each request and
+    dispose it at teardown.
+
+    `app`: The Flask app.
+    `provider`: The root service provider.
+    '''
+
+    @app.before_request
+    def before_request():
+        begin_request_scope(provider)
+
+    @app.teardown_request
+    def teardown_request(exception=None):
+        end_request_scope()
+
+
+def use_request_scope_quart(
+    app,
+    provider: 'ServiceProvider'
+) -> None:
+    '''
+    Install Quart hooks that create a request scope before each request and
+    dispose it asynchronously at teardown. The hooks are coroutines so they
+    run in the request task's context rather than in an executor.
+
+    `app`: The Quart app.
+    `provider`: The root service provider.
+    '''
+
+    @app.before_request
+    async def before_request():
+        begin_request_scope(provider)
+
+    @app.teardown_request
+    async def teardown_request(exception=None):
+        await end_request_scope_async()
@@ -1,10 +1,15 @@
 import inspect
 from functools import lru_cache
-from typing import Any, Callable, Optional
+from typing import (Any, Callable, ForwardRef, Optional, TypeVar, get_args,
+                    get_origin, get_type_hints)
 
+from framework.di.deferred import DEFERRED_TYPES
 from framework.di.dependencies import (ConstructorDependency,
                                        DependencyRegistration,
                                        Lifetime)
+from framework.di.exceptions import InvalidDependencyChainError
+from framework.di.generics import is_open_generic, substitute
+from framework.di.metadata_cache import RegistrationMetadataCache
 
 
 @lru_cache(maxsize=2048)
@@ -12,11 +17,53 @@ def get_signature(fn):
     return inspect.signature(fn)
 
 
+def is_forward_ref(annotation: Any) -> bool:
+    '''
+    Indicates whether an annotation is, or is parameterized by, a string
+    forward reference such as `Lazy['B']`.
+    '''
+
+    if isinstance(annotation, (str, ForwardRef)):
+        return True
+    return any(is_forward_ref(arg) for arg in get_args(annotation))
+
+
 class ServiceCollection:
+    @property
+    def metadata_cache(self) -> Optional[RegistrationMetadataCache]:
+        '''
+        The on-disk registration metadata cache, if one is configured.
+        '''
+
+        return self._metadata_cache
+
     def __init__(
-        self
+        self,
+        metadata_cache: Optional[RegistrationMetadataCache] = None
     ):
+        '''
+        Initializes a ServiceCollection.
+
+        `metadata_cache`: An optional on-disk cache of constructor parameters
+            and build order, used to skip introspection and validation on
+            restarts where nothing has changed.
+        '''
+
+        # The registration resolved for each type; a later registration of a
+        # type replaces the earlier one here
         self._container = dict()
+        # Keyed registrations by (type, key)
+        self._keyed_container = dict()
+        # Every registration in registration order, for resolve_all()
+        self._registrations = list()
+        # Open generic registrations (e.g. Repository[T]) by generic origin
+        self._open_generics = dict()
+        self._metadata_cache = metadata_cache
+
+        # Incremented on every registration, so a validated build order is
+        # reused only while the registrations are unchanged
+        self._version = 0
+        self._validated_build_order = None
 
     def get_type_dependencies(
         self,
@@ -28,6 +75,11 @@ class ServiceCollection:
         `_type` (type): The type for which to retrieve the constructor dependencies.
         '''
 
+        if self._metadata_cache is not None:
+            cached = self._metadata_cache.get_constructor_params(_type)
+            if cached is not None:
+                return cached
+
         # Get the parameters of the constructor of the type
         params = get_signature(_type).parameters
 
@@ -35,16 +87,59 @@ class ServiceCollection:
         # for each parameter in the constructor
         types = []
         for name, param in params.items():
-            if param.annotation == inspect.Parameter.empty:
+            annotation = param.annotation
+            if annotation == inspect.Parameter.empty:
                 raise Exception(
                     f"Encountered parameter with no annotation in type {_type.__name__}: {name}")
 
-            constructor_dependency = ConstructorDependency(
-                name=name,
-                _type=param.annotation)
+            if is_forward_ref(annotation):
+                annotation = self._resolve_forward_ref(_type, name)
+
+            # Lazy[T] and Factory[T] are injected deferred and resolve T
+            deferred = get_origin(annotation)
+            if deferred in DEFERRED_TYPES:
+                constructor_dependency = ConstructorDependency(
+                    name=name,
+                    _type=get_args(annotation)[0],
+                    deferred=deferred)
+            else:
+                constructor_dependency = ConstructorDependency(
+                    name=name,
+                    _type=annotation)
             types.append(constructor_dependency)
+
+        if self._metadata_cache is not None:
+            self._metadata_cache.set_constructor_params(_type, types)
+
         return types
 
+    def _resolve_forward_ref(
+        self,
+        _type: type,
+        name: str
+    ) -> Any:
+        '''
+        Resolves the forward references in the annotation of a constructor
+        parameter against the module of the type.
+
+        `_type`: The type whose constructor declares the parameter.
+        `name`: The name of the parameter.
+        '''
+
+        try:
+            annotation = get_type_hints(_type.__init__).get(name)
+        except Exception as ex:
+            raise InvalidDependencyChainError(
+                f"Failed to resolve the annotation of parameter '{name}' "
+                f"of type '{_type.__name__}': {ex}")
+
+        if annotation is None or is_forward_ref(annotation):
+            raise InvalidDependencyChainError(
+                f"Failed to resolve the annotation of parameter '{name}' "
+                f"of type '{_type.__name__}'")
+
+        return annotation
+
     def add(
         self,
         dependency_type: type,
@@ -66,7 +161,8 @@ class ServiceCollection:
         implementation_type: type = None,
         instance: Any = None,
         factory: Callable = None,
-        eager: bool = False
+        eager: bool = False,
+        key: Any = None
     ) -> None:
         '''
         Adds a singleton dependency to the service collection.
@@ -77,6 +173,7 @@ class ServiceCollection:
         `factory`: A factory function that creates the dependency
         `eager`: If True, construct the singleton at build() time instead of
             lazily on first resolve().
+        `key`: An optional key, resolved with resolve(dependency_type, key=key)
         '''
 
         self._register_dependency(
@@ -85,13 +182,15 @@ class ServiceCollection:
             lifetime='singleton',
             instance=instance,
             factory=factory,
-            eager=eager)
+            eager=eager,
+            key=key)
 
     def add_transient(
         self,
         dependency_type: type,
         implementation_type: type = None,
-        factory: Callable = None
+        factory: Callable = None,
+        key: Any = None
     ) -> None:
         '''
         Adds a transient dependency to the service collection.
@@ -99,19 +198,22 @@ class ServiceCollection:
         `dependency_type`: The type of the dependency
         `implementation_type` (type, optional): The type that implements the dependency
         `factory`: A factory function that creates the dependency
+        `key`: An optional key, resolved with resolve(dependency_type, key=key)
         '''
 
         self._register_dependency(
             implementation_type=implementation_type,
             dependency_type=dependency_type,
             lifetime='transient',
-            factory=factory)
+            factory=factory,
+            key=key)
 
     def add_scoped(
         self,
         dependency_type: type,
         implementation_type: type = None,
-        factory: Callable = None
+        factory: Callable = None,
+        key: Any = None
     ) -> None:
         '''
         Adds a scoped dependency to the service collection.
@@ -119,13 +221,49 @@ class ServiceCollection:
         `dependency_type`: The type of the dependency
         `implementation_type` (type, optional): The type that implements the dependency
         `factory`: A factory function that creates the dependency
+        `key`: An optional key, resolved with resolve(dependency_type, key=key)
         '''
 
         self._register_dependency(
             implementation_type=implementation_type,
             dependency_type=dependency_type,
             lifetime='scoped',
-            factory=factory)
+            factory=factory,
+            key=key)
+
+    def add_pooled(
+        self,
+        dependency_type: type,
+        implementation_type: type = None,
+        factory: Callable = None,
+        max_size: int = 16,
+        reset: Callable = None,
+        key: Any = None
+    ) -> None:
+        '''
+        Adds a pooled dependency to the service collection. Pooled instances
+        are checked out of a bounded pool when resolved from a scope and
+        returned when the scope is disposed.
+
+        `dependency_type`: The type of the dependency
+        `implementation_type` (type, optional): The type that implements the dependency
+        `factory`: A factory function that creates the dependency
+        `max_size`: The maximum number of instances retained for reuse
+        `reset`: A hook called with an instance when it is returned to the pool
+        `key`: An optional key, resolved with resolve(dependency_type, key=key)
+        '''
+
+        if max_size is None or max_size < 1:
+            raise ValueError('max_size must be greater than zero')
+
+        self._register_dependency(
+            implementation_type=implementation_type,
+            dependency_type=dependency_type,
+            lifetime='pooled',
+            factory=factory,
+            max_size=max_size,
+            reset=reset,
+            key=key)
 
     def register_many(
         self,
@@ -152,16 +290,26 @@ class ServiceCollection:
         `**kwargs`: Additional keyword arguments for configuring the dependency.
         '''
 
+        self._version += 1
+
+        if is_open_generic(dependency_type):
+            self._register_open_generic(
+                implementation_type=implementation_type,
+                dependency_type=dependency_type,
+                **kwargs)
+            return
+
         # If implementation_type is None, use the dependency type
         # as the implementation_type
         if implementation_type is None:
             implementation_type = dependency_type
 
-        # factory = kwargs.get('factory')
+        # Factories and registered instances are never constructed by the
+        # container, so there is no constructor to introspect
         constructor_params = (
             self.get_type_dependencies(
                 _type=implementation_type)
-            if kwargs.get('factory') is None else []
+            if kwargs.get('factory') is None and kwargs.get('instance') is None else []
         )
 
         # Create the dependency registration
@@ -177,13 +325,92 @@ class ServiceCollection:
 
         def resolver_fn(provider, *_):
             return impl(
-                **{param.name: provider.resolve(param.dependency_type)
+                **{param.name: param.resolve(provider)
                    for param in captured_params})
 
         dependency._resolver_fn = resolver_fn
 
-        # Add the dependency to the container
-        self._container[dependency_type] = dependency
+        # Add the dependency to the container. Registering a key a second
+        # time replaces the earlier keyed registration, while unkeyed
+        # registrations of a type accumulate for resolve_all()
+        if dependency.key is None:
+            self._container[dependency_type] = dependency
+        else:
+            replaced = self._keyed_container.get((dependency_type, dependency.key))
+            if replaced is not None:
+                self._registrations.remove(replaced)
+            self._keyed_container[(dependency_type, dependency.key)] = dependency
+
+        self._registrations.append(dependency)
+
+    def _register_open_generic(
+        self,
+        implementation_type: Any,
+        dependency_type: Any,
+        **kwargs
+    ) -> None:
+        '''
+        Register an open generic (e.g. Repository[T]). Closed types such as
+        Repository[User] are resolved from it on demand, with the type
+        variables in the constructor annotations replaced by the closed
+        type's arguments.
+
+        `implementation_type`: The generic implementation, either a generic
+            class or a generic parameterized by the dependency's type
+            variables (defaults to the dependency's generic class).
+        `dependency_type`: The open generic dependency type.
+        `**kwargs`: Additional keyword arguments for configuring the dependency.
+        '''
+
+        for option in ['instance', 'factory', 'key', 'eager']:
+            if kwargs.get(option):
+                raise ValueError(
+                    f"Open generic registration '{dependency_type}' does not support '{option}'")
+
+        if implementation_type is None:
+            implementation_type = get_origin(dependency_type)
+
+        implementation_origin = get_origin(implementation_type) or implementation_type
+        parameters = set(dependency_type.__parameters__)
+
+        def get_unbound(_type: Any) -> list:
+            if isinstance(_type, TypeVar):
+                return [] if _type in parameters else [_type]
+            return [parameter for parameter in getattr(_type, '__parameters__', ())
+                    if parameter not in parameters]
+
+        unbound = get_unbound(implementation_type)
+        if unbound:
+            raise ValueError(
+                f"Implementation of '{dependency_type}' uses type variables "
+                f"that are not parameters of the dependency type: {unbound}")
+
+        # Express the implementation's constructor annotations in terms of
+        # the type variables of the dependency
+        origin_parameters = getattr(implementation_origin, '__parameters__', ())
+        type_arguments = {parameter: parameter for parameter in origin_parameters}
+        type_arguments.update(zip(origin_parameters, get_args(implementation_type)))
+
+        constructor_params = []
+        for param in self.get_type_dependencies(_type=implementation_origin):
+            param_type = substitute(param.dependency_type, type_arguments)
+
+            unbound = get_unbound(param_type)
+            if unbound:
+                raise ValueError(
+                    f"Parameter '{param.name}' of '{dependency_type}' uses type variables "
+                    f"that are not parameters of the dependency type: {unbound}")
+
+            constructor_params.append(ConstructorDependency(
+                name=param.name,
+                _type=param_type,
+                deferred=param.deferred))
+
+        self._open_generics[get_origin(dependency_type)] = DependencyRegistration(
+            implementation_type=implementation_type,
+            dependency_type=dependency_type,
+            constructor_params=constructor_params,
+            **kwargs)
 
     def get_container(
         self
@@ -194,6 +421,61 @@ class ServiceCollection:
 
         return self._container
 
+    def get_keyed_container(
+        self
+    ) -> dict[tuple[type, Any], DependencyRegistration]:
+        '''
+        Get the keyed registrations by (type, key)
+        '''
+
+        return self._keyed_container
+
+    def get_validated_build_order(
+        self
+    ) -> Optional[list[DependencyRegistration]]:
+        '''
+        Get the build order validated by a provider built from this
+        collection, or None if the registrations have changed since
+        '''
+
+        if self._validated_build_order is None:
+            return None
+
+        version, build_order = self._validated_build_order
+        return build_order if version == self._version else None
+
+    def set_validated_build_order(
+        self,
+        build_order: list[DependencyRegistration]
+    ) -> None:
+        '''
+        Cache a validated build order until the registrations change
+
+        `build_order`: The validated build order
+        '''
+
+        self._validated_build_order = (self._version, list(build_order))
+
+    def get_open_generics(
+        self
+    ) -> dict[type, DependencyRegistration]:
+        '''
+        Get the open generic registrations by generic class
+        '''
+
+        return self._open_generics
+
+    def get_registrations(
+        self
+    ) -> list[DependencyRegistration]:
+        '''
+        Get every registration in registration order, including keyed
+        registrations and unkeyed registrations replaced by a later
+        registration of the same type
+        '''
+
+        return self._registrations
+
     def build_provider(self, eager_all: bool = False) -> 'ServiceProvider':
         '''
         Finalize registrations and return a built ServiceProvider.
@@ -204,7 +486,7 @@ class ServiceCollection:
         '''
         from framework.di.service_provider import ServiceProvider
         if eager_all:
-            for registration in self._container.values():
+            for registration in self._registrations:
                 if registration.lifetime == Lifetime.Singleton:
                     registration.eager = True
         provider = ServiceProvider(self)
@@ -1,20 +1,40 @@
 import asyncio
 import inspect
-from collections import defaultdict
+from collections import ChainMap, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, nullcontext
 from functools import wraps
 from threading import Lock, RLock
-from typing import Any, Callable, Dict, List, Optional, Set
-
-from framework.di.dependencies import DependencyRegistration, Lifetime
-from framework.di.exceptions import (InvalidDependencyChainError,
+from typing import Any, Callable, Dict, List, Optional, Set, get_origin
+
+from framework.concurrency import BackgroundEventLoop
+from framework.di.deferred import Factory
+from framework.di.dependencies import (ConstructorDependency,
+                                       DependencyRegistration, Lifetime)
+from framework.di.disposal import dispose_levels_async
+from framework.di.exceptions import (DependencyCycleError,
+                                     PooledDependencyInjectionError,
                                      RegistrationNotFoundError,
                                      RegistrationNotFoundForInstantiationError,
+                                     ScopedDependencyInjectionError,
                                      TransientDependencyInjectionError)
+from framework.di.generics import close_registration, get_type_name
+from framework.di.injection import HandlerInjectionPlan
+from framework.di.metrics import ResolutionStats
+from framework.di.pooling import ObjectPool
+from framework.di.profiling import ConstructionProfiler, ConstructionReport
+from framework.di.request_scope import (RequestScopeMiddleware,
+                                        get_request_scope,
+                                        use_request_scope_flask,
+                                        use_request_scope_quart)
 from framework.di.service_collection import ServiceCollection
 from framework.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Plan key marker for the resolve_all() plan of a type
+ALL_REGISTRATIONS = object()
+
 
 class ServiceProvider:
     '''
@@ -78,34 +98,120 @@ class ServiceProvider:
         '''
         return len(self.singleton_registrations) + len(self.factory_registrations)
 
-    def __init__(self, service_collection: ServiceCollection):
+    @property
+    def profiler(self) -> Optional[ConstructionProfiler]:
         '''
-        Initializes a ServiceProvider instance with a given ServiceCollection.
+        Returns the construction profiler, or None if profiling is disabled.
+        '''
+        return self._profiler
+
+    def __init__(
+        self,
+        service_collection: ServiceCollection,
+        profile: bool = False,
+        collect_stats: bool = False,
+        dispose_timeout: Optional[float] = None
+    ):
         '''
-        container = service_collection.get_container()
+        Initializes a ServiceProvider instance with a given ServiceCollection.
 
-        self._dependency_lookup = container
-        self._dependencies = list(container.values())
+        `profile`: If True, record the wall time of every construction
+            (see get_construction_report()).
+        `collect_stats`: If True, collect per-type resolution counters and
+            construction time histograms (see stats()).
+        `dispose_timeout`: The deadline in seconds for disposing a scope's
+            instances, and the default deadline of aclose() (unbounded if
+            None).
+        '''
+        self._dependency_lookup = service_collection.get_container()
+        self._keyed_lookup = service_collection.get_keyed_container()
+        registrations = service_collection.get_registrations()
+        # The registrations resolve() can return. An unkeyed registration
+        # replaced by a later one is only reachable through resolve_all(), so
+        # it is not validated or built.
+        active = set(self._dependency_lookup.values()) | set(self._keyed_lookup.values())
+        self._dependencies = [registration for registration in registrations
+                              if registration in active]
+        # Open generic registrations by generic class, and the registrations
+        # of the closed types resolved from them so far
+        self._open_generics = service_collection.get_open_generics()
+        self._closed_generics: dict[Any, DependencyRegistration] = {}
+        self._metadata_cache = service_collection.metadata_cache
+        # The collection caches the validated build order until a
+        # registration changes
+        self._service_collection = service_collection
+
+        # Every registration of each type in registration order, for
+        # resolve_all()
+        self._registrations_by_type: dict[type, tuple[DependencyRegistration, ...]] = {}
+        for registration in registrations:
+            self._registrations_by_type[registration.dependency_type] = (
+                self._registrations_by_type.get(registration.dependency_type, ()) + (registration,))
 
         self._built_dependencies = []
         self._built_types = []
         self._built_type_lookup = {}
 
-        self._singleton_instances: dict[type, Any] = {}
-        # RLock is required for recursive synchronous dependency resolution:
-        # singleton A's constructor may call resolve(B), which re-enters this
-        # lock on the same thread. A plain Lock would deadlock.
+        # The singletons constructed by this provider (not those registered
+        # as instances) by plan key, in the order they were constructed. A
+        # singleton is published after its constructor params, so this is a
+        # topological order and aclose() disposes in reverse.
+        self._constructed_singletons: dict[Any, DependencyRegistration] = {}
+        self._dispose_timeout = dispose_timeout
+        # Compiled resolution plans: a zero-argument activator per registration,
+        # with constructor-param activators captured inline. Plans are keyed by
+        # type for the registration resolve(type) returns, by (type, key) for
+        # keyed registrations, by the registration itself for registrations
+        # only reachable through resolve_all(), and by (type, ALL_REGISTRATIONS)
+        # for the resolve_all() plan of a type (see _get_plan_key).
+        #
+        # The published table is immutable: it is never mutated once assigned,
+        # and newly compiled plans are published by swapping in a new table
+        # under the compile lock. resolve() is a single attribute load and a
+        # dict lookup on a table no thread writes to, so the read path takes
+        # no locks and is safe without the GIL (free-threaded builds).
+        self._activators: dict[Any, Callable[[], Any]] = {}
+        # Plans compiled but not yet published, touched only under the compile
+        # lock. A plan and the plans of its constructor params are published
+        # together in one swap once the outermost compilation completes.
+        self._pending_activators: dict[Any, Callable[[], Any]] = {}
+        self._compile_depth = 0
+        # Guards compilation so concurrent first resolves of a type share one
+        # plan (and so one singleton lock). Reentrant because compiling a plan
+        # compiles the plans of its constructor params. Never held across
+        # construction.
+        self._compile_lock = RLock()
+
+        # Per-registration RLocks for thread-safe lazy singleton construction,
+        # created when the singleton's plan is compiled. RLock is required for recursive
+        # synchronous dependency resolution: singleton A's constructor may call
+        # resolve(B), which may in turn re-enter A's lock on the same thread.
+        # Per-type locks let unrelated singletons be constructed in parallel.
+        #
+        # A constructed singleton is published by a single store to
+        # registration.instance once construction has completed, so readers
+        # either see None (and take the lock) or the finished instance.
+        self._singleton_locks: dict[DependencyRegistration, RLock] = {}
+        # Protects writes to the singleton instance cache and the built
+        # dependency lists only; never held while acquiring another lock
         self._cache_lock = RLock()
 
-        # Per-type asyncio.Lock objects for coroutine-safe lazy singleton
+        # Per-registration asyncio.Lock objects for coroutine-safe lazy singleton
         # construction. A single global async lock would deadlock when singleton
         # A's async constructor awaits resolve_async(B) (A → B → lock already
         # held). Unrelated singleton types must also not serialise each other.
-        self._async_singleton_locks: dict[type, asyncio.Lock] = {}
+        self._async_singleton_locks: dict[DependencyRegistration, asyncio.Lock] = {}
         # Tiny synchronous lock protecting only the lock-dictionary itself;
         # never held across construction or any await.
         self._async_lock_registry = Lock()
 
+        self._profiler = ConstructionProfiler() if profile else None
+        self._stats = ResolutionStats() if collect_stats else None
+
+        # Object pools for pooled registrations by plan key, created on first
+        # checkout
+        self._pools: dict[Any, ObjectPool] = {}
+
         self._initialize_provider()
 
     def _initialize_provider(self) -> None:
@@ -130,132 +236,501 @@ class ServiceProvider:
         '''
         Marks a DependencyRegistration instance as built and updates the built types and dependencies.
         '''
-        self._built_type_lookup[registration.implementation_type] = registration
-        self._built_types.append(registration.implementation_type)
-        self._built_dependencies.append(registration)
+        with self._cache_lock:
+            self._built_type_lookup[registration.implementation_type] = registration
+            self._built_types.append(registration.implementation_type)
+            self._built_dependencies.append(registration)
+
+    def _set_singleton_instance(self, registration: DependencyRegistration, instance: Any) -> None:
+        '''
+        Publishes a constructed singleton instance. Must be called while
+        holding the type's singleton lock (sync or async).
+        '''
+        registration.instance = instance
+        with self._cache_lock:
+            self._constructed_singletons[self._get_plan_key(registration)] = registration
 
-    def resolve(self, _type: type) -> Any:
+    def resolve(self, _type: type, key: Any = None) -> Any:
         '''
         Resolves a service for a given type.
+
+        `key`: The key of a keyed registration of the type.
+        '''
+        if key is None:
+            activator = self._activators.get(_type)
+            if activator is None:
+                activator = self._compile_activator(_type)
+            return activator()
+
+        activator = self._activators.get((_type, key))
+        if activator is None:
+            activator = self._compile_keyed_activator(_type, key)
+        return activator()
+
+    def resolve_all(self, _type: type) -> tuple:
+        '''
+        Resolves every registration of a type, keyed or not, in registration
+        order. Returns an empty tuple if the type is not registered. When
+        every registration is a singleton the tuple is built once and cached.
+        '''
+        activator = self._activators.get((_type, ALL_REGISTRATIONS))
+        if activator is None:
+            activator = self._compile_all_activator(_type)
+        return activator()
+
+    def _get_plan_key(self, registration: DependencyRegistration) -> Any:
         '''
-        logger.debug(f"Resolving service for type: {_type.__name__}")
+        Returns the key of a registration's plan in the activator table.
+        '''
+        if registration.key is not None:
+            return (registration.dependency_type, registration.key)
+        if (self._dependency_lookup.get(registration.dependency_type) is registration
+                or self._closed_generics.get(registration.dependency_type) is registration):
+            return registration.dependency_type
+        return registration
+
+    def _get_plan_name(self, plan_key: Any) -> str:
+        '''
+        Returns a display name for a plan key.
+        '''
+        if isinstance(plan_key, tuple):
+            return f'{get_type_name(plan_key[0])}[{plan_key[1]!r}]'
+        if isinstance(plan_key, DependencyRegistration):
+            return plan_key.type_name
+        return get_type_name(plan_key)
+
+    def _get_keyed_registration(self, _type: type, key: Any) -> DependencyRegistration:
+        '''
+        Returns the keyed DependencyRegistration for a type and key.
+        '''
+        registration = self._keyed_lookup.get((_type, key))
+        if registration is None:
+            raise RegistrationNotFoundError(_type, key)
+        return registration
+
+    def _get_all_registrations(self, _type: type) -> tuple[DependencyRegistration, ...]:
+        '''
+        Returns every registration of a type in registration order.
+        '''
+        return self._registrations_by_type.get(_type, ())
+
+    def _get_plan(self, registration: DependencyRegistration) -> Callable[[], Any]:
+        '''
+        Returns (compiling if needed) the plan for a registration.
+        '''
+        plan_key = self._get_plan_key(registration)
+        activator = self._activators.get(plan_key)
+        if activator is None:
+            activator = self._compile_plan(plan_key, registration)
+        return activator
+
+    def _compile_activators(self) -> None:
+        '''
+        Compiles a resolution plan for every registered type that does not
+        have one yet, publishing them in a single swap of the activator table.
+        '''
+        with self._compiling():
+            for registration in self._dependencies:
+                plan_key = self._get_plan_key(registration)
+                if plan_key not in self._activators:
+                    self._compile_plan(plan_key, registration)
+
+    @contextmanager
+    def _compiling(self):
+        '''
+        Holds the compile lock while plans are compiled. Plans compiled inside
+        the outermost block are published together when it exits, or
+        discarded if compilation fails.
+        '''
+        with self._compile_lock:
+            self._compile_depth += 1
+            try:
+                yield
+            except BaseException:
+                if self._compile_depth == 1:
+                    self._pending_activators.clear()
+                raise
+            finally:
+                self._compile_depth -= 1
+
+            if self._compile_depth == 0 and self._pending_activators:
+                self._activators = {**self._activators, **self._pending_activators}
+                self._pending_activators = {}
+
+    def _get_compiled_activator(self, plan_key: Any) -> Optional[Callable[[], Any]]:
+        '''
+        Returns the published or pending plan for a plan key. Must be called
+        while holding the compile lock.
+        '''
+        activator = self._activators.get(plan_key)
+        if activator is None:
+            activator = self._pending_activators.get(plan_key)
+        return activator
 
+    def _compile_activator(self, _type: type) -> Callable[[], Any]:
+        '''
+        Compiles the registration for a type into a specialised zero-argument
+        activator and publishes it in the activator table.
+        '''
         registration = self._get_registered_dependency(implementation_type=_type)
-        dep_type = registration.dependency_type
+        return self._compile_plan(_type, registration)
 
-        if registration.lifetime == Lifetime.Transient:
-            if registration.factory:
-                result = registration.factory(self)
+    def _compile_keyed_activator(self, _type: type, key: Any) -> Callable[[], Any]:
+        '''
+        Compiles the keyed registration for a type and key.
+        '''
+        registration = self._get_keyed_registration(_type, key)
+        return self._compile_plan((_type, key), registration)
+
+    def _compile_all_activator(self, _type: type) -> Callable[[], Any]:
+        '''
+        Compiles the resolve_all() plan for a type from the plans of each of
+        its registrations.
+        '''
+        plan_key = (_type, ALL_REGISTRATIONS)
+
+        with self._compiling():
+            activator = self._get_compiled_activator(plan_key)
+            if activator is not None:
+                return activator
+
+            registrations = self._get_all_registrations(_type)
+            activators = tuple(self._get_plan(registration)
+                               for registration in registrations)
+
+            if all(registration.lifetime == Lifetime.Singleton
+                   for registration in registrations):
+                instances = None
+
+                def activate_all():
+                    nonlocal instances
+                    # Racing first calls build equal tuples of the same
+                    # singletons; whichever is stored last is kept
+                    if instances is None:
+                        instances = tuple(activate() for activate in activators)
+                    return instances
+            else:
+                def activate_all():
+                    return tuple(activate() for activate in activators)
+
+            self._pending_activators[plan_key] = activate_all
+            return activate_all
+
+    def _compile_plan(self, plan_key: Any, registration: DependencyRegistration) -> Callable[[], Any]:
+        '''
+        Compiles a registration into a specialised zero-argument activator and
+        publishes it under the plan key.
+        '''
+        with self._compiling():
+            activator = self._get_compiled_activator(plan_key)
+            if activator is not None:
+                return activator
+
+            # Stage a trampoline while the plan (and the plans of its
+            # constructor params) are compiled so that a cyclic chain of
+            # transients is bound late rather than recursing at compile time
+            self._pending_activators[plan_key] = lambda: self._activators[plan_key]()
+
+            activator = self._create_activator(registration)
+            if self._stats is not None:
+                activator = self._stats.wrap_resolve(registration, activator)
+
+            self._pending_activators[plan_key] = activator
+            return activator
+
+    def _create_activator(self, registration: DependencyRegistration) -> Callable[[], Any]:
+        '''
+        Creates the activator for a registration based on its lifetime.
+        '''
+        lifetime = registration.lifetime
+
+        if lifetime == Lifetime.Transient:
+            return self._instrument(registration, self._create_constructor(registration))
+
+        if lifetime == Lifetime.Singleton:
+            return self._create_singleton_activator(
+                registration=registration,
+                construct=self._instrument(registration, self._create_constructor(registration)))
+
+        if lifetime == Lifetime.Scoped:
+            def activate_scoped():
+                raise Exception('Scoped resolution requires a scope. Call provider.create_scope().')
+            return activate_scoped
+
+        if lifetime == Lifetime.Pooled:
+            def activate_pooled():
+                raise Exception('Pooled resolution requires a scope. Call provider.create_scope().')
+            return activate_pooled
+
+        def activate_unknown():
+            raise Exception(f"Unknown lifetime: {lifetime}")
+        return activate_unknown
+
+    def _get_param_activator(self, param: ConstructorDependency) -> Callable[[], Any]:
+        '''
+        Returns the activator for a constructor parameter. Deferred params
+        create their Lazy/Factory wrapper; unregistered types defer to
+        resolve() so the error is raised on activation, not when the plan is
+        compiled.
+        '''
+        _type = param.dependency_type
+
+        if param.deferred is not None:
+            deferred = param.deferred
+            return lambda: deferred(self, _type)
+
+        activator = self._activators.get(_type)
+        if activator is not None:
+            return activator
+
+        if self._find_registration(_type) is None:
+            return lambda: self.resolve(_type)
+
+        return self._compile_activator(_type)
+
+    def _create_constructor(self, registration: DependencyRegistration) -> Callable[[], Any]:
+        '''
+        Creates a zero-argument callable that constructs a new instance for a
+        registration, either through its factory or its implementation type.
+        '''
+        if registration.is_factory:
+            factory = registration.factory
+            type_name = registration.dependency_type.__name__
+
+            def construct_from_factory():
+                result = factory(self)
                 if inspect.isawaitable(result):
                     raise RuntimeError(
-                        f"Factory for '{dep_type.__name__}' returned an awaitable. "
+                        f"Factory for '{type_name}' returned an awaitable. "
                         "Use resolve_async() to resolve async factories.")
                 return result
-            return registration.activate(self)
+            return construct_from_factory
+
+        implementation_type = registration.implementation_type
+        params = tuple(
+            (param.name, self._get_param_activator(param))
+            for param in registration.constructor_params)
+
+        # Parameterless types are their own activator
+        if not params:
+            return implementation_type
+
+        if len(params) == 1:
+            ((name, activate_param),) = params
+            return lambda: implementation_type(**{name: activate_param()})
+
+        def construct():
+            return implementation_type(
+                **{name: activate_param() for name, activate_param in params})
+        return construct
+
+    def _instrument(
+        self,
+        registration: DependencyRegistration,
+        construct: Callable[[], Any]
+    ) -> Callable[[], Any]:
+        '''
+        Wraps a constructor with the construction profiler and stats when they
+        are enabled. Plans compiled without them carry no overhead.
+        '''
+        if self._stats is not None:
+            construct = self._stats.wrap_construct(registration, construct)
+        if self._profiler is not None:
+            construct = self._profiler.wrap(registration.dependency_type, construct)
+        return construct
+
+    def _measure(self, registration: DependencyRegistration):
+        '''
+        Returns a context manager recording a construction outside of the
+        compiled plans (build-time factories, async and scoped constructions).
+        '''
+        if self._profiler is None and self._stats is None:
+            return nullcontext()
+
+        if self._stats is None:
+            return self._profiler.measure(registration.dependency_type)
+        if self._profiler is None:
+            return self._stats.measure(registration)
+
+        stack = ExitStack()
+        stack.enter_context(self._profiler.measure(registration.dependency_type))
+        stack.enter_context(self._stats.measure(registration))
+        return stack
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        '''
+        Returns a snapshot of the per-type resolution counters: resolves,
+        constructions, singleton fast-path hits, transient activations,
+        scoped-cache hits and construction time histograms.
+        '''
+        if self._stats is None:
+            raise Exception('Stats are not enabled. Create the provider with collect_stats=True.')
+
+        return self._stats.snapshot()
+
+    def get_construction_report(self) -> ConstructionReport:
+        '''
+        Returns the per-type self and inclusive construction times recorded so
+        far, with the critical path through the dependency graph.
+        '''
+        if self._profiler is None:
+            raise Exception('Profiling is not enabled. Create the provider with profile=True.')
+
+        graph = self._create_dependency_graph(self._dependencies)
+        return self._profiler.report(graph)
+
+    def _get_pool(self, registration: DependencyRegistration) -> ObjectPool:
+        '''
+        Returns (creating lazily if needed) the object pool for a pooled
+        registration. Pooled instances outlive the scope that created them, so
+        their constructor params are resolved from the root provider.
+        '''
+        plan_key = self._get_plan_key(registration)
+        pool = self._pools.get(plan_key)
+        if pool is not None:
+            return pool
+
+        with self._compile_lock:
+            pool = self._pools.get(plan_key)
+            if pool is None:
+                pool = ObjectPool(
+                    create=self._instrument(registration, self._create_constructor(registration)),
+                    max_size=registration.max_size,
+                    reset=registration.reset)
+                self._pools[plan_key] = pool
+            return pool
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        '''
+        Returns a snapshot of the counters of every object pool created so far,
+        keyed by type name.
+        '''
+        return {self._get_plan_name(plan_key): pool.stats()
+                for plan_key, pool in list(self._pools.items())}
 
-        elif registration.lifetime == Lifetime.Singleton:
-            # Fast path: lock-free cache check
-            instance = self._singleton_instances.get(dep_type)
+    def _create_singleton_activator(
+        self,
+        registration: DependencyRegistration,
+        construct: Callable[[], Any]
+    ) -> Callable[[], Any]:
+        '''
+        Wraps a constructor with the singleton cache. The registration instance
+        is read lock-free; construction uses double-checked locking on the
+        type's own RLock.
+        '''
+        singleton_lock = self._singleton_locks.setdefault(registration, RLock())
+        set_singleton_instance = self._set_singleton_instance
+
+        def activate_singleton():
+            instance = registration.instance
             if instance is not None:
                 return instance
 
-            # Fall back to registration.instance (set during build())
-            if registration.instance is not None:
-                self._singleton_instances[dep_type] = registration.instance
-                return registration.instance
-
-            # Lazy singleton creation with double-checked locking.
-            # RLock allows the same thread to re-enter while constructing
-            # nested singletons (e.g. A's constructor resolves B).
-            with self._cache_lock:
-                instance = self._singleton_instances.get(dep_type)
-                if instance is not None:
-                    return instance
-                if registration.factory:
-                    result = registration.factory(self)
-                    if inspect.isawaitable(result):
-                        raise RuntimeError(
-                            f"Factory for '{dep_type.__name__}' returned an awaitable. "
-                            "Use resolve_async() to resolve async factories.")
-                    instance = result
-                else:
-                    instance = registration.activate(self)
-                registration.instance = instance
-                self._singleton_instances[dep_type] = instance
+            with singleton_lock:
+                instance = registration.instance
+                if instance is None:
+                    instance = construct()
+                    set_singleton_instance(registration, instance)
                 return instance
+        return activate_singleton
 
-        elif registration.lifetime == Lifetime.Scoped:
-            raise Exception('Scoped resolution requires a scope. Call provider.create_scope().')
+    def try_get_resolved(self, _type: type) -> Any:
+        '''
+        Returns the instance for a type if it can be resolved without
+        constructing anything (a built singleton), otherwise None.
+        '''
+        registration = self._dependency_lookup.get(_type)
+        if registration is None:
+            return None
+        return self._try_get_singleton(registration)
 
-        raise Exception(f"Unknown lifetime: {registration.lifetime}")
+    def _try_get_singleton(self, registration: DependencyRegistration) -> Any:
+        '''
+        Returns the instance of a built singleton registration, otherwise None.
+        '''
+        if registration.lifetime != Lifetime.Singleton:
+            return None
+
+        instance = registration.instance
+        if instance is not None and self._stats is not None:
+            type_stats = self._stats.get(registration)
+            type_stats.resolves += 1
+            type_stats.singleton_hits += 1
+        return instance
 
-    def _get_async_singleton_lock(self, dep_type: type) -> asyncio.Lock:
+    def _get_async_singleton_lock(self, registration: DependencyRegistration) -> asyncio.Lock:
         '''
-        Returns (creating lazily if needed) the per-type asyncio.Lock used for
-        coroutine-safe lazy singleton construction. Only the dictionary lookup
-        is protected by a synchronous lock; it is never held across construction
-        or an await.
+        Returns (creating lazily if needed) the per-registration asyncio.Lock
+        used for coroutine-safe lazy singleton construction. Only the dictionary
+        lookup is protected by a synchronous lock; it is never held across
+        construction or an await.
         '''
         with self._async_lock_registry:
-            lock = self._async_singleton_locks.get(dep_type)
+            lock = self._async_singleton_locks.get(registration)
             if lock is None:
                 lock = asyncio.Lock()
-                self._async_singleton_locks[dep_type] = lock
+                self._async_singleton_locks[registration] = lock
         return lock
 
-    async def resolve_async(self, _type: type) -> Any:
+    async def resolve_async(self, _type: type, key: Any = None) -> Any:
         '''
         Resolves a service for a given type asynchronously.
+
+        `key`: The key of a keyed registration of the type.
         '''
-        logger.debug(f"Resolving (async) service for type: {_type.__name__}")
+        if key is None:
+            registration = self._get_registered_dependency(implementation_type=_type)
+        else:
+            registration = self._get_keyed_registration(_type, key)
 
-        registration = self._get_registered_dependency(implementation_type=_type)
-        dep_type = registration.dependency_type
+        if self._stats is not None:
+            type_stats = self._stats.get(registration)
+            type_stats.resolves += 1
+            if registration.instance is not None:
+                type_stats.singleton_hits += 1
 
         if registration.lifetime == Lifetime.Singleton:
-            instance = self._singleton_instances.get(dep_type)
+            instance = registration.instance
             if instance is not None:
                 return instance
 
-            if registration.instance is not None:
-                self._singleton_instances[dep_type] = registration.instance
-                return registration.instance
-
             # Per-type asyncio.Lock so that:
             # 1. Concurrent coroutines for the same type create exactly one instance.
             # 2. Nested resolution of a different type (A → B) uses B's own lock
             #    and is not serialised with A's construction.
             # 3. The lock is never held across construction or any await of an
             #    unrelated resource — only across this singleton's own construction.
-            async_lock = self._get_async_singleton_lock(dep_type)
+            async_lock = self._get_async_singleton_lock(registration)
             async with async_lock:
-                # Double-check after acquiring: another coroutine may have
-                # already constructed the instance while we waited.
-                instance = self._singleton_instances.get(dep_type)
+                # Double-check after acquiring: another coroutine (or
+                # build_async()) may have already constructed the instance
+                # while we waited.
+                instance = registration.instance
                 if instance is not None:
                     return instance
-                if registration.factory:
-                    inst = registration.factory(self)
-                    if inspect.isawaitable(inst):
-                        inst = await inst
-                    instance = inst
-                else:
-                    instance = await registration.activate_async(self)
-                registration.instance = instance
-                self._singleton_instances[dep_type] = instance
+                instance = await self._construct_async(registration)
+                self._set_singleton_instance(registration, instance)
                 return instance
 
         elif registration.lifetime == Lifetime.Transient:
-            if registration.factory:
-                inst = registration.factory(self)
-                return await inst if inspect.isawaitable(inst) else inst
-            return await registration.activate_async(self)
+            return await self._construct_async(registration)
 
         elif registration.lifetime == Lifetime.Scoped:
             raise Exception('Scoped resolution requires a scope. Call provider.create_scope().')
 
         raise Exception(f"Unknown lifetime: {registration.lifetime}")
 
+    async def _construct_async(self, registration: DependencyRegistration) -> Any:
+        '''
+        Constructs a new instance for a registration, awaiting coroutine
+        factories and constructor params.
+        '''
+        with self._measure(registration):
+            if registration.factory:
+                inst = registration.factory(self)
+                return await inst if inspect.isawaitable(inst) else inst
+            return await registration.activate_async(self)
+
     def _verify_singleton(self, registration: DependencyRegistration) -> None:
         '''
         Verifies that no singleton constructor param dependencies are transients.
@@ -263,17 +738,71 @@ class ServiceProvider:
         # Don't allow transient dependencies for singletons (only a single instance
         # of the transient dependency would be injected during instantiation of the
         # singleton, which is not the intended behavior of a transient dependency)
-        for required_type in registration.required_types:
+        for dependency in registration.constructor_params:
+            required_type = dependency.dependency_type
             required_type_registration = self._get_registered_dependency(
                 implementation_type=required_type,
                 requesting_type=registration)
 
+            # A singleton and its Lazy and Factory dependencies resolve from
+            # the root provider, where a scoped type cannot be resolved
+            if required_type_registration.lifetime == Lifetime.Scoped:
+                raise ScopedDependencyInjectionError(
+                    required_type=required_type,
+                    registration=registration)
+
+            # A Factory resolves a new instance on every call, so a singleton
+            # can safely hold a Factory of any other lifetime. A Lazy caches
+            # its instance and is verified like a direct dependency.
+            if dependency.deferred is Factory:
+                continue
+
             # If the required type is a transient, raise an error
             if required_type_registration.lifetime == Lifetime.Transient:
                 raise TransientDependencyInjectionError(
                     required_type=required_type,
                     registration=registration)
 
+            # A singleton would never return a pooled instance to its pool
+            if required_type_registration.lifetime == Lifetime.Pooled:
+                raise PooledDependencyInjectionError(
+                    required_type=required_type,
+                    registration=registration)
+
+    def _find_registration(self, _type: Any) -> Optional[DependencyRegistration]:
+        '''
+        Returns the registration for a type, closing an open generic
+        registration for a closed generic type, or None if the type is not
+        registered.
+        '''
+        registration = self._dependency_lookup.get(_type)
+        if registration is None:
+            registration = self._close_generic(_type)
+        return registration
+
+    def _close_generic(self, _type: Any) -> Optional[DependencyRegistration]:
+        '''
+        Returns (creating and caching on first use) the registration of a
+        closed generic type such as Repository[User] from its open generic
+        registration, or None if there is no open generic registration for it.
+        '''
+        registration = self._closed_generics.get(_type)
+        if registration is not None:
+            return registration
+
+        open_registration = self._open_generics.get(get_origin(_type))
+        if open_registration is None:
+            return None
+
+        with self._compile_lock:
+            registration = self._closed_generics.get(_type)
+            if registration is None:
+                registration = close_registration(open_registration, _type)
+                if registration.lifetime == Lifetime.Singleton:
+                    self._verify_singleton(registration)
+                self._closed_generics[_type] = registration
+            return registration
+
     def _get_registered_dependency(
         self,
         implementation_type: type,
@@ -282,7 +811,7 @@ class ServiceProvider:
         '''
         Returns the DependencyRegistration instance for a given implementation type.
         '''
-        registration = self._dependency_lookup.get(implementation_type)
+        registration = self._find_registration(implementation_type)
 
         if registration is not None:
             return registration
@@ -295,93 +824,260 @@ class ServiceProvider:
 
     def _validate_and_order(self) -> List[DependencyRegistration]:
         '''
-        Validates all singleton registrations and returns the topologically
-        ordered build list of singletons + factories. Raises if any singleton
-        depends on a transient or if a dependency cycle exists.
+        Validates all registrations and returns the topologically ordered
+        build list of singletons + factories. Raises if any singleton depends
+        on a transient, or a DependencyCycleError with the path of every
+        cycle if the registrations are not acyclic.
+
+        The validated order is cached on the service collection until a
+        registration changes. With a registration metadata cache, a build
+        order cached for the same registrations and sources is reused across
+        restarts without revalidating.
         '''
-        # Verify all singletons don't have transient dependencies
-        for registration in self.singleton_registrations:
-            self._verify_singleton(registration)
+        collection = self._service_collection
+        if collection is not None:
+            build_order = collection.get_validated_build_order()
+            if build_order is not None:
+                return build_order
 
-        to_build = self.singleton_registrations + self.factory_registrations
-        dependency_graph = self._create_dependency_graph(to_build)
-        build_order = self._topological_sort(dependency_graph)
+        cache = self._metadata_cache
+        build_order = cache.get_build_order(self._dependencies) if cache is not None else None
 
         if build_order is None:
-            raise InvalidDependencyChainError()
+            # Verify all singletons don't have transient dependencies
+            for registration in self.singleton_registrations:
+                self._verify_singleton(registration)
+
+            # Cycles are checked across every registration, since a cycle of
+            # transients would otherwise only surface as unbounded recursion
+            # on first resolve
+            dependency_graph = self._create_dependency_graph(self._dependencies)
+            order = self._topological_sort(dependency_graph)
+
+            if order is None:
+                raise DependencyCycleError(
+                    [[registration.dependency_type for registration in cycle]
+                     for cycle in self._find_cycles(dependency_graph)])
+
+            build_order = [registration for registration in order
+                           if registration.lifetime == Lifetime.Singleton]
+
+            if cache is not None:
+                cache.set_build_order(self._dependencies, build_order)
+
+        if cache is not None:
+            cache.save()
+        if collection is not None:
+            collection.set_validated_build_order(build_order)
 
         return build_order
 
-    def build(self) -> 'ServiceProvider':
+    def build(self, parallelism: Optional[int] = None) -> 'ServiceProvider':
         '''
         Builds the service provider by validating all registrations and
         eagerly constructing factories and any singletons explicitly marked
         as eager. Other singletons are constructed lazily on first resolve().
-        '''
-        build_order = self._validate_and_order()
 
-        # Build dependencies in topological order, but only those that should
-        # be constructed eagerly. Lazy singletons are validated and ordered
-        # here but constructed on first resolve() via the cache fast path.
-        for registration in build_order:
-            if not (registration.is_factory or registration.eager):
-                continue
+        Coroutine factories are run on a single background event loop that is
+        shared for the duration of the build.
 
-            if registration.is_factory:
-                # For factories, pass the provider into the factory function
-                inst = registration.factory(self)
-                # Support coroutine factories
-                if asyncio.iscoroutine(inst):
-                    try:
-                        loop = asyncio.get_running_loop()
-                        import concurrent.futures
-                        with concurrent.futures.ThreadPoolExecutor() as ex:
-                            inst = ex.submit(asyncio.run, inst).result()
-                    except RuntimeError:
-                        inst = asyncio.run(inst)
-                registration.instance = inst
-            else:
-                # Capture the return value; do not rely solely on activate()
-                # mutating registration.instance as a side-effect.
-                registration.instance = registration.activate(self)
+        `parallelism`: If greater than one, the build order is grouped into
+            dependency levels and the registrations within each level are
+            constructed on a thread pool of this size.
+        '''
+        if parallelism is not None and parallelism < 1:
+            raise ValueError('parallelism must be greater than zero')
 
-            with self._cache_lock:
-                self._singleton_instances[registration.dependency_type] = registration.instance
-            self._set_built_dependency(registration)
+        build_order = self._validate_and_order()
+        self._compile_activators()
+
+        with BackgroundEventLoop() as background_loop:
+            if parallelism is None or parallelism == 1:
+                # Build dependencies in topological order, but only those that
+                # should be constructed eagerly. Lazy singletons are validated
+                # and ordered here but constructed on first resolve() via the
+                # cache fast path.
+                for registration in build_order:
+                    if registration.is_factory or registration.eager:
+                        self._build_registration(registration, background_loop)
+                        self._set_built_dependency(registration)
+                return self
+
+            with ThreadPoolExecutor(max_workers=parallelism) as executor:
+                for level in self._get_build_levels(build_order):
+                    to_build = [registration for registration in level
+                                if registration.is_factory or registration.eager]
+
+                    futures = [
+                        executor.submit(self._build_registration, registration, background_loop)
+                        for registration in to_build]
+                    for future in futures:
+                        future.result()
+
+                    for registration in to_build:
+                        self._set_built_dependency(registration)
 
         return self
 
-    async def build_async(self) -> 'ServiceProvider':
+    def _build_registration(
+        self,
+        registration: DependencyRegistration,
+        background_loop: BackgroundEventLoop
+    ) -> None:
+        '''
+        Constructs an eager singleton or factory during build(). Takes the
+        type's singleton lock so a registration lazily resolved by another
+        constructor in the same level is only constructed once.
+        '''
+        with self._singleton_locks[registration]:
+            if registration.instance is None:
+                if registration.is_factory:
+                    with self._measure(registration):
+                        # For factories, pass the provider into the factory function
+                        inst = registration.factory(self)
+                        # Support coroutine factories
+                        if asyncio.iscoroutine(inst):
+                            inst = background_loop.run(inst)
+                else:
+                    inst = self._get_plan(registration)()
+                self._set_singleton_instance(registration, inst)
+
+    async def build_async(self, max_concurrency: Optional[int] = None) -> 'ServiceProvider':
         '''
         Async variant of build(), awaiting any coroutine constructors or factories.
+
+        The build order is grouped into dependency levels and every eager
+        singleton and factory within a level is constructed concurrently, so
+        independent async factories cost the critical path rather than the
+        sum of their latencies.
+
+        `max_concurrency`: The maximum number of constructions in flight at
+            once (unbounded if None).
         '''
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError('max_concurrency must be greater than zero')
+
         build_order = self._validate_and_order()
+        self._compile_activators()
 
-        for registration in build_order:
-            if not (registration.is_factory or registration.eager):
+        semaphore = (asyncio.Semaphore(max_concurrency)
+                     if max_concurrency is not None else None)
+
+        for level in self._get_build_levels(build_order):
+            to_build = [registration for registration in level
+                        if registration.is_factory or registration.eager]
+
+            if not to_build:
                 continue
 
-            if registration.is_factory:
-                inst = registration.factory(self)
-                if asyncio.iscoroutine(inst):
-                    inst = await inst
-                registration.instance = inst
-            else:
-                registration.instance = await registration.activate_async(self)
+            await asyncio.gather(*[
+                self._build_registration_async(registration, semaphore)
+                for registration in to_build])
 
-            with self._cache_lock:
-                self._singleton_instances[registration.dependency_type] = registration.instance
-            self._set_built_dependency(registration)
+            for registration in to_build:
+                self._set_built_dependency(registration)
 
         return self
 
+    async def _build_registration_async(
+        self,
+        registration: DependencyRegistration,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> None:
+        '''
+        Constructs an eager singleton or factory during build_async(). Takes
+        the same per-type lock as resolve_async() so that a factory lazily
+        resolving a registration from its own level does not construct it
+        a second time.
+        '''
+        if semaphore is not None:
+            async with semaphore:
+                return await self._build_registration_async(registration)
+
+        async with self._get_async_singleton_lock(registration):
+            if registration.instance is None:
+                inst = await self._construct_async(registration)
+                self._set_singleton_instance(registration, inst)
+
+    def _get_build_levels(
+        self,
+        build_order: List[DependencyRegistration]
+    ) -> List[List[DependencyRegistration]]:
+        '''
+        Groups a topologically ordered build list into dependency levels. Every
+        registration is placed one level above the deepest registration it
+        depends on, so registrations within a level are independent of each
+        other.
+        '''
+        graph = self._create_dependency_graph(build_order)
+        depth = defaultdict(int)
+        levels = []
+
+        for registration in build_order:
+            level = depth[registration]
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(registration)
+
+            for dependent in graph['edges'][registration]:
+                depth[dependent] = max(depth[dependent], level + 1)
+
+        return levels
+
     def create_scope(self) -> 'ServiceScope':
         '''Begin a new scoped lifetime context.'''
         return ServiceScope(self)
 
+    async def aclose(self, timeout: Optional[float] = None) -> None:
+        '''
+        Disposes the singletons constructed by the provider in reverse
+        topological order: a singleton is disposed before anything it was
+        constructed from, and singletons at the same dependency level are
+        disposed concurrently. Each is exited if it is an async context
+        manager, otherwise closed (aclose() or close()), then dispose() is
+        called if it exposes it. Instances registered directly are owned by
+        the caller and are not disposed.
+
+        Disposal errors are logged. Disposals still running at the deadline
+        are cancelled and the remaining singletons are left undisposed, so
+        shutdown is never held up past the deadline.
+
+        `timeout`: The deadline in seconds (defaults to the provider's
+            dispose_timeout; unbounded if both are None).
+        '''
+        if timeout is None:
+            timeout = self._dispose_timeout
+
+        with self._cache_lock:
+            registrations = list(self._constructed_singletons.values())
+            self._constructed_singletons.clear()
+
+        levels = [[registration.instance for registration in level]
+                  for level in reversed(self._get_build_levels(registrations))]
+
+        undisposed = await dispose_levels_async(levels, timeout)
+        if undisposed:
+            logger.warning(
+                f'Provider disposal deadline of {timeout}s exceeded: '
+                f'{len(undisposed)} singletons were not disposed')
+
+    def create_child(self, overrides: ServiceCollection) -> 'ChildServiceProvider':
+        '''
+        Create a provider that layers the registrations in `overrides` over
+        this provider. The child shares this provider's built singletons and
+        compiled plans; only the overridden types, and the types that depend
+        on them, are compiled (and constructed) in the child on first resolve.
+        Creating a child costs O(len(overrides)), independent of the number
+        of registrations in this provider.
+
+        `overrides`: The registrations to layer over this provider.
+        '''
+        return ChildServiceProvider(self, overrides).build()
+
     def _create_dependency_graph(self, registrations: List[DependencyRegistration]) -> Dict:
         '''
-        Creates a dependency graph from a list of registrations.
+        Creates a dependency graph from a list of registrations, with an edge
+        from each registration to every registration that requires it.
         '''
         # Initialize graph
         graph = {
@@ -390,65 +1086,377 @@ class ServiceProvider:
             'in_degree': defaultdict(int)
         }
 
-        # Create a lookup for registrations by implementation type
-        registration_lookup = {reg.implementation_type: reg for reg in registrations}
+        # Create a lookup for the registration resolved for each type. Keyed
+        # registrations are never injected as constructor params, and a later
+        # registration of a type replaces an earlier one.
+        registration_lookup = {reg.dependency_type: reg for reg in registrations
+                               if reg.key is None}
 
         # For each registration, add edges from its dependencies to itself
         for registration in registrations:
             for required_type in registration.required_types:
-                # Skip if the required type is not in the registrations to build
-                # (it might be already built or a transient)
-                if required_type in registration_lookup:
-                    dependency = registration_lookup[required_type]
+                # Skip if the required type is not in the registrations
+                # (it might be resolved elsewhere or not registered)
+                dependency = registration_lookup.get(required_type)
+                if dependency is not None:
                     graph['edges'][dependency].append(registration)
                     graph['in_degree'][registration] += 1
 
         return graph
 
-    def _topological_sort(self, graph: Dict) -> List[DependencyRegistration]:
+    def _topological_sort(self, graph: Dict) -> Optional[List[DependencyRegistration]]:
         '''
-        Performs a topological sort on the dependency graph.
+        Performs a topological sort on the dependency graph in O(V+E).
         Returns None if there's a cycle in the graph.
         '''
+        edges = graph['edges']
+        in_degree = dict(graph['in_degree'])
         result = []
 
-        # Get nodes with no incoming edges (no dependencies)
-        queue = [node for node in graph['nodes']
-                 if node.is_parameterless or graph['in_degree'][node] == 0]
-
-        # Keep track of visited nodes
-        visited = set()
+        # Start from the nodes with no incoming edges (no dependencies)
+        queue = deque(node for node in graph['nodes']
+                      if node not in in_degree)
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             result.append(current)
-            visited.add(current)
 
-            # For each node that depends on the current node
-            for neighbor in graph['edges'][current]:
-                # Reduce the in-degree of the neighbor
-                graph['in_degree'][neighbor] -= 1
-
-                # If the neighbor has no more dependencies, add it to the queue
-                if graph['in_degree'][neighbor] == 0:
+            # Reduce the in-degree of each node that depends on the current
+            # node, queueing it once all its dependencies are ordered
+            for neighbor in edges.get(current, ()):
+                in_degree[neighbor] -= 1
+                if in_degree[neighbor] == 0:
                     queue.append(neighbor)
 
-        # If we haven't visited all nodes, there's a cycle
-        if len(visited) != len(graph['nodes']):
+        # If we haven't ordered all nodes, there's a cycle
+        if len(result) != len(graph['nodes']):
             return None
 
         return result
 
+    def _find_cycles(self, graph: Dict) -> List[List[DependencyRegistration]]:
+        '''
+        Returns a dependency cycle for each strongly connected set of
+        registrations in the graph, as the path from a registration through
+        what it requires back to itself. Runs in O(V+E) (Tarjan's algorithm,
+        iterative to stay clear of the recursion limit).
+        '''
+        edges = graph['edges']
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+
+        for root in graph['nodes']:
+            if root in index:
+                continue
+
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(edges.get(root, ())))]
+
+            while work:
+                node, neighbors = work[-1]
+                for neighbor in neighbors:
+                    if neighbor not in index:
+                        index[neighbor] = lowlink[neighbor] = len(index)
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(edges.get(neighbor, ()))))
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[neighbor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member is node:
+                                break
+
+                        if len(component) > 1 or node in edges.get(node, ()):
+                            # In discovery order, so each cycle starts from
+                            # its earliest registration
+                            component.reverse()
+                            components.append(component)
+
+        return [self._get_cycle_path(edges, component) for component in components]
+
+    def _get_cycle_path(
+        self,
+        edges: Dict,
+        component: List[DependencyRegistration]
+    ) -> List[DependencyRegistration]:
+        '''
+        Returns the shortest cycle through the first registration of a
+        strongly connected set, from the registration through what it
+        requires back to itself.
+        '''
+        members = set(component)
+        start = component[0]
+        parents = {start: None}
+        queue = deque([start])
+
+        # Breadth-first search along the edges (from a registration to the
+        # registrations requiring it) for an edge back to the start
+        while queue:
+            node = queue.popleft()
+            for neighbor in edges.get(node, ()):
+                if neighbor is start:
+                    path = [node]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    # The search ran against the direction of requirement, so
+                    # the path walked back from the last node reads forwards
+                    return [start] + path[:-1] + [start]
+                if neighbor in members and neighbor not in parents:
+                    parents[neighbor] = node
+                    queue.append(neighbor)
+
+        return [start, start]
+
+
+class ChildServiceProvider(ServiceProvider):
+    '''
+    A copy-on-write provider layering override registrations over a parent
+    provider (see ServiceProvider.create_child).
+
+    A type is overridden if it is registered in the overrides or if any of
+    its declared constructor params (including Lazy/Factory params) is
+    overridden, as are transient and scoped factories since the container
+    cannot see what they resolve. Keyed registrations are overridden the
+    same way by their (type, key). Every other registration resolves through
+    the parent's compiled plan and shares the parent's singleton. Overridden
+    parent singletons are constructed again for the child.
+
+    resolve_all() of a type registered in the overrides returns only the
+    override registrations of that type.
+    '''
+
+    def __init__(self, parent: ServiceProvider, overrides: ServiceCollection):
+        '''
+        Initializes a ChildServiceProvider.
+
+        `parent`: The provider to layer over.
+        `overrides`: The registrations to layer over the parent.
+        '''
+        super().__init__(overrides)
+
+        self._parent = parent
+        self._overrides = overrides.get_container()
+        self._dependency_lookup = ChainMap(self._overrides, parent._dependency_lookup)
+        self._keyed_lookup = ChainMap(overrides.get_keyed_container(), parent._keyed_lookup)
+        # Closed generics of open generics that are not overridden are
+        # closed (and shared) by the parent
+        self._open_generics = overrides.get_open_generics()
+        self._registrations_by_type = ChainMap(
+            self._registrations_by_type, parent._registrations_by_type)
+        self._metadata_cache = None
+        # Validation of the overrides depends on the parent, so it is not
+        # cached on the overrides collection
+        self._service_collection = None
+
+        # Share instrumentation with the parent so stats and profiles cover
+        # the whole provider tree
+        self._profiler = parent._profiler
+        self._stats = parent._stats
+        self._dispose_timeout = parent._dispose_timeout
+
+        # The registrations compiled in the child: the overrides and the
+        # child-local copies of overridden parent singletons
+        self._child_registrations: Set[DependencyRegistration] = set(overrides.get_registrations())
+
+        # The registration to compile in the child for each parent
+        # registration seen so far (None if the parent's plan is used), and
+        # the memoized override check. Both are written under the compile
+        # lock and only ever gain entries.
+        self._local_registrations: dict[DependencyRegistration, Optional[DependencyRegistration]] = {}
+        self._overridden: dict[type, bool] = {}
+
+    def _is_overridden(self, _type: type) -> bool:
+        '''
+        Indicates whether a type, or anything it is constructed from, is
+        overridden in this child.
+        '''
+        overridden = self._overridden.get(_type)
+        if overridden is not None:
+            return overridden
+
+        with self._compile_lock:
+            visited = set()
+            overridden = self._find_override(_type, visited)
+
+            # Every type reachable from a type that is not overridden is not
+            # overridden either. A negative result for a type visited on the
+            # way to an override may be cut short by a cycle, so only the
+            # positive results are kept in that case.
+            if not overridden:
+                for visited_type in visited:
+                    self._overridden[visited_type] = False
+            return overridden
+
+    def _find_override(self, _type: type, visited: Set[type]) -> bool:
+        '''
+        Searches the constructor params of a type for an override, memoizing
+        the types found to be overridden.
+        '''
+        overridden = self._overridden.get(_type)
+        if overridden is not None:
+            return overridden
+        if _type in visited:
+            return False
+        visited.add(_type)
+
+        if _type in self._overrides or get_origin(_type) in self._open_generics:
+            overridden = True
+        else:
+            registration = self._parent._find_registration(_type)
+            overridden = (registration is not None
+                          and self._has_override(registration, visited))
+
+        if overridden:
+            self._overridden[_type] = True
+        return overridden
+
+    def _has_override(self, registration: DependencyRegistration, visited: Set[type]) -> bool:
+        '''
+        Indicates whether anything a parent registration is constructed from
+        is overridden.
+        '''
+        if registration.is_factory:
+            return registration.lifetime != Lifetime.Singleton
+        return any(self._find_override(param.dependency_type, visited)
+                   for param in registration.constructor_params)
+
+    def _localize(self, registration: DependencyRegistration) -> Optional[DependencyRegistration]:
+        '''
+        Returns the registration to compile in the child for a registration,
+        copying overridden parent singletons, or None if the parent's plan
+        can be used.
+        '''
+        if registration in self._child_registrations:
+            return registration
+
+        local = self._local_registrations.get(registration, registration)
+        if local is not registration:
+            return local
+
+        with self._compile_lock:
+            if registration in self._local_registrations:
+                return self._local_registrations[registration]
+
+            local = None
+            if (registration.is_factory and registration.lifetime != Lifetime.Singleton) or any(
+                    self._is_overridden(param.dependency_type)
+                    for param in registration.constructor_params):
+                local = registration
+                if registration.lifetime == Lifetime.Singleton:
+                    local = registration.copy()
+                    self._child_registrations.add(local)
+
+            self._local_registrations[registration] = local
+            return local
+
+    def _get_registered_dependency(
+        self,
+        implementation_type: type,
+        requesting_type: Optional[DependencyRegistration] = None
+    ) -> DependencyRegistration:
+        '''
+        Returns the override registration for a type, a child-local copy of
+        an overridden parent singleton, or the parent's registration.
+        '''
+        registration = self._overrides.get(implementation_type)
+        if registration is not None:
+            return registration
+
+        if get_origin(implementation_type) in self._open_generics:
+            return self._close_generic(implementation_type)
+
+        registration = self._parent._get_registered_dependency(
+            implementation_type, requesting_type)
+        return self._localize(registration) or registration
+
+    def _find_registration(self, _type: Any) -> Optional[DependencyRegistration]:
+        registration = self._overrides.get(_type)
+        if registration is None:
+            if get_origin(_type) in self._open_generics:
+                registration = self._close_generic(_type)
+            else:
+                registration = self._parent._find_registration(_type)
+        return registration
+
+    def _close_generic(self, _type: Any) -> Optional[DependencyRegistration]:
+        registration = super()._close_generic(_type)
+        if registration is not None and registration not in self._child_registrations:
+            with self._compile_lock:
+                self._child_registrations.add(registration)
+        return registration
+
+    def _get_keyed_registration(self, _type: type, key: Any) -> DependencyRegistration:
+        registration = super()._get_keyed_registration(_type, key)
+        return self._localize(registration) or registration
+
+    def _compile_plan(self, plan_key: Any, registration: DependencyRegistration) -> Callable[[], Any]:
+        '''
+        Compiles a plan in the child for overridden registrations; other
+        registrations use the parent's plan.
+        '''
+        local = self._localize(registration)
+        if local is not None:
+            return super()._compile_plan(plan_key, local)
+
+        activator = self._parent._get_plan(registration)
+        with self._compiling():
+            self._pending_activators.setdefault(plan_key, activator)
+        return activator
+
+    def try_get_resolved(self, _type: type) -> Any:
+        if self._is_overridden(_type):
+            return self._try_get_singleton(self._get_registered_dependency(_type))
+        return self._parent.try_get_resolved(_type)
+
+    async def resolve_async(self, _type: type, key: Any = None) -> Any:
+        if key is None:
+            if self._is_overridden(_type):
+                return await super().resolve_async(_type)
+            return await self._parent.resolve_async(_type)
+
+        registration = self._keyed_lookup.get((_type, key))
+        if registration is not None and self._localize(registration) is None:
+            return await self._parent.resolve_async(_type, key)
+        return await super().resolve_async(_type, key)
+
 
 class ServiceScope:
     '''
     Provides scoped resolution: Singleton → cascades to root provider, Transient → new each call,
-    Scoped → one instance per scope.
+    Scoped → one instance per scope, Pooled → checked out of the provider's pool and returned
+    when the scope is disposed.
     '''
 
     def __init__(self, provider: 'ServiceProvider'):
         self._provider = provider
-        self._scoped_instances: dict[type, Any] = {}
+        # Scoped instances by the plan key of their registration (the type,
+        # unless the registration is keyed or only reachable via resolve_all)
+        self._scoped_instances: dict[Any, Any] = {}
+        # The registration of each scoped instance by plan key, in the order
+        # the instances were constructed, for ordered disposal
+        self._scoped_registrations: dict[Any, DependencyRegistration] = {}
+        # Pooled instances checked out by this scope, returned on dispose()
+        self._pooled_instances: list[tuple[ObjectPool, Any]] = []
+        # Scoped instances being constructed by resolve_async(), so that
+        # constructor params resolved concurrently share one instance
+        self._pending_scoped: dict[Any, asyncio.Future] = {}
         self._dependency_lookup = provider._dependency_lookup
         self._cache_lock = Lock()
 
@@ -462,66 +1470,168 @@ class ServiceScope:
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback) -> None:
-        for inst in self._scoped_instances.values():
-            if hasattr(inst, '__aexit__'):
-                await inst.__aexit__(exc_type, exc_value, traceback)
-        self.dispose()
+        await self.dispose_async(exc_type, exc_value, traceback)
 
-    def resolve(self, _type: type) -> Any:
+    def resolve(self, _type: type, key: Any = None) -> Any:
         provider = self._provider
-        reg = provider._get_registered_dependency(_type)
+        if key is None:
+            reg = provider._get_registered_dependency(_type)
+            if reg.lifetime == Lifetime.Singleton:
+                return provider.resolve(_type)
+            return self._resolve_registration(reg, _type)
 
+        reg = provider._get_keyed_registration(_type, key)
         if reg.lifetime == Lifetime.Singleton:
-            return provider.resolve(_type)
+            return provider.resolve(_type, key)
+        return self._resolve_registration(reg, (_type, key))
+
+    def resolve_all(self, _type: type) -> tuple:
+        '''
+        Resolves every registration of a type, keyed or not, in registration
+        order.
+        '''
+        provider = self._provider
+        instances = []
+        for reg in provider._get_all_registrations(_type):
+            if reg.lifetime == Lifetime.Singleton:
+                instances.append(provider._get_plan(reg)())
+            else:
+                instances.append(self._resolve_registration(reg, provider._get_plan_key(reg)))
+        return tuple(instances)
+
+    def _resolve_registration(self, reg: DependencyRegistration, plan_key: Any) -> Any:
+        '''
+        Resolves a transient, scoped or pooled registration within the scope.
+        '''
+        provider = self._provider
+        stats = provider._stats
+        if stats is not None:
+            stats.get(reg).resolves += 1
+
+        if reg.lifetime == Lifetime.Pooled:
+            return self._acquire_pooled(reg)
 
         insts = self._scoped_instances
 
         if reg.lifetime == Lifetime.Scoped:
-            inst = insts.get(_type)
+            inst = insts.get(plan_key)
             if inst is not None:
+                if stats is not None:
+                    stats.get(reg).scoped_hits += 1
                 return inst
 
-        if reg.factory:
-            inst = reg.factory(self)
-        elif hasattr(reg, '_resolver_fn') and reg._resolver_fn is not None:
-            inst = reg._resolver_fn(self)
-        else:
-            inst = reg.activate(self)
+        with provider._measure(reg):
+            if reg.factory:
+                inst = reg.factory(self)
+            elif hasattr(reg, '_resolver_fn') and reg._resolver_fn is not None:
+                inst = reg._resolver_fn(self)
+            else:
+                inst = reg.activate(self)
 
         if reg.lifetime == Lifetime.Scoped:
-            insts[_type] = inst
+            insts[plan_key] = inst
+            self._scoped_registrations[plan_key] = reg
 
         return inst
 
-    async def resolve_async(self, _type: type) -> Any:
+    def try_get_resolved(self, _type: type) -> Any:
+        '''
+        Returns the instance for a type if it can be resolved without
+        constructing anything (a cached scoped instance or a built singleton),
+        otherwise None.
+        '''
+        inst = self._scoped_instances.get(_type)
+        if inst is not None:
+            stats = self._provider._stats
+            if stats is not None:
+                type_stats = stats.get(self._dependency_lookup[_type])
+                type_stats.resolves += 1
+                type_stats.scoped_hits += 1
+            return inst
+        return self._provider.try_get_resolved(_type)
+
+    async def resolve_async(self, _type: type, key: Any = None) -> Any:
         provider = self._provider
-        reg = provider._get_registered_dependency(_type)
+        if key is None:
+            reg = provider._get_registered_dependency(_type)
+            plan_key = _type
+        else:
+            reg = provider._get_keyed_registration(_type, key)
+            plan_key = (_type, key)
 
         if reg.lifetime == Lifetime.Singleton:
-            return await provider.resolve_async(_type)
-
-        insts = self._scoped_instances
+            return await provider.resolve_async(_type, key)
+
+        stats = provider._stats
+        if stats is not None:
+            stats.get(reg).resolves += 1
+
+        if reg.lifetime == Lifetime.Pooled:
+            return self._acquire_pooled(reg)
+
+        if reg.lifetime != Lifetime.Scoped:
+            return await self._construct_async(reg)
+
+        inst = self._scoped_instances.get(plan_key)
+        if inst is not None:
+            if stats is not None:
+                stats.get(reg).scoped_hits += 1
+            return inst
+
+        # Another coroutine in this scope is already constructing the
+        # instance: share its result rather than constructing a second one
+        pending = self._pending_scoped.get(plan_key)
+        if pending is not None:
+            if stats is not None:
+                stats.get(reg).scoped_hits += 1
+            return await asyncio.shield(pending)
+
+        pending = asyncio.get_running_loop().create_future()
+        self._pending_scoped[plan_key] = pending
+        try:
+            inst = await self._construct_async(reg)
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except BaseException as ex:
+            pending.set_exception(ex)
+            # Mark the exception as retrieved in case nothing is waiting
+            pending.exception()
+            raise
+        finally:
+            del self._pending_scoped[plan_key]
+
+        self._scoped_instances[plan_key] = inst
+        self._scoped_registrations[plan_key] = reg
+        pending.set_result(inst)
+        return inst
 
-        if reg.lifetime == Lifetime.Scoped:
-            inst = insts.get(_type)
-            if inst is not None:
+    async def _construct_async(self, reg: DependencyRegistration) -> Any:
+        '''
+        Constructs a new transient or scoped instance within the scope.
+        '''
+        with self._provider._measure(reg):
+            if reg.factory:
+                inst = reg.factory(self)
+                if asyncio.iscoroutine(inst):
+                    inst = await inst
                 return inst
+            return await reg.activate_async(self)
 
-        if reg.factory:
-            inst = reg.factory(self)
-            if asyncio.iscoroutine(inst):
-                inst = await inst
-        else:
-            inst = await reg.activate_async(self)
-
-        if reg.lifetime == Lifetime.Scoped:
-            insts[_type] = inst
-
+    def _acquire_pooled(self, reg: DependencyRegistration) -> Any:
+        '''
+        Check out a pooled instance, tracking it for return on dispose().
+        '''
+        pool = self._provider._get_pool(reg)
+        inst = pool.acquire()
+        with self._cache_lock:
+            self._pooled_instances.append((pool, inst))
         return inst
 
     def dispose(self) -> None:
         '''
-        Clear scoped instances. Calls dispose() on any instance that exposes it.
+        Clear scoped instances. Calls dispose() on any instance that exposes it
+        and returns pooled instances to their pools.
         '''
         for instance in self._scoped_instances.values():
             if hasattr(instance, 'dispose') and callable(instance.dispose):
@@ -531,6 +1641,56 @@ class ServiceScope:
                     logger.warning(f"Error disposing scoped instance: {e}")
 
         self._scoped_instances.clear()
+        self._scoped_registrations.clear()
+
+        with self._cache_lock:
+            pooled_instances = self._pooled_instances
+            self._pooled_instances = []
+
+        for pool, instance in pooled_instances:
+            pool.release(instance)
+
+    async def dispose_async(
+        self,
+        exc_type=None,
+        exc_value=None,
+        traceback=None,
+        timeout: Optional[float] = None
+    ) -> None:
+        '''
+        Asynchronously dispose scoped instances and return pooled instances to
+        their pools. Scoped instances are disposed in reverse dependency order,
+        concurrently within each dependency level: each is exited if it is an
+        async context manager, otherwise closed (aclose() or close()), then
+        dispose() is called if it exposes it.
+
+        `exc_type`, `exc_value`, `traceback`: The exception passed to __aexit__.
+        `timeout`: The deadline in seconds (defaults to the provider's
+            dispose_timeout; unbounded if both are None). Disposals still
+            running at the deadline are cancelled.
+        '''
+        if timeout is None:
+            timeout = self._provider._dispose_timeout
+
+        instances = self._scoped_instances
+        registrations = self._scoped_registrations
+        self._scoped_instances = {}
+        self._scoped_registrations = {}
+
+        instance_lookup = {id(registrations[plan_key]): instance
+                           for plan_key, instance in instances.items()}
+        levels = [[instance_lookup[id(reg)] for reg in level]
+                  for level in reversed(self._provider._get_build_levels(
+                      list(registrations.values())))]
+
+        undisposed = await dispose_levels_async(
+            levels, timeout, exc_type, exc_value, traceback)
+        if undisposed:
+            logger.warning(
+                f'Scope disposal deadline of {timeout}s exceeded: '
+                f'{len(undisposed)} scoped instances were not disposed')
+
+        self.dispose()
 
 
 class DependencyInjector:
@@ -554,115 +1714,54 @@ class DependencyInjector:
 
         In strict mode all annotated params must be registered.
         In non-strict mode only registered params are injected; others are left to the caller.
-        '''
-        from framework.di.service_collection import get_signature
-        sig = get_signature(fn)
-        is_async = asyncio.iscoroutinefunction(fn)
-
-        new_params = []
-        injectable_params = {}
-
-        for name, param in sig.parameters.items():
-            if param.annotation != inspect.Parameter.empty:
-                if self._strict:
-                    if param.annotation not in self._provider._dependency_lookup:
-                        raise ValueError(
-                            f"Failed to resolve dependency '{param.annotation.__name__}' "
-                            f"for parameter '{name}': dependency is not registered")
-                    injectable_params[name] = param.annotation
-                else:
-                    if param.annotation in self._provider._dependency_lookup:
-                        injectable_params[name] = param.annotation
-                    else:
-                        new_params.append(param)
-            else:
-                new_params.append(param)
 
-        new_sig = sig.replace(parameters=new_params)
+        The injected params are planned once here; singleton params are
+        resolved on the first call and reused, and the remaining params are
+        resolved from the current scope in a single pass per call.
+        '''
+        plan = HandlerInjectionPlan(fn, strict=self._strict)
+        injectable_params = plan.get_injectable_params(self._provider)
+        new_sig = plan.signature.replace(parameters=[
+            param for name, param in plan.signature.parameters.items()
+            if name not in injectable_params])
 
-        if is_async:
+        if asyncio.iscoroutinefunction(fn):
             @wraps(fn)
             async def async_wrapper(*args, **kwargs):
-                if hasattr(async_wrapper, '_scope') and async_wrapper._scope is not None:
-                    resolve_method = async_wrapper._scope.resolve_async
-                else:
-                    resolve_method = self._provider.resolve_async
-
-                for name, param_type in injectable_params.items():
-                    if name not in kwargs:
-                        try:
-                            kwargs[name] = await resolve_method(param_type)
-                        except Exception as e:
-                            if self._strict:
-                                raise ValueError(
-                                    f"Failed to resolve dependency '{param_type.__name__}' "
-                                    f"for '{name}': {e}")
-                            logger.debug(f"Skipping DI for '{name}': {e}")
+                resolver = plan.get_resolver(self._provider)
+                kwargs = await resolver.resolve_async(
+                    get_request_scope() or self._provider, kwargs)
                 return await fn(*args, **kwargs)
 
             async_wrapper.__signature__ = new_sig
-            async_wrapper._scope = None
             return async_wrapper
         else:
             @wraps(fn)
             def sync_wrapper(*args, **kwargs):
-                if hasattr(sync_wrapper, '_scope') and sync_wrapper._scope is not None:
-                    resolver = sync_wrapper._scope
-                else:
-                    resolver = self._provider
-
-                for name, param_type in injectable_params.items():
-                    if name not in kwargs:
-                        try:
-                            kwargs[name] = resolver.resolve(param_type)
-                        except Exception as e:
-                            if self._strict:
-                                raise ValueError(
-                                    f"Failed to resolve dependency '{param_type.__name__}' "
-                                    f"for '{name}': {e}")
-                            logger.debug(f"Skipping DI for '{name}': {e}")
+                resolver = plan.get_resolver(self._provider)
+                kwargs = resolver.resolve(
+                    get_request_scope() or self._provider, kwargs)
                 return fn(*args, **kwargs)
 
             sync_wrapper.__signature__ = new_sig
-            sync_wrapper._scope = None
             return sync_wrapper
 
     def setup_fastapi(self, app) -> None:
         '''
-        Install FastAPI middleware to create a new scope per request and wire
-        decorated endpoints.
+        Install ASGI middleware on a FastAPI app that runs each request within
+        its own request scope.
         '''
-        from fastapi import Request
-
-        @app.middleware('http')
-        async def di_middleware(request: Request, call_next):
-            with self.create_scope() as scope:
-                request.state.scope = scope
-                for route in app.routes:
-                    if hasattr(route, 'endpoint') and hasattr(route.endpoint, '_scope'):
-                        route.endpoint._scope = scope
-                return await call_next(request)
+        app.add_middleware(RequestScopeMiddleware, provider=self._provider)
 
     def setup_flask(self, app) -> None:
         '''
-        Install Flask hooks to manage a scope per request via flask.g.
+        Install Flask hooks to manage a request scope per request.
         '''
-        from flask import g
-
-        @app.before_request
-        def before_request():
-            g.scope = self.create_scope()
-
-        @app.teardown_request
-        def teardown_request(exception=None):
-            if hasattr(g, 'scope'):
-                g.scope.dispose()
+        use_request_scope_flask(app, self._provider)
 
-        for rule in app.url_map.iter_rules():
-            endpoint = app.view_functions[rule.endpoint]
-            if hasattr(endpoint, '_scope'):
-                @wraps(endpoint)
-                def wrapped_view(*args, **kwargs):
-                    endpoint._scope = g.scope
-                    return endpoint(*args, **kwargs)
-                app.view_functions[rule.endpoint] = wrapped_view
+    def setup_quart(self, app) -> None:
+        '''
+        Install Quart hooks to manage a request scope per request, disposed
+        asynchronously at teardown.
+        '''
+        use_request_scope_quart(app, self._provider)
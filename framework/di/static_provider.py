@@ -1,5 +1,12 @@
+import asyncio
 import inspect
 import threading
+from functools import wraps
+
+from framework.di.injection import HandlerInjectionPlan
+from framework.di.request_scope import (end_request_scope, get_request_scope,
+                                        use_request_scope_flask,
+                                        use_request_scope_quart)
 from framework.di.service_provider import ServiceProvider
 from framework.logger import get_logger
 
@@ -9,9 +16,15 @@ logger = get_logger(__name__)
 def get_current_container():
     """
     Returns the current container.
-    If in a Flask/Quart request, create (or return) and use a scoped container;
-    otherwise, return the root provider.
+    If a request scope is active (Quart, Flask or ASGI middleware from
+    framework.di.request_scope), return it. Otherwise, in a Flask request
+    without request scope hooks, create (or return) a scoped container on
+    `g`; outside of a request, return the root provider.
     """
+    scope = get_request_scope()
+    if scope is not None:
+        return scope
+
     try:
         from flask import has_request_context, g
         if has_request_context():
@@ -28,8 +41,11 @@ def get_current_container():
 def dispose_current_container():
     """
     Dispose of the current request's scoped container.
-    In Flask/Quart, call this in a teardown handler.
+    In Flask, call this in a teardown handler (not required when the request
+    scope hooks are installed).
     """
+    end_request_scope()
+
     try:
         from flask import has_request_context, g
         if has_request_context() and hasattr(g, 'di_container'):
@@ -39,6 +55,18 @@ def dispose_current_container():
         pass
 
 
+def use_request_scope(app):
+    """
+    Install request scope hooks on a Quart (or Flask) app, bound to the root
+    provider. Call after the provider has been built and bound.
+    """
+    provider = InternalProvider.get_provider()
+    if any(base.__module__.startswith('quart') for base in type(app).__mro__):
+        use_request_scope_quart(app, provider)
+    else:
+        use_request_scope_flask(app, provider)
+
+
 class InternalProvider:
     service_provider = None
 
@@ -115,27 +143,53 @@ def get_function_args(func):
     return list(inspect.signature(func).parameters)
 
 
+def inject_dependencies(func):
+    """
+    Injects the current (scoped if available) container into the `container`
+    param of a sync or async function, and registered dependencies into its
+    annotated params. The params are planned once at decoration; singleton
+    dependencies are resolved on the first call and reused, and the rest are
+    resolved from the current container in a single pass per call.
+    """
+    plan = HandlerInjectionPlan(func, container_param='container')
+
+    if asyncio.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrap(*args, **kwargs):
+            provider = InternalProvider.get_provider()
+            if provider is not None:
+                kwargs = await plan.get_resolver(provider).resolve_async(
+                    get_current_container(), kwargs)
+            elif plan.container_param is not None:
+                kwargs.setdefault(plan.container_param, None)
+            return await func(*args, **kwargs)
+        return async_wrap
+
+    @wraps(func)
+    def wrap(*args, **kwargs):
+        provider = InternalProvider.get_provider()
+        if provider is not None:
+            kwargs = plan.get_resolver(provider).resolve(
+                get_current_container(), kwargs)
+        elif plan.container_param is not None:
+            kwargs.setdefault(plan.container_param, None)
+        return func(*args, **kwargs)
+    return wrap
+
+
 def inject_container_async(func):
     """
     Asynchronously injects the container into a function if it requires it.
     The injected container will be the current (scoped if available) container.
+    Superseded by inject_dependencies.
     """
-    async def wrap(*args, **kwargs):
-        func_args = get_function_args(func)
-        if 'container' in func_args:
-            return await func(*args, **kwargs, container=get_current_container())
-        return await func(*args, **kwargs)
-    return wrap
+    return inject_dependencies(func)
 
 
 def inject_container(func):
     """
     Injects the container into a function if it requires it.
     The injected container will be the current (scoped if available) container.
+    Superseded by inject_dependencies.
     """
-    def wrap(*args, **kwargs):
-        func_args = get_function_args(func)
-        if 'container' in func_args:
-            return func(*args, **kwargs, container=get_current_container())
-        return func(*args, **kwargs)
-    return wrap
+    return inject_dependencies(func)
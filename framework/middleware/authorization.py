@@ -5,14 +5,13 @@ from typing import List, Union
 import jwt
 from framework.configuration import Configuration
 from framework.constants.constants import ConfigurationKey, InclusionType
-from framework.dependency_injection.provider import InternalProvider
+from framework.di.static_provider import InternalProvider
 from framework.exceptions.authorization import (AuthorizationException,
                                                 UnauthorizedException)
 from framework.logger.providers import get_logger
 from framework.middleware.schemes.authorization_scheme import \
     AuthorizationScheme
-from framework.utilities import pinq
-from framework.utilities.pinq import first
+from framework.utilities.iter_utils import first
 from framework.validators.nulls import not_none
 from deprecated import deprecated
 
@@ -189,7 +188,7 @@ class AuthMiddleware:
 
             if isinstance(scheme, list):
                 for scheme_name in scheme:
-                    scheme_descriptor = pinq.first(
+                    scheme_descriptor = first(
                         descriptors,
                         lambda scm: scm.get('name') == scheme_name)
 
@@ -209,7 +208,7 @@ class AuthMiddleware:
 
             else:
                 # Single scheme name passed, not an iterable
-                scheme_descriptor = pinq.first(
+                scheme_descriptor = first(
                     descriptors, lambda scm: scm.get('name') == scheme)
 
                 if not scheme_descriptor:
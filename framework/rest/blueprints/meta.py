@@ -5,7 +5,7 @@ from quart import Blueprint
 
 from framework.auth.wrappers.azure_ad_wrappers import azure_ad_authorization
 from framework.auth.wrappers.key_authorization import key_authorization
-from framework.di.static_provider import inject_container_async
+from framework.di.static_provider import inject_dependencies
 from framework.exceptions.nulls import ArgumentNullException
 from framework.handlers.response_handler_async import response_handler
 
@@ -19,7 +19,7 @@ class MetaBlueprint(Blueprint):
             @self.route(rule, methods=methods, endpoint=self.__get_endpoint(function))
             @response_handler
             @azure_ad_authorization(scheme=auth_scheme)
-            @inject_container_async
+            @inject_dependencies
             @wraps(function)
             async def wrapper(*args, **kwargs):
                 return await function(*args, **kwargs)
@@ -44,7 +44,7 @@ class MetaBlueprint(Blueprint):
             @self.route(rule, methods=methods, endpoint=self.__get_endpoint(function))
             @response_handler
             @key_authorization(name=key_name)
-            @inject_container_async
+            @inject_dependencies
             @wraps(function)
             async def wrapper(*args, **kwargs):
                 return await function(*args, **kwargs)
@@ -60,7 +60,7 @@ class OpenAuthBlueprint(Blueprint):
         def decorator(function):
             @self.route(rule, methods=methods, endpoint=self.__get_endpoint(function))
             @response_handler
-            @inject_container_async
+            @inject_dependencies
             @wraps(function)
             async def wrapper(*args, **kwargs):
                 return await function(*args, **kwargs)
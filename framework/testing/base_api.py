@@ -3,12 +3,13 @@
 from unittest.mock import Mock
 import unittest
 
+from framework.di.static_provider import InternalProvider
 from framework.testing.helpers import (
     inject_test_dependency,
     inject_mock_middleware
 )
-from framework.clients.feature_client import FeatureClient
-from framework.clients.cache_client import CacheClient
+from framework.clients.feature_client import FeatureClientAsync
+from framework.clients.cache_client import CacheClientAsync
 
 
 class ApiTest(unittest.TestCase):
@@ -17,17 +18,22 @@ class ApiTest(unittest.TestCase):
         self.mock_feature_client = Mock()
         self.mock_cache_client = Mock()
 
-        inject_test_dependency(
+        provider = inject_test_dependency(
             provider=provider,
-            _type=FeatureClient,
+            _type=FeatureClientAsync,
             instance=self.mock_feature_client)
-        inject_test_dependency(
+        provider = inject_test_dependency(
             provider=provider,
-            _type=CacheClient,
+            _type=CacheClientAsync,
             instance=self.mock_cache_client)
 
-        inject_mock_middleware(
+        # The overrides are registered on a child provider, which the app
+        # resolves from in place of the root provider for the test
+        self.provider = inject_mock_middleware(
             provider=provider)
+        self.addCleanup(
+            setattr, InternalProvider, 'service_provider', InternalProvider.service_provider)
+        InternalProvider.service_provider = self.provider
 
     def _get_mock_auth_headers(self):
         return {
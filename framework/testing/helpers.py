@@ -1,26 +1,34 @@
 import uuid
-from framework.dependency_injection.container import (
-    Dependency,
-    DependencyType
-)
+from framework.di.service_collection import ServiceCollection
 from framework.middleware.authorization import AuthMiddleware
 from unittest.mock import Mock
 
 
 def inject_test_dependency(provider, _type, instance):
-    container = provider.get_container()
-    container._container[_type] = Dependency(
-        _type=_type,
-        reg_type=DependencyType.SINGLETON,
+    '''
+    Returns a child of the provider with the instance registered as the
+    singleton for the type. The provider itself is left unchanged.
+    '''
+
+    overrides = ServiceCollection()
+    overrides.add_singleton(
+        dependency_type=_type,
         instance=instance)
 
+    return provider.create_child(overrides)
+
 
 def inject_mock_middleware(provider):
+    '''
+    Returns a child of the provider with a mock AuthMiddleware that accepts
+    every access token.
+    '''
+
     auth_middleware = Mock()
     auth_middleware.validate_access_token = Mock(
         return_value=True)
 
-    inject_test_dependency(
+    return inject_test_dependency(
         provider=provider,
         _type=AuthMiddleware,
         instance=auth_middleware)
@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from framework.auth.azure.azure_ad_jwks import (AzureJwksKeyException,
+                                                AzureJwksProvider)
+from framework.caching import memory_cache
+
+
+def get_response(data: dict) -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = data
+    return response
+
+
+class TestAzureJwksProvider(unittest.TestCase):
+    def test_missing_keys_not_cached(self):
+        # Arrange
+        provider = AzureJwksProvider(tenant_id=str(uuid4()))
+        keys = [{'kid': 'kid', 'n': 'AQAB', 'e': 'AQAB'}]
+        clock = MagicMock()
+        clock.time.return_value = 1000.0
+
+        # Act
+        with patch.object(memory_cache, 'time', clock), \
+                patch('framework.auth.azure.azure_ad_jwks.requests.get') as get:
+            get.side_effect = [
+                get_response({'error': 'throttled'}),
+                get_response({'keys': keys})]
+
+            with self.assertRaises(AzureJwksKeyException):
+                provider._get_azure_jwks()
+
+            clock.time.return_value += memory_cache.NEGATIVE_TTL + 1
+            fetched = provider._get_azure_jwks()
+
+        # Assert
+        self.assertEqual(fetched, keys)
+        self.assertEqual(get.call_count, 2)
+
+    def test_error_response_raised(self):
+        # Arrange
+        provider = AzureJwksProvider(tenant_id=str(uuid4()))
+        response = get_response({'keys': []})
+        response.raise_for_status.side_effect = Exception('429 Too Many Requests')
+
+        # Act
+        with patch('framework.auth.azure.azure_ad_jwks.requests.get', return_value=response):
+            with self.assertRaises(Exception):
+                provider._get_azure_jwks()
+
+        # Assert
+        response.raise_for_status.assert_called_once()
@@ -1,8 +1,36 @@
+import asyncio
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
+from typing import Generic, TypeVar
+from unittest.mock import patch
 from uuid import uuid4
 
 from framework.di import service_collection
-from framework.di.service_provider import ServiceCollection, ServiceProvider
+from framework.di import service_collection as service_collection_module
+from framework.di import service_provider as service_provider_module
+from framework.di.deferred import Factory, Lazy
+from framework.di.exceptions import (DependencyCycleError,
+                                     InvalidDependencyChainError,
+                                     PooledDependencyInjectionError,
+                                     RegistrationNotFoundError,
+                                     ScopedDependencyInjectionError,
+                                     TransientDependencyInjectionError)
+from framework.di.generics import get_qualified_type_name
+from framework.di.metadata_cache import RegistrationMetadataCache
+from framework.di.profiling import ConstructionProfiler
+from framework.di.request_scope import (RequestScopeMiddleware,
+                                        get_request_scope)
+from framework.di.service_provider import (DependencyInjector,
+                                           ServiceCollection, ServiceProvider)
+from framework.di.static_provider import InternalProvider, inject_dependencies
+from framework.middleware.authorization import AuthMiddleware
+from framework.testing.helpers import (inject_mock_middleware,
+                                       inject_test_dependency)
 
 
 class MockConfiguration:
@@ -28,6 +56,37 @@ service_collection = ServiceCollection()
 service_collection.add_singleton(MockDependency)
 
 
+class MockSlowDependency:
+    def __init__(self):
+        time.sleep(0.02)
+
+
+class MockSlowConsumer:
+    def __init__(
+        self,
+        dependency: MockSlowDependency
+    ):
+        time.sleep(0.02)
+        self.dependency = dependency
+
+
+class IMockSlowService:
+    pass
+
+
+class MockSlowService(IMockSlowService):
+    def __init__(self):
+        time.sleep(0.02)
+
+
+class MockSlowServiceConsumer:
+    def __init__(
+        self,
+        service: IMockSlowService
+    ):
+        self.service = service
+
+
 class TestServiceProvider(unittest.TestCase):
     def test_resolve_transient(self):
         # Arrange
@@ -88,3 +147,1461 @@ class TestServiceProvider(unittest.TestCase):
         self.assertIsNotNone(second_dependency.configuration)
         self.assertEqual(first_dependency.configuration.instance_id,
                          second_dependency.configuration.instance_id)
+
+    def test_resolve_transient_nested_dependency(self):
+        # Arrange
+        service_collection = ServiceCollection()
+
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_transient(MockNestedDependency)
+
+        service_provider = ServiceProvider(service_collection)
+        service_provider.build()
+
+        # Act
+        first_dependency = service_provider.resolve(MockNestedDependency)
+        second_dependency = service_provider.resolve(MockNestedDependency)
+
+        # Assert
+        self.assertNotEqual(first_dependency.instance_id,
+                            second_dependency.instance_id)
+        self.assertIs(first_dependency.configuration,
+                      second_dependency.configuration)
+
+    def test_build_compiles_activators(self):
+        # Arrange
+        service_collection = ServiceCollection()
+
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_transient(MockNestedDependency)
+
+        service_provider = ServiceProvider(service_collection)
+
+        # Act
+        service_provider.build()
+
+        # Assert
+        self.assertIn(MockConfiguration, service_provider._activators)
+        self.assertIn(MockNestedDependency, service_provider._activators)
+
+    def test_resolve_without_build(self):
+        # Arrange
+        service_collection = ServiceCollection()
+
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_transient(MockNestedDependency)
+
+        service_provider = ServiceProvider(service_collection)
+
+        # Act
+        dependency = service_provider.resolve(MockNestedDependency)
+
+        # Assert
+        self.assertIsNotNone(dependency.configuration)
+
+    def test_resolve_unregistered_type(self):
+        # Arrange
+        service_collection = ServiceCollection()
+
+        service_collection.add_transient(MockNestedDependency)
+
+        service_provider = ServiceProvider(service_collection)
+        service_provider.build()
+
+        # Act / Assert
+        with self.assertRaises(RegistrationNotFoundError):
+            service_provider.resolve(MockDependency)
+
+        with self.assertRaises(RegistrationNotFoundError):
+            service_provider.resolve(MockNestedDependency)
+
+    def test_build_parallel(self):
+        # Arrange
+        lock = threading.Lock()
+        tracker = dict(in_flight=0, peak=0)
+
+        def get_factory(_type):
+            def factory(provider):
+                with lock:
+                    tracker['in_flight'] += 1
+                    tracker['peak'] = max(tracker['peak'], tracker['in_flight'])
+                time.sleep(0.05)
+                with lock:
+                    tracker['in_flight'] -= 1
+                return _type()
+            return factory
+
+        service_collection = ServiceCollection()
+        for _type in [MockClientA, MockClientB, MockClientC]:
+            service_collection.add_singleton(_type, factory=get_factory(_type))
+        service_collection.add_singleton(MockClientConsumer, eager=True)
+
+        service_provider = ServiceProvider(service_collection)
+
+        # Act
+        service_provider.build(parallelism=4)
+        consumer = service_provider.resolve(MockClientConsumer)
+
+        # Assert
+        self.assertEqual(tracker['peak'], 3)
+        self.assertIs(consumer.client_a, service_provider.resolve(MockClientA))
+        self.assertEqual(service_provider.built_types[-1], MockClientConsumer)
+
+    def test_build_coroutine_factories_share_loop(self):
+        # Arrange
+        loops = []
+
+        def get_factory(_type):
+            async def factory(provider):
+                loops.append(asyncio.get_running_loop())
+                return _type()
+            return factory
+
+        service_collection = ServiceCollection()
+        for _type in [MockClientA, MockClientB]:
+            service_collection.add_singleton(_type, factory=get_factory(_type))
+
+        service_provider = ServiceProvider(service_collection)
+
+        # Act
+        service_provider.build()
+
+        # Assert
+        self.assertEqual(len(loops), 2)
+        self.assertIs(loops[0], loops[1])
+        self.assertIsInstance(service_provider.resolve(MockClientB), MockClientB)
+
+    def test_concurrent_lazy_resolve(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_singleton(MockNestedDependency)
+        service_collection.add_transient(MockDependency)
+
+        # Not built, so every plan is compiled on first resolve
+        service_provider = ServiceProvider(service_collection)
+        barrier = threading.Barrier(16)
+        results = []
+
+        def resolve():
+            barrier.wait()
+            for _ in range(100):
+                results.append((
+                    service_provider.resolve(MockNestedDependency),
+                    service_provider.resolve(MockDependency)))
+
+        # Act
+        threads = [threading.Thread(target=resolve) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(len(results), 1600)
+        self.assertEqual(len({id(nested) for nested, _ in results}), 1)
+        self.assertEqual(len({id(transient) for _, transient in results}), 1600)
+        self.assertEqual(
+            set(service_provider._activators),
+            {MockConfiguration, MockNestedDependency, MockDependency})
+        self.assertEqual(service_provider._pending_activators, {})
+
+    def test_construction_profiler(self):
+        # Arrange
+        service_collection = ServiceCollection()
+
+        service_collection.add_singleton(MockSlowDependency)
+        service_collection.add_singleton(MockSlowConsumer, eager=True)
+
+        service_provider = ServiceProvider(service_collection, profile=True)
+
+        # Act
+        service_provider.build()
+        report = service_provider.get_construction_report()
+
+        # Assert
+        consumer = report.types['MockSlowConsumer']
+        dependency = report.types['MockSlowDependency']
+
+        self.assertEqual(consumer['count'], 1)
+        self.assertGreaterEqual(consumer['inclusive_time'], 0.04)
+        self.assertLess(consumer['self_time'], consumer['inclusive_time'])
+        self.assertGreaterEqual(dependency['self_time'], 0.02)
+        self.assertEqual(report.critical_path,
+                         ['MockSlowDependency', 'MockSlowConsumer'])
+        self.assertIn('MockSlowConsumer;MockSlowDependency ',
+                      report.to_collapsed())
+        self.assertIn('critical_path', json.loads(report.to_json()))
+
+    def test_construction_profiler_interface_registration(self):
+        # Arrange
+        service_collection = ServiceCollection()
+
+        service_collection.add_singleton(IMockSlowService, MockSlowService)
+        service_collection.add_singleton(MockSlowServiceConsumer, eager=True)
+
+        service_provider = ServiceProvider(service_collection, profile=True)
+
+        # Act
+        service_provider.build()
+        report = service_provider.get_construction_report()
+
+        # Assert
+        self.assertEqual(report.critical_path,
+                         ['IMockSlowService', 'MockSlowServiceConsumer'])
+        self.assertGreaterEqual(report.critical_path_time,
+                                report.types['IMockSlowService']['self_time'])
+        self.assertGreaterEqual(report.critical_path_time, 0.02)
+
+    def test_construction_profiler_same_named_types(self):
+        # Arrange
+        other = type('MockSlowDependency', (), {'__module__': 'mock_module'})
+        profiler = ConstructionProfiler()
+
+        # Act
+        for _type in [MockSlowDependency, other]:
+            with profiler.measure(_type):
+                pass
+        report = profiler.report()
+
+        # Assert
+        self.assertEqual(set(report.types), {
+            get_qualified_type_name(MockSlowDependency),
+            'mock_module.MockSlowDependency'})
+        self.assertTrue(all(entry['count'] == 1 for entry in report.types.values()))
+
+
+class MockClientA:
+    pass
+
+
+class MockClientB:
+    pass
+
+
+class MockClientC:
+    pass
+
+
+class MockClientConsumer:
+    def __init__(
+        self,
+        client_a: MockClientA,
+        client_b: MockClientB
+    ):
+        self.client_a = client_a
+        self.client_b = client_b
+
+
+class TestServiceProviderAsync(unittest.IsolatedAsyncioTestCase):
+    def _get_tracking_factory(self, _type, tracker):
+        async def factory(provider):
+            tracker['in_flight'] += 1
+            tracker['peak'] = max(tracker['peak'], tracker['in_flight'])
+            await asyncio.sleep(0.01)
+            tracker['in_flight'] -= 1
+            tracker['order'].append(_type)
+            return _type()
+        return factory
+
+    def _get_service_collection(self, tracker):
+        service_collection = ServiceCollection()
+        for _type in [MockClientA, MockClientB, MockClientC]:
+            service_collection.add_singleton(
+                _type, factory=self._get_tracking_factory(_type, tracker))
+        service_collection.add_singleton(MockClientConsumer, eager=True)
+        return service_collection
+
+    async def test_build_async_constructs_level_concurrently(self):
+        # Arrange
+        tracker = dict(in_flight=0, peak=0, order=[])
+        service_provider = ServiceProvider(
+            self._get_service_collection(tracker))
+
+        # Act
+        await service_provider.build_async()
+        consumer = await service_provider.resolve_async(MockClientConsumer)
+
+        # Assert
+        self.assertEqual(tracker['peak'], 3)
+        self.assertIs(consumer.client_a, service_provider.resolve(MockClientA))
+        self.assertIs(consumer.client_b, service_provider.resolve(MockClientB))
+        self.assertIn(MockClientConsumer, service_provider.built_types)
+
+    async def test_build_async_max_concurrency(self):
+        # Arrange
+        tracker = dict(in_flight=0, peak=0, order=[])
+        service_provider = ServiceProvider(
+            self._get_service_collection(tracker))
+
+        # Act
+        await service_provider.build_async(max_concurrency=1)
+
+        # Assert
+        self.assertEqual(tracker['peak'], 1)
+        self.assertEqual(len(tracker['order']), 3)
+
+    async def test_build_async_factory_resolving_same_level(self):
+        # Arrange
+        calls = []
+
+        async def factory_a(provider):
+            calls.append(MockClientA)
+            await asyncio.sleep(0.01)
+            return MockClientA()
+
+        async def factory_b(provider):
+            calls.append(MockClientB)
+            await provider.resolve_async(MockClientA)
+            return MockClientB()
+
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockClientA, factory=factory_a)
+        service_collection.add_singleton(MockClientB, factory=factory_b)
+
+        service_provider = ServiceProvider(service_collection)
+
+        # Act
+        await service_provider.build_async()
+
+        # Assert
+        self.assertEqual(calls.count(MockClientA), 1)
+
+    async def test_resolve_async_params_concurrently(self):
+        # Arrange
+        tracker = dict(in_flight=0, peak=0, order=[])
+
+        service_collection = ServiceCollection()
+        service_collection.add_transient(
+            MockClientA, factory=self._get_tracking_factory(MockClientA, tracker))
+        service_collection.add_transient(
+            MockClientB, factory=self._get_tracking_factory(MockClientB, tracker))
+        service_collection.add_transient(MockClientConsumer)
+
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Act
+        consumer = await service_provider.resolve_async(MockClientConsumer)
+
+        # Assert
+        self.assertEqual(tracker['peak'], 2)
+        self.assertIsInstance(consumer.client_a, MockClientA)
+        self.assertIsInstance(consumer.client_b, MockClientB)
+
+    async def test_scope_resolve_async_shares_pending_scoped(self):
+        # Arrange
+        calls = []
+
+        async def factory(scope):
+            calls.append(MockClientC)
+            await asyncio.sleep(0.01)
+            return MockClientC()
+
+        async def factory_a(scope):
+            return MockClientA() if await scope.resolve_async(MockClientC) else None
+
+        async def factory_b(scope):
+            return MockClientB() if await scope.resolve_async(MockClientC) else None
+
+        service_collection = ServiceCollection()
+        service_collection.add_scoped(MockClientC, factory=factory)
+        service_collection.add_transient(MockClientA, factory=factory_a)
+        service_collection.add_transient(MockClientB, factory=factory_b)
+        service_collection.add_transient(MockClientConsumer)
+
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Act
+        async with service_provider.create_scope() as scope:
+            consumer = await scope.resolve_async(MockClientConsumer)
+
+        # Assert
+        self.assertIsInstance(consumer.client_a, MockClientA)
+        self.assertEqual(len(calls), 1)
+
+
+class MockScopedResource:
+    def __init__(self):
+        self.instance_id = str(uuid4())
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.closed = True
+
+
+class TestRequestScope(unittest.IsolatedAsyncioTestCase):
+    def _get_provider(self):
+        service_collection = ServiceCollection()
+        service_collection.add_scoped(MockScopedResource)
+        return ServiceProvider(service_collection).build()
+
+    async def test_middleware_scope_per_request(self):
+        # Arrange
+        service_provider = self._get_provider()
+        injector = DependencyInjector(service_provider)
+        seen = []
+
+        @injector.inject
+        async def handler(resource: MockScopedResource):
+            await asyncio.sleep(0.001)
+            again = await get_request_scope().resolve_async(MockScopedResource)
+            seen.append((resource, again))
+
+        async def app(scope, receive, send):
+            await handler()
+
+        middleware = RequestScopeMiddleware(app, service_provider)
+
+        # Act
+        await asyncio.gather(*[
+            middleware(dict(type='http'), None, None)
+            for _ in range(500)])
+
+        # Assert
+        self.assertEqual(len(seen), 500)
+        self.assertEqual(len({id(resource) for resource, _ in seen}), 500)
+        for resource, again in seen:
+            self.assertIs(resource, again)
+            self.assertTrue(resource.closed)
+        self.assertIsNone(get_request_scope())
+
+    async def test_request_scope_lifespan_passthrough(self):
+        # Arrange
+        service_provider = self._get_provider()
+        scopes = []
+
+        async def app(scope, receive, send):
+            scopes.append(get_request_scope())
+
+        middleware = RequestScopeMiddleware(app, service_provider)
+
+        # Act
+        await middleware(dict(type='lifespan'), None, None)
+
+        # Assert
+        self.assertEqual(scopes, [None])
+
+
+class TestHandlerInjection(unittest.IsolatedAsyncioTestCase):
+    def _get_provider(self):
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_singleton(MockDependency)
+        service_collection.add_scoped(MockScopedResource)
+        return ServiceProvider(service_collection).build()
+
+    async def test_singleton_handler_resolves_once(self):
+        # Arrange
+        service_provider = self._get_provider()
+        injector = DependencyInjector(service_provider)
+
+        @injector.inject
+        async def handler(configuration: MockConfiguration, dependency: MockDependency, value: str):
+            return configuration, dependency, value
+
+        # Act
+        first = await handler(value='a')
+        with patch.object(service_provider, 'resolve_async') as resolve_async:
+            second = await handler(value='b')
+
+        # Assert
+        resolve_async.assert_not_called()
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], second[1])
+        self.assertEqual(second[2], 'b')
+        self.assertEqual(list(inspect.signature(handler).parameters), ['value'])
+
+    async def test_failed_singleton_retried(self):
+        # Arrange
+        service_provider = self._get_provider()
+        injector = DependencyInjector(service_provider)
+        resolve_async = service_provider.resolve_async
+
+        @injector.inject
+        async def handler(configuration: MockConfiguration = None):
+            return configuration
+
+        # Act
+        with patch.object(service_provider, 'resolve_async', side_effect=Exception('Failed')):
+            failed = await handler()
+        with patch.object(service_provider, 'resolve_async', side_effect=resolve_async) as retried:
+            resolved = await handler()
+
+        # Assert
+        retried.assert_called_once_with(MockConfiguration)
+        self.assertIsNone(failed)
+        self.assertIs(resolved, service_provider.resolve(MockConfiguration))
+
+    async def test_scoped_params_resolved_per_request(self):
+        # Arrange
+        service_provider = self._get_provider()
+        injector = DependencyInjector(service_provider)
+        seen = []
+
+        @injector.inject
+        async def handler(configuration: MockConfiguration, resource: MockScopedResource):
+            seen.append((configuration, resource))
+
+        async def app(scope, receive, send):
+            await handler()
+
+        middleware = RequestScopeMiddleware(app, service_provider)
+
+        # Act
+        await asyncio.gather(*[
+            middleware(dict(type='http'), None, None)
+            for _ in range(10)])
+
+        # Assert
+        self.assertEqual(len({id(configuration) for configuration, _ in seen}), 1)
+        self.assertEqual(len({id(resource) for _, resource in seen}), 10)
+
+    async def test_caller_kwargs_not_replaced(self):
+        # Arrange
+        service_provider = self._get_provider()
+        injector = DependencyInjector(service_provider)
+        configuration = MockConfiguration()
+
+        @injector.inject
+        def handler(configuration: MockConfiguration):
+            return configuration
+
+        # Act
+        result = handler(configuration=configuration)
+
+        # Assert
+        self.assertIs(result, configuration)
+
+    async def test_inject_dependencies_container(self):
+        # Arrange
+        service_provider = self._get_provider()
+
+        @inject_dependencies
+        async def handler(container, dependency: MockDependency, value: str):
+            return container, dependency, value
+
+        # Act
+        with patch.object(InternalProvider, 'service_provider', service_provider):
+            async with service_provider.create_scope() as scope:
+                with patch('framework.di.static_provider.get_request_scope', return_value=scope):
+                    container, dependency, value = await handler(value='a')
+
+        # Assert
+        self.assertIs(container, scope)
+        self.assertIs(dependency, service_provider.resolve(MockDependency))
+        self.assertEqual(value, 'a')
+
+
+disposed = []
+
+
+class MockClosableClient:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        await asyncio.sleep(0.05)
+        self.closed = True
+        disposed.append(type(self))
+
+
+class MockClosableCache(MockClosableClient):
+    pass
+
+
+class MockClosableRepository:
+    def __init__(
+        self,
+        client: MockClosableClient,
+        cache: MockClosableCache
+    ):
+        self.client = client
+        self.cache = cache
+
+    def close(self):
+        # Dependencies must still be open when a dependent is closed
+        self.open_on_close = not self.client.closed and not self.cache.closed
+        disposed.append(type(self))
+
+
+class MockHangingClient:
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await asyncio.sleep(10)
+
+
+class TestDisposal(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        disposed.clear()
+
+    async def test_aclose_reverse_order_concurrent_levels(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockClosableClient)
+        service_collection.add_singleton(MockClosableCache)
+        service_collection.add_singleton(MockClosableRepository)
+        service_provider = ServiceProvider(service_collection).build()
+        repository = service_provider.resolve(MockClosableRepository)
+
+        # Act
+        start = time.perf_counter()
+        await service_provider.aclose()
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        self.assertTrue(repository.open_on_close)
+        self.assertEqual(disposed[0], MockClosableRepository)
+        self.assertEqual(set(disposed[1:]), {MockClosableClient, MockClosableCache})
+        self.assertTrue(repository.client.closed and repository.cache.closed)
+        # Both clients are in the same level and close concurrently
+        self.assertLess(elapsed, 0.095)
+
+    async def test_aclose_skips_registered_instances(self):
+        # Arrange
+        client = MockClosableClient()
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockClosableClient, instance=client)
+        service_provider = ServiceProvider(service_collection).build()
+        service_provider.resolve(MockClosableClient)
+
+        # Act
+        await service_provider.aclose()
+
+        # Assert
+        self.assertFalse(client.closed)
+
+    async def test_aclose_deadline(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockHangingClient)
+        service_collection.add_singleton(MockClosableClient)
+        service_provider = ServiceProvider(service_collection).build()
+        service_provider.resolve(MockHangingClient)
+        service_provider.resolve(MockClosableClient)
+
+        # Act
+        start = time.perf_counter()
+        await service_provider.aclose(timeout=0.1)
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        self.assertLess(elapsed, 0.5)
+        self.assertTrue(service_provider.resolve(MockClosableClient).closed)
+
+    async def test_scope_dispose_concurrent_bounded(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_scoped(MockClosableClient)
+        service_collection.add_scoped(MockClosableCache)
+        service_collection.add_scoped(MockHangingClient)
+        service_collection.add_scoped(MockClosableRepository)
+        service_provider = ServiceProvider(
+            service_collection, dispose_timeout=0.2).build()
+
+        # Act
+        start = time.perf_counter()
+        async with service_provider.create_scope() as scope:
+            repository = await scope.resolve_async(MockClosableRepository)
+            scope.resolve(MockHangingClient)
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        self.assertTrue(repository.open_on_close)
+        self.assertTrue(repository.client.closed and repository.cache.closed)
+        self.assertLess(elapsed, 0.5)
+
+
+class MockPooledParser:
+    def __init__(self):
+        self.instance_id = str(uuid4())
+        self.buffer = []
+
+
+class MockPooledConsumer:
+    def __init__(
+        self,
+        parser: MockPooledParser
+    ):
+        self.parser = parser
+
+
+class TestPooledLifetime(unittest.TestCase):
+    def _get_provider(self, **kwargs):
+        service_collection = ServiceCollection()
+        service_collection.add_pooled(MockPooledParser, **kwargs)
+        return ServiceProvider(service_collection).build()
+
+    def test_pooled_instance_reused_across_scopes(self):
+        # Arrange
+        service_provider = self._get_provider(
+            max_size=2, reset=lambda parser: parser.buffer.clear())
+
+        # Act
+        with service_provider.create_scope() as scope:
+            first = scope.resolve(MockPooledParser)
+            first.buffer.append('data')
+
+        with service_provider.create_scope() as scope:
+            second = scope.resolve(MockPooledParser)
+
+        # Assert
+        self.assertIs(first, second)
+        self.assertEqual(second.buffer, [])
+
+        stats = service_provider.pool_stats()['MockPooledParser']
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['reused'], 1)
+        self.assertEqual(stats['in_use'], 0)
+
+    def test_pooled_exhaustion(self):
+        # Arrange
+        service_provider = self._get_provider(max_size=1)
+
+        # Act
+        with service_provider.create_scope() as scope:
+            first = scope.resolve(MockPooledParser)
+            second = scope.resolve(MockPooledParser)
+
+        # Assert
+        self.assertIsNot(first, second)
+
+        stats = service_provider.pool_stats()['MockPooledParser']
+        self.assertEqual(stats['exhausted'], 1)
+        self.assertEqual(stats['idle'], 1)
+        self.assertEqual(stats['discarded'], 1)
+
+    def test_pooled_requires_scope(self):
+        # Arrange
+        service_provider = self._get_provider()
+
+        # Act / Assert
+        with self.assertRaises(Exception):
+            service_provider.resolve(MockPooledParser)
+
+    def test_pooled_dependency_in_singleton(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_pooled(MockPooledParser)
+        service_collection.add_singleton(MockPooledConsumer)
+
+        # Act / Assert
+        with self.assertRaises(PooledDependencyInjectionError):
+            ServiceProvider(service_collection).build()
+
+
+class MockExpensiveDependency:
+    constructed = 0
+
+    def __init__(self):
+        MockExpensiveDependency.constructed += 1
+        self.instance_id = str(uuid4())
+
+
+class MockLazyConsumer:
+    def __init__(
+        self,
+        expensive: Lazy[MockExpensiveDependency]
+    ):
+        self.expensive = expensive
+
+
+class MockFactoryConsumer:
+    def __init__(
+        self,
+        create_expensive: Factory[MockExpensiveDependency]
+    ):
+        self.create_expensive = create_expensive
+
+
+class MockForwardLazyConsumer:
+    def __init__(
+        self,
+        expensive: Lazy['MockForwardDependency']
+    ):
+        self.expensive = expensive
+
+
+class MockForwardDependency:
+    pass
+
+
+class MockUnresolvableConsumer:
+    def __init__(
+        self,
+        missing: Lazy['MockMissingDependency']
+    ):
+        self.missing = missing
+
+
+class TestDeferredInjection(unittest.TestCase):
+    def setUp(self):
+        MockExpensiveDependency.constructed = 0
+
+    def test_lazy_resolves_on_first_access(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockExpensiveDependency)
+        service_collection.add_transient(MockLazyConsumer)
+
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Act
+        consumer = service_provider.resolve(MockLazyConsumer)
+        constructed_before_access = MockExpensiveDependency.constructed
+        instance_id = consumer.expensive.instance_id
+
+        # Assert
+        self.assertEqual(constructed_before_access, 0)
+        self.assertEqual(MockExpensiveDependency.constructed, 1)
+        self.assertEqual(instance_id, consumer.expensive.value.instance_id)
+        self.assertIs(consumer.expensive.value,
+                      service_provider.resolve(MockExpensiveDependency))
+
+    def test_singleton_holds_factory_of_transient(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_transient(MockExpensiveDependency)
+        service_collection.add_singleton(MockFactoryConsumer)
+
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Act
+        consumer = service_provider.resolve(MockFactoryConsumer)
+        first = consumer.create_expensive()
+        second = consumer.create_expensive()
+
+        # Assert
+        self.assertIsInstance(first, MockExpensiveDependency)
+        self.assertIsNot(first, second)
+
+    def test_singleton_lazy_of_transient(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_transient(MockExpensiveDependency)
+        service_collection.add_singleton(MockLazyConsumer)
+
+        # Act / Assert
+        with self.assertRaises(TransientDependencyInjectionError):
+            ServiceProvider(service_collection).build()
+
+    def test_singleton_factory_of_scoped(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_scoped(MockExpensiveDependency)
+        service_collection.add_singleton(MockFactoryConsumer)
+
+        # Act / Assert
+        with self.assertRaises(ScopedDependencyInjectionError):
+            ServiceProvider(service_collection).build()
+
+    def test_lazy_forward_reference(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockForwardDependency)
+        service_collection.add_singleton(MockForwardLazyConsumer)
+
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Act
+        consumer = service_provider.resolve(MockForwardLazyConsumer)
+
+        # Assert
+        self.assertIs(consumer.expensive.value,
+                      service_provider.resolve(MockForwardDependency))
+
+    def test_unresolvable_forward_reference(self):
+        # Arrange
+        service_collection = ServiceCollection()
+
+        # Act / Assert
+        with self.assertRaises(InvalidDependencyChainError) as context:
+            service_collection.add_singleton(MockUnresolvableConsumer)
+
+        self.assertIn("'missing'", str(context.exception))
+
+    def test_lazy_in_scope(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_scoped(MockExpensiveDependency)
+        service_collection.add_transient(MockLazyConsumer)
+
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Act
+        with service_provider.create_scope() as scope:
+            consumer = scope.resolve(MockLazyConsumer)
+            scoped = scope.resolve(MockExpensiveDependency)
+
+            # Assert
+            self.assertIs(consumer.expensive.value, scoped)
+
+
+class TestResolutionStats(unittest.TestCase):
+    def test_stats(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_transient(MockNestedDependency)
+        service_collection.add_scoped(MockDependency)
+
+        service_provider = ServiceProvider(
+            service_collection, collect_stats=True).build()
+
+        # Act
+        for _ in range(3):
+            service_provider.resolve(MockNestedDependency)
+
+        with service_provider.create_scope() as scope:
+            scope.resolve(MockDependency)
+            scope.resolve(MockDependency)
+
+        stats = service_provider.stats()
+
+        # Assert
+        self.assertEqual(stats['MockNestedDependency']['resolves'], 3)
+        self.assertEqual(stats['MockNestedDependency']['transient_activations'], 3)
+        self.assertEqual(stats['MockConfiguration']['resolves'], 3)
+        self.assertEqual(stats['MockConfiguration']['constructions'], 1)
+        self.assertEqual(stats['MockConfiguration']['singleton_hits'], 2)
+        self.assertEqual(stats['MockDependency']['resolves'], 2)
+        self.assertEqual(stats['MockDependency']['scoped_hits'], 1)
+        self.assertEqual(
+            sum(stats['MockNestedDependency']['construction_histogram'].values()), 3)
+
+    def test_stats_disabled(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockConfiguration)
+
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Act / Assert
+        with self.assertRaises(Exception):
+            service_provider.stats()
+
+
+class TestRegistrationMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, 'di-cache.json')
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _get_service_collection(self):
+        service_collection = ServiceCollection(
+            metadata_cache=RegistrationMetadataCache(self._path))
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_singleton(MockNestedDependency)
+        service_collection.add_transient(MockLazyConsumer)
+        service_collection.add_singleton(MockExpensiveDependency)
+        return service_collection
+
+    def test_warm_start_skips_introspection_and_validation(self):
+        # Arrange
+        ServiceProvider(self._get_service_collection()).build()
+
+        # Act
+        with patch('framework.di.service_collection.get_signature',
+                   side_effect=AssertionError('introspected')), \
+                patch.object(ServiceProvider, '_topological_sort',
+                             side_effect=AssertionError('validated')):
+            service_provider = ServiceProvider(
+                self._get_service_collection()).build()
+
+        # Assert
+        dependency = service_provider.resolve(MockNestedDependency)
+        consumer = service_provider.resolve(MockLazyConsumer)
+
+        self.assertIs(dependency.configuration,
+                      service_provider.resolve(MockConfiguration))
+        self.assertIsInstance(consumer.expensive, Lazy)
+
+    def test_stale_entry_is_ignored(self):
+        # Arrange
+        ServiceProvider(self._get_service_collection()).build()
+
+        with open(self._path, 'r') as file:
+            data = json.loads(file.read())
+        for entry in data['types'].values():
+            entry['fingerprint'] = [['stale', 0, 0]]
+        data['build_orders'] = dict()
+        with open(self._path, 'w') as file:
+            file.write(json.dumps(data))
+
+        # Act
+        with patch('framework.di.service_collection.get_signature',
+                   wraps=service_collection_module.get_signature) as get_signature:
+            ServiceProvider(self._get_service_collection()).build()
+
+        # Assert
+        self.assertTrue(get_signature.called)
+
+
+class TestChildServiceProvider(unittest.TestCase):
+    def _get_service_provider(self):
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_singleton(MockNestedDependency)
+        service_collection.add_singleton(MockDependency)
+        service_collection.add_transient(MockLazyConsumer)
+        service_collection.add_singleton(MockExpensiveDependency)
+        return ServiceProvider(service_collection).build()
+
+    def test_child_shares_parent_singletons(self):
+        # Arrange
+        parent = self._get_service_provider()
+        overrides = ServiceCollection()
+        overrides.add_singleton(MockDependency, instance=MockDependency())
+
+        # Act
+        child = parent.create_child(overrides)
+
+        # Assert
+        self.assertIs(child.resolve(MockNestedDependency),
+                      parent.resolve(MockNestedDependency))
+        self.assertIs(child.resolve(MockConfiguration),
+                      parent.resolve(MockConfiguration))
+
+    def test_child_override(self):
+        # Arrange
+        parent = self._get_service_provider()
+        configuration = MockConfiguration()
+        overrides = ServiceCollection()
+        overrides.add_singleton(MockConfiguration, instance=configuration)
+
+        parent_dependency = parent.resolve(MockNestedDependency)
+
+        # Act
+        child = parent.create_child(overrides)
+        child_dependency = child.resolve(MockNestedDependency)
+
+        # Assert
+        self.assertIs(child.resolve(MockConfiguration), configuration)
+        self.assertIs(child_dependency.configuration, configuration)
+        self.assertIsNot(child_dependency, parent_dependency)
+        self.assertIs(child.resolve(MockNestedDependency), child_dependency)
+
+        # The parent is unaffected
+        self.assertIs(parent.resolve(MockNestedDependency), parent_dependency)
+        self.assertIsNot(parent.resolve(MockConfiguration), configuration)
+
+    def test_child_override_deferred_dependency(self):
+        # Arrange
+        parent = self._get_service_provider()
+        expensive = MockExpensiveDependency()
+        overrides = ServiceCollection()
+        overrides.add_singleton(MockExpensiveDependency, instance=expensive)
+
+        # Act
+        child = parent.create_child(overrides)
+        consumer = child.resolve(MockLazyConsumer)
+
+        # Assert
+        self.assertIs(consumer.expensive.value, expensive)
+        self.assertIsNot(parent.resolve(MockLazyConsumer).expensive.value, expensive)
+
+    def test_child_scope(self):
+        # Arrange
+        parent = self._get_service_provider()
+        configuration = MockConfiguration()
+        overrides = ServiceCollection()
+        overrides.add_singleton(MockConfiguration, instance=configuration)
+        child = parent.create_child(overrides)
+
+        # Act
+        with child.create_scope() as scope:
+            dependency = scope.resolve(MockNestedDependency)
+
+        # Assert
+        self.assertIs(dependency.configuration, configuration)
+
+    def test_inject_test_dependency(self):
+        # Arrange
+        parent = self._get_service_provider()
+        configuration = MockConfiguration()
+
+        # Act
+        child = inject_test_dependency(
+            provider=parent,
+            _type=MockConfiguration,
+            instance=configuration)
+        child = inject_mock_middleware(
+            provider=child)
+
+        # Assert
+        self.assertIs(child.resolve(MockNestedDependency).configuration, configuration)
+        self.assertTrue(child.resolve(AuthMiddleware).validate_access_token())
+        self.assertIsNot(parent.resolve(MockConfiguration), configuration)
+
+
+class MockCacheClient:
+    def __init__(
+        self,
+        configuration: MockConfiguration
+    ):
+        self.configuration = configuration
+
+
+class MockRedisCacheClient(MockCacheClient):
+    pass
+
+
+class TestKeyedRegistrations(unittest.IsolatedAsyncioTestCase):
+    def _get_service_collection(self):
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_singleton(MockCacheClient)
+        service_collection.add_singleton(MockCacheClient, key='sessions')
+        service_collection.add_singleton(
+            MockCacheClient, MockRedisCacheClient, key='tokens')
+        return service_collection
+
+    def test_resolve_keyed(self):
+        # Arrange
+        service_provider = ServiceProvider(self._get_service_collection()).build()
+
+        # Act
+        default = service_provider.resolve(MockCacheClient)
+        sessions = service_provider.resolve(MockCacheClient, key='sessions')
+        tokens = service_provider.resolve(MockCacheClient, key='tokens')
+
+        # Assert
+        self.assertEqual(len({id(default), id(sessions), id(tokens)}), 3)
+        self.assertIsInstance(tokens, MockRedisCacheClient)
+        self.assertIs(service_provider.resolve(MockCacheClient, key='sessions'), sessions)
+        self.assertIs(sessions.configuration, default.configuration)
+
+        with self.assertRaises(RegistrationNotFoundError):
+            service_provider.resolve(MockCacheClient, key='missing')
+
+    def test_resolve_all(self):
+        # Arrange
+        service_collection = self._get_service_collection()
+        service_collection.add_transient(MockDependency)
+        service_collection.add_transient(MockDependency)
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Act
+        clients = service_provider.resolve_all(MockCacheClient)
+        dependencies = service_provider.resolve_all(MockDependency)
+
+        # Assert
+        self.assertEqual(clients, (
+            service_provider.resolve(MockCacheClient),
+            service_provider.resolve(MockCacheClient, key='sessions'),
+            service_provider.resolve(MockCacheClient, key='tokens')))
+        self.assertIs(service_provider.resolve_all(MockCacheClient), clients)
+
+        self.assertEqual(len(dependencies), 2)
+        self.assertIsNot(dependencies[0], dependencies[1])
+        self.assertIsNot(service_provider.resolve_all(MockDependency)[0], dependencies[0])
+
+        self.assertEqual(service_provider.resolve_all(MockScopedResource), ())
+
+    def test_keyed_registration_replaced(self):
+        # Arrange
+        service_collection = self._get_service_collection()
+        service_collection.add_singleton(
+            MockCacheClient, MockRedisCacheClient, key='sessions')
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Act
+        clients = service_provider.resolve_all(MockCacheClient)
+
+        # Assert
+        self.assertEqual(len(clients), 3)
+        self.assertIsInstance(
+            service_provider.resolve(MockCacheClient, key='sessions'),
+            MockRedisCacheClient)
+
+    def test_replaced_factory_not_built(self):
+        # Arrange
+        calls = []
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(
+            MockConfiguration, factory=lambda provider: calls.append('first') or MockConfiguration())
+        service_collection.add_singleton(
+            MockConfiguration, factory=lambda provider: calls.append('second') or MockConfiguration())
+
+        # Act
+        ServiceProvider(service_collection).build()
+
+        # Assert
+        self.assertEqual(calls, ['second'])
+
+    def test_replaced_registration_not_validated(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_transient(MockConfiguration)
+        service_collection.add_singleton(MockCacheClient)
+        service_collection.add_singleton(
+            MockCacheClient, factory=lambda provider: MockRedisCacheClient(None))
+
+        # Act
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Assert
+        self.assertIsInstance(service_provider.resolve(MockCacheClient), MockRedisCacheClient)
+
+    def test_resolve_keyed_in_scope(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_scoped(MockScopedResource)
+        service_collection.add_scoped(MockScopedResource, key='audit')
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Act
+        with service_provider.create_scope() as scope:
+            default = scope.resolve(MockScopedResource)
+            audit = scope.resolve(MockScopedResource, key='audit')
+            resources = scope.resolve_all(MockScopedResource)
+
+        # Assert
+        self.assertIsNot(default, audit)
+        self.assertEqual(resources, (default, audit))
+
+    async def test_resolve_keyed_async(self):
+        # Arrange
+        async def factory(provider):
+            await asyncio.sleep(0)
+            return MockCacheClient(provider.resolve(MockConfiguration))
+
+        service_collection = self._get_service_collection()
+        service_collection.add_singleton(MockCacheClient, factory=factory, key='async')
+        service_provider = ServiceProvider(service_collection)
+        await service_provider.build_async()
+
+        # Act
+        client = await service_provider.resolve_async(MockCacheClient, key='async')
+        sessions = await service_provider.resolve_async(MockCacheClient, key='sessions')
+
+        # Assert
+        self.assertIs(service_provider.resolve(MockCacheClient, key='async'), client)
+        self.assertIs(service_provider.resolve(MockCacheClient, key='sessions'), sessions)
+
+    def test_child_keyed_override(self):
+        # Arrange
+        parent = ServiceProvider(self._get_service_collection()).build()
+        configuration = MockConfiguration()
+        overrides = ServiceCollection()
+        overrides.add_singleton(MockConfiguration, instance=configuration)
+
+        # Act
+        child = parent.create_child(overrides)
+
+        # Assert
+        self.assertIs(child.resolve(MockCacheClient, key='sessions').configuration,
+                      configuration)
+        self.assertIsNot(parent.resolve(MockCacheClient, key='sessions').configuration,
+                         configuration)
+        self.assertTrue(all(client.configuration is configuration
+                            for client in child.resolve_all(MockCacheClient)))
+
+
+T = TypeVar('T')
+
+
+class MockUser:
+    pass
+
+
+class MockOrder:
+    pass
+
+
+class MockEntitySchema(Generic[T]):
+    def __init__(self):
+        self.instance_id = str(uuid4())
+
+
+class MockRepositoryBase(Generic[T]):
+    pass
+
+
+class MockRepository(MockRepositoryBase[T]):
+    def __init__(
+        self,
+        configuration: MockConfiguration,
+        schema: MockEntitySchema[T]
+    ):
+        self.configuration = configuration
+        self.schema = schema
+
+
+class MockUserService:
+    def __init__(
+        self,
+        users: MockRepositoryBase[MockUser]
+    ):
+        self.users = users
+
+
+class TestOpenGenericRegistrations(unittest.TestCase):
+    def _get_service_collection(self):
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_singleton(MockEntitySchema[T])
+        service_collection.add_singleton(MockRepositoryBase[T], MockRepository)
+        service_collection.add_transient(MockUserService)
+        return service_collection
+
+    def test_resolve_closed_generic(self):
+        # Arrange
+        service_provider = ServiceProvider(self._get_service_collection()).build()
+
+        # Act
+        users = service_provider.resolve(MockRepositoryBase[MockUser])
+        orders = service_provider.resolve(MockRepositoryBase[MockOrder])
+
+        # Assert
+        self.assertIsInstance(users, MockRepository)
+        self.assertEqual(users.__orig_class__, MockRepository[MockUser])
+        self.assertEqual(users.schema.__orig_class__, MockEntitySchema[MockUser])
+        self.assertIs(service_provider.resolve(MockRepositoryBase[MockUser]), users)
+        self.assertIsNot(orders, users)
+        self.assertIsNot(orders.schema, users.schema)
+        self.assertIs(users.configuration, service_provider.resolve(MockConfiguration))
+        self.assertIs(service_provider.resolve(MockUserService).users, users)
+
+    def test_closed_plan_cached(self):
+        # Arrange
+        service_provider = ServiceProvider(self._get_service_collection())
+
+        # Act
+        with patch.object(service_provider_module, 'close_registration',
+                          wraps=service_provider_module.close_registration) as close_registration:
+            service_provider.build()
+            for _ in range(10):
+                service_provider.resolve(MockUserService)
+
+        # Assert
+        self.assertEqual(close_registration.call_count, 2)
+        self.assertIn(MockRepositoryBase[MockUser], service_provider._activators)
+
+    def test_closed_generic_in_scope(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_scoped(MockEntitySchema[T])
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Act
+        with service_provider.create_scope() as scope:
+            first = scope.resolve(MockEntitySchema[MockUser])
+            second = scope.resolve(MockEntitySchema[MockUser])
+        with service_provider.create_scope() as scope:
+            third = scope.resolve(MockEntitySchema[MockUser])
+
+        # Assert
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+
+    def test_unregistered_generic(self):
+        # Arrange
+        service_provider = ServiceProvider(ServiceCollection()).build()
+
+        # Act / Assert
+        with self.assertRaises(RegistrationNotFoundError):
+            service_provider.resolve(MockEntitySchema[MockUser])
+
+    def test_open_generic_factory_not_supported(self):
+        # Arrange
+        service_collection = ServiceCollection()
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            service_collection.add_singleton(
+                MockEntitySchema[T], factory=lambda provider: None)
+
+    def test_child_overrides_open_generic(self):
+        # Arrange
+        parent = ServiceProvider(self._get_service_collection()).build()
+        overrides = ServiceCollection()
+        overrides.add_transient(MockEntitySchema[T])
+
+        # Act
+        child = parent.create_child(overrides)
+
+        # Assert
+        self.assertIsNot(child.resolve(MockEntitySchema[MockUser]),
+                         child.resolve(MockEntitySchema[MockUser]))
+        self.assertIs(parent.resolve(MockEntitySchema[MockUser]),
+                      parent.resolve(MockEntitySchema[MockUser]))
+
+
+class MockCycleA:
+    def __init__(self, b):
+        self.b = b
+
+
+class MockCycleB:
+    def __init__(self, a: MockCycleA):
+        self.a = a
+
+
+class MockCycleC:
+    def __init__(self, c):
+        self.c = c
+
+
+MockCycleA.__init__.__annotations__['b'] = MockCycleB
+MockCycleC.__init__.__annotations__['c'] = MockCycleC
+
+
+class TestDependencyValidation(unittest.TestCase):
+    def test_cycle_paths(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_singleton(MockNestedDependency)
+        service_collection.add_singleton(MockCycleA)
+        service_collection.add_singleton(MockCycleB)
+        service_collection.add_transient(MockCycleC)
+
+        # Act
+        with self.assertRaises(DependencyCycleError) as context:
+            ServiceProvider(service_collection).build()
+
+        # Assert
+        self.assertIsInstance(context.exception, InvalidDependencyChainError)
+        self.assertCountEqual(context.exception.cycles, [
+            [MockCycleA, MockCycleB, MockCycleA],
+            [MockCycleC, MockCycleC]])
+        self.assertIn('MockCycleA -> MockCycleB -> MockCycleA', str(context.exception))
+
+    def test_validation_cached_until_registration_changes(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockConfiguration)
+        service_collection.add_singleton(MockNestedDependency, eager=True)
+        ServiceProvider(service_collection).build()
+
+        # Act
+        with patch.object(ServiceProvider, '_topological_sort',
+                          side_effect=AssertionError('validated')):
+            service_provider = ServiceProvider(service_collection).build()
+
+        service_collection.add_transient(MockDependency)
+        with patch.object(ServiceProvider, '_topological_sort',
+                          wraps=service_provider._topological_sort) as topological_sort:
+            ServiceProvider(service_collection).build()
+
+        # Assert
+        self.assertEqual(service_provider.built_types, [MockNestedDependency])
+        self.assertEqual(topological_sort.call_count, 1)
+
+    def test_build_order(self):
+        # Arrange
+        service_collection = ServiceCollection()
+        service_collection.add_singleton(MockNestedDependency, eager=True)
+        service_collection.add_transient(MockDependency)
+        service_collection.add_singleton(MockConfiguration, eager=True)
+
+        # Act
+        service_provider = ServiceProvider(service_collection).build()
+
+        # Assert
+        self.assertEqual(service_provider.built_types,
+                         [MockConfiguration, MockNestedDependency])
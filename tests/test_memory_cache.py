@@ -0,0 +1,590 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from framework.caching import (EvictionPolicy, MemoryCache, memoize,
+                               memoize_async)
+from framework.caching import memory_cache
+from framework.caching.memoize import make_key
+from framework.caching.frequency_sketch import FrequencySketch
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_get_set(self):
+        # Arrange
+        cache = MemoryCache(max_entries=10)
+
+        # Act
+        cache.set('key', 'value', ttl=60)
+
+        # Assert
+        self.assertEqual(cache.get('key'), 'value')
+        self.assertIsNone(cache.get('missing'))
+
+    def test_expired_key(self):
+        # Arrange
+        cache = MemoryCache(max_entries=10)
+        cache.set('key', 'value', ttl=0.01)
+
+        # Act
+        time.sleep(0.02)
+
+        # Assert
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.stats.expirations, 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        # Arrange
+        cache = MemoryCache(max_entries=3)
+        for key in ['a', 'b', 'c']:
+            cache.set(key, key, ttl=60)
+
+        # Act
+        cache.get('a')
+        cache.set('d', 'd', ttl=60)
+
+        # Assert
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'a')
+        self.assertEqual(cache.get('d'), 'd')
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_max_bytes(self):
+        # Arrange
+        cache = MemoryCache(max_bytes=1000, sizeof=lambda value: 100)
+
+        # Act
+        for index in range(20):
+            cache.set(f'key-{index}', index, ttl=60)
+
+        # Assert
+        self.assertEqual(len(cache), 5)
+        self.assertEqual(cache.stats.evictions, 15)
+        self.assertEqual(cache.stats.evicted_bytes, 15 * 200)
+        self.assertEqual(cache.get('key-19'), 19)
+
+    def test_oversized_value_rejected(self):
+        # Arrange
+        cache = MemoryCache(max_bytes=100)
+
+        # Act
+        cache.set('key', 'x' * 1000, ttl=60)
+
+        # Assert
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.stats.rejections, 1)
+
+    def test_tinylfu_admission(self):
+        # Arrange
+        cache = MemoryCache(max_entries=2, policy=EvictionPolicy.TinyLFU)
+        cache.set('hot-a', 'a', ttl=60)
+        cache.set('hot-b', 'b', ttl=60)
+        for _ in range(5):
+            cache.get('hot-a')
+            cache.get('hot-b')
+
+        # Act
+        cache.set('cold', 'c', ttl=60)
+
+        # Assert
+        self.assertIsNone(cache.get('cold'))
+        self.assertEqual(cache.get('hot-a'), 'a')
+        self.assertEqual(cache.stats.rejections, 1)
+
+    def test_instances_have_own_store(self):
+        # Arrange
+        first = MemoryCache()
+        second = MemoryCache()
+
+        # Act
+        first.set('key', 'value', ttl=60)
+
+        # Assert
+        self.assertIsNone(second.get('key'))
+
+    def test_namespace_shares_store(self):
+        # Arrange
+        first = MemoryCache(namespace='test-namespace')
+        second = MemoryCache(namespace='test-namespace')
+        other = MemoryCache(namespace='test-other-namespace')
+
+        # Act
+        first.set('key', 'value', ttl=60)
+
+        # Assert
+        self.assertEqual(second.get('key'), 'value')
+        self.assertIsNone(other.get('key'))
+
+    def test_sharded_store(self):
+        # Arrange
+        cache = MemoryCache(max_entries=400, shards=4)
+
+        # Act
+        for index in range(1000):
+            cache.set(f'key-{index}', index, ttl=60)
+
+        # Assert
+        self.assertEqual(len(cache._store.shards), 4)
+        self.assertLessEqual(len(cache), 400)
+        self.assertEqual(cache.stats.evictions, 1000 - len(cache))
+        self.assertTrue(all(len(shard.entries) == 100 for shard in cache._store.shards))
+
+    def test_default_shard_count(self):
+        # Assert
+        self.assertEqual(memory_cache.get_shard_count(None, None), 16)
+        self.assertEqual(memory_cache.get_shard_count(3, None), 1)
+        self.assertEqual(memory_cache.get_shard_count(256, None), 4)
+        self.assertEqual(memory_cache.get_shard_count(None, 1024), 1)
+
+
+@patch.object(memory_cache, 'EXPIRY_RESOLUTION', 0.01)
+class TestMemoryCacheExpiry(unittest.IsolatedAsyncioTestCase):
+    def test_sweep_removes_unread_keys(self):
+        # Arrange
+        clock = MagicMock()
+        clock.time.return_value = time.time()
+        cache = MemoryCache(max_entries=1000)
+
+        # Act
+        with patch.object(memory_cache, 'time', clock):
+            for index in range(500):
+                cache.set(f'key-{index}', index, ttl=0.01)
+            cache.set('live', 'value', ttl=60)
+
+            clock.time.return_value += 0.03
+            removed = cache.sweep()
+
+        # Assert
+        self.assertEqual(removed, 500)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get('live'), 'value')
+        self.assertEqual(cache.stats.expirations, 500)
+
+    def test_writes_sweep_incrementally(self):
+        # Arrange
+        clock = MagicMock()
+        clock.time.return_value = time.time()
+        cache = MemoryCache(max_entries=1000, shards=1)
+
+        # Act
+        with patch.object(memory_cache, 'time', clock):
+            for index in range(20):
+                cache.set(f'key-{index}', index, ttl=0.01)
+
+            clock.time.return_value += 0.03
+            cache.set('live', 'value', ttl=60)
+
+        # Assert
+        self.assertEqual(len(cache), 21 - memory_cache.WRITE_SWEEP_LIMIT)
+
+    def test_overwritten_key_not_swept(self):
+        # Arrange
+        cache = MemoryCache(max_entries=10)
+        cache.set('key', 'old', ttl=0.01)
+
+        # Act
+        cache.set('key', 'new', ttl=60)
+        time.sleep(0.03)
+        removed = cache.sweep()
+
+        # Assert
+        self.assertEqual(removed, 0)
+        self.assertEqual(cache.get('key'), 'new')
+
+    def test_background_sweeper(self):
+        # Arrange
+        cache = MemoryCache(max_entries=10)
+        cache.set('key', 'value', ttl=0.01)
+
+        # Act
+        cache.start_sweeper(interval=0.01)
+        try:
+            time.sleep(0.1)
+        finally:
+            cache.stop_sweeper()
+
+        # Assert
+        self.assertEqual(len(cache), 0)
+
+    async def test_async_sweeper(self):
+        # Arrange
+        cache = MemoryCache(max_entries=10)
+        cache.set('key', 'value', ttl=0.01)
+
+        # Act
+        task = asyncio.create_task(cache.run_sweeper_async(interval=0.01))
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+        # Assert
+        self.assertEqual(len(cache), 0)
+
+
+class TestMemoryCacheGetOrSet(unittest.IsolatedAsyncioTestCase):
+    def test_single_flight_threads(self):
+        # Arrange
+        cache = MemoryCache()
+        calls = []
+        results = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'value'
+
+        def run():
+            results.append(cache.get_or_set('key', loader, ttl=60))
+
+        threads = [threading.Thread(target=run) for _ in range(20)]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 20)
+        self.assertEqual(cache.get('key'), 'value')
+
+    async def test_single_flight_coroutines(self):
+        # Arrange
+        cache = MemoryCache()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'value'
+
+        # Act
+        results = await asyncio.gather(*[
+            cache.get_or_set_async('key', loader, ttl=60)
+            for _ in range(50)])
+
+        # Assert
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 50)
+
+    async def test_thread_waits_on_coroutine_load(self):
+        # Arrange
+        cache = MemoryCache()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'value'
+
+        # Act
+        load = asyncio.create_task(cache.get_or_set_async('key', loader, ttl=60))
+        await asyncio.sleep(0.01)
+        result = await asyncio.to_thread(
+            cache.get_or_set, 'key', lambda: calls.append(2), 60)
+
+        # Assert
+        self.assertEqual(result, 'value')
+        self.assertEqual(await load, 'value')
+        self.assertEqual(calls, [1])
+
+    def test_failure_negatively_cached(self):
+        # Arrange
+        cache = MemoryCache()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            raise ValueError('unavailable')
+
+        # Act
+        for _ in range(3):
+            with self.assertRaises(ValueError):
+                cache.get_or_set('key', loader, ttl=60, negative_ttl=0.05)
+        negative = cache.get('key')
+        time.sleep(0.06)
+        value = cache.get_or_set('key', lambda: 'value', ttl=60)
+
+        # Assert
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(negative)
+        self.assertEqual(value, 'value')
+
+    async def test_cancelled_load_retried_by_waiter(self):
+        # Arrange
+        cache = MemoryCache()
+
+        async def slow_loader():
+            await asyncio.sleep(10)
+
+        async def loader():
+            return 'value'
+
+        # Act
+        owner = asyncio.create_task(cache.get_or_set_async('key', slow_loader, ttl=60))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(cache.get_or_set_async('key', loader, ttl=60))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+
+        # Assert
+        self.assertEqual(await waiter, 'value')
+        with self.assertRaises(asyncio.CancelledError):
+            await owner
+
+
+class TestMemoryCacheRefresh(unittest.IsolatedAsyncioTestCase):
+    def test_stale_value_refreshed_once(self):
+        # Arrange
+        cache = MemoryCache()
+        values = iter(['first', 'second'])
+        calls = []
+
+        def loader():
+            calls.append(1)
+            time.sleep(0.02)
+            return next(values)
+
+        cache.get_or_set('key', loader, ttl=60, soft_ttl=0.05)
+        time.sleep(0.06)
+
+        # Act
+        stale = [cache.get_or_set('key', loader, ttl=60, soft_ttl=0.05) for _ in range(10)]
+        stale.append(cache.get('key'))
+        time.sleep(0.1)
+
+        # Assert
+        self.assertEqual(stale, ['first'] * 11)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cache.get('key'), 'second')
+        self.assertEqual(cache.stats.refreshes, 1)
+
+    async def test_stale_value_refreshed_once_async(self):
+        # Arrange
+        cache = MemoryCache()
+        values = iter(['first', 'second'])
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return next(values)
+
+        await cache.get_or_set_async('key', loader, ttl=60, soft_ttl=0.05)
+        await asyncio.sleep(0.06)
+
+        # Act
+        stale = await asyncio.gather(*[
+            cache.get_or_set_async('key', loader, ttl=60, soft_ttl=0.05)
+            for _ in range(20)])
+        await asyncio.sleep(0.1)
+
+        # Assert
+        self.assertEqual(stale, ['first'] * 20)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cache.get('key'), 'second')
+
+    def test_failed_refresh_serves_stale(self):
+        # Arrange
+        cache = MemoryCache()
+        cache.get_or_set('key', lambda: 'first', ttl=60, soft_ttl=0.01)
+        time.sleep(0.02)
+
+        def loader():
+            raise ValueError('unavailable')
+
+        cache._store.get_shard('key').entries['key'].refresh = loader
+
+        # Act
+        value = cache.get('key')
+        time.sleep(0.05)
+
+        # Assert
+        self.assertEqual(value, 'first')
+        self.assertEqual(cache.get('key'), 'first')
+        self.assertEqual(cache.stats.refresh_failures, 1)
+
+    def test_early_expiration(self):
+        # Arrange
+        cache = MemoryCache()
+        values = iter(['first', 'second'])
+        cache.get_or_set('key', lambda: next(values), ttl=60, beta=1.0)
+        cache._store.get_shard('key').entries['key'].delta = 10.0
+
+        # Act
+        with patch.object(memory_cache.random, 'random', return_value=0.999999):
+            value = cache.get('key')
+        time.sleep(0.05)
+
+        # Assert
+        self.assertEqual(value, 'first')
+        self.assertEqual(cache.get('key'), 'second')
+
+    def test_no_early_expiration_for_fast_loads(self):
+        # Arrange
+        cache = MemoryCache()
+        values = iter(['first', 'second'])
+        cache.get_or_set('key', lambda: next(values), ttl=60, beta=1.0)
+
+        # Act
+        for _ in range(1000):
+            cache.get('key')
+        time.sleep(0.02)
+
+        # Assert
+        self.assertEqual(cache.get('key'), 'first')
+
+
+class TestMemoize(unittest.IsolatedAsyncioTestCase):
+    def test_memoize(self):
+        # Arrange
+        calls = []
+
+        @memoize(ttl=60, maxsize=2)
+        def square(value, offset=0):
+            calls.append(value)
+            return value * value + offset
+
+        # Act
+        results = [square(2), square(2), square(3), square(2, offset=1), square(2)]
+
+        # Assert
+        self.assertEqual(results, [4, 4, 9, 5, 4])
+        self.assertEqual(calls, [2, 3, 2, 2])
+        stats = square.cache_stats()
+        self.assertEqual(stats.hits, 1)
+        self.assertEqual(stats.misses, 4)
+        self.assertEqual(stats.evictions, 2)
+        self.assertEqual(square.__name__, 'square')
+
+    def test_invalidate(self):
+        # Arrange
+        calls = []
+
+        @memoize()
+        def load(name):
+            calls.append(name)
+            return name.upper()
+
+        load('a')
+        load('b')
+
+        # Act
+        removed = load.invalidate('a')
+        load('a')
+        load('b')
+        load.clear()
+        load('b')
+
+        # Assert
+        self.assertTrue(removed)
+        self.assertEqual(calls, ['a', 'b', 'a', 'b'])
+
+    def test_custom_key(self):
+        # Arrange
+        calls = []
+
+        @memoize(key=lambda jwk: jwk['kid'])
+        def load(jwk):
+            calls.append(jwk)
+            return jwk['kid']
+
+        # Act
+        load({'kid': 'a', 'n': 1})
+        load({'kid': 'a', 'n': 2})
+
+        # Assert
+        self.assertEqual(len(calls), 1)
+
+    def test_ttl(self):
+        # Arrange
+        calls = []
+
+        @memoize(ttl=0.02)
+        def load():
+            calls.append(1)
+
+        # Act
+        load()
+        load()
+        time.sleep(0.03)
+        load()
+
+        # Assert
+        self.assertEqual(len(calls), 2)
+
+    def test_make_key(self):
+        # Assert
+        self.assertEqual(make_key((1,), {}), 1)
+        self.assertEqual(make_key((1, 2), {}), (1, 2))
+        self.assertNotEqual(make_key((1,), {'a': 2}), make_key((1, 'a', 2), {}))
+
+    async def test_memoize_async_in_flight(self):
+        # Arrange
+        calls = []
+
+        @memoize_async(ttl=60)
+        async def load(name):
+            calls.append(name)
+            await asyncio.sleep(0.02)
+            return name.upper()
+
+        # Act
+        results = await asyncio.gather(*[load('a') for _ in range(20)], load('b'))
+
+        # Assert
+        self.assertEqual(results, ['A'] * 20 + ['B'])
+        self.assertEqual(calls, ['a', 'b'])
+
+    async def test_memoize_async_requires_coroutine(self):
+        # Assert
+        with self.assertRaises(TypeError):
+            memoize_async()(lambda: None)
+
+    async def test_exceptions_not_cached(self):
+        # Arrange
+        calls = []
+
+        @memoize_async()
+        async def load():
+            calls.append(1)
+            raise ValueError('failed')
+
+        # Act
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                await load()
+
+        # Assert
+        self.assertEqual(len(calls), 2)
+
+
+class TestFrequencySketch(unittest.TestCase):
+    def test_frequency(self):
+        # Arrange
+        sketch = FrequencySketch(capacity=64)
+
+        # Act
+        for _ in range(5):
+            sketch.increment('key')
+
+        # Assert
+        self.assertGreaterEqual(sketch.frequency('key'), 5)
+        self.assertEqual(sketch.frequency('other'), 0)
+
+    def test_reset_halves_counts(self):
+        # Arrange
+        sketch = FrequencySketch(capacity=16)
+        for _ in range(15):
+            sketch.increment('key')
+
+        # Act
+        for index in range(10 * 16):
+            sketch.increment(index)
+
+        # Assert
+        self.assertLess(sketch.frequency('key'), 15)
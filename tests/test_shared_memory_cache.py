@@ -0,0 +1,174 @@
+import multiprocessing
+import tempfile
+import time
+import unittest
+from uuid import uuid4
+
+from framework.caching.shared_memory_cache import SharedMemoryCache
+
+
+def set_values(directory: str, name: str, worker: int, count: int) -> None:
+    cache = SharedMemoryCache(name, directory=directory)
+    for index in range(count):
+        cache.set(f'{worker}:{index}', {'worker': worker, 'index': index}, ttl=60)
+
+
+def load_value(directory: str, name: str, loads) -> None:
+    cache = SharedMemoryCache(name, directory=directory)
+
+    def loader():
+        with loads.get_lock():
+            loads.value += 1
+        return 'value'
+
+    cache.get_or_set('key', loader, ttl=60)
+
+
+class TestSharedMemoryCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.name = uuid4().hex
+
+    def create_cache(self, **kwargs) -> SharedMemoryCache:
+        cache = SharedMemoryCache(self.name, directory=self.directory, **kwargs)
+        self.addCleanup(cache.unlink)
+        return cache
+
+    def test_get_set(self):
+        # Arrange
+        cache = self.create_cache()
+
+        # Act
+        cache.set('key', {'value': [1, 2]}, ttl=60)
+        cache.set('none', None, ttl=60)
+
+        # Assert
+        self.assertEqual(cache.get('key'), {'value': [1, 2]})
+        self.assertIsNone(cache.get('missing'))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+
+    def test_overwrite_and_delete(self):
+        # Arrange
+        cache = self.create_cache()
+        cache.set('key', 'first', ttl=60)
+
+        # Act
+        cache.set('key', 'second', ttl=60)
+        value = cache.get('key')
+        deleted = cache.delete('key')
+
+        # Assert
+        self.assertEqual(value, 'second')
+        self.assertTrue(deleted)
+        self.assertFalse(cache.delete('key'))
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(len(cache), 0)
+
+    def test_expired_key(self):
+        # Arrange
+        cache = self.create_cache()
+        cache.set('key', 'value', ttl=0.01)
+
+        # Act
+        time.sleep(0.02)
+
+        # Assert
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.stats.expirations, 1)
+
+    def test_value_larger_than_slot_rejected(self):
+        # Arrange
+        cache = self.create_cache(slot_size=128)
+
+        # Act
+        stored = cache.set('key', 'x' * 1000, ttl=60)
+
+        # Assert
+        self.assertFalse(stored)
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.stats.rejections, 1)
+
+    def test_full_table_evicts_earliest_expiring(self):
+        # Arrange
+        cache = self.create_cache(slots=8, segments=1)
+        for index in range(8):
+            cache.set(str(index), index, ttl=60 + index)
+
+        # Act
+        cache.set('new', 'new', ttl=60)
+
+        # Assert
+        self.assertEqual(cache.get('new'), 'new')
+        self.assertIsNone(cache.get('0'))
+        self.assertEqual(cache.get('7'), 7)
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertEqual(len(cache), 8)
+
+    def test_caches_of_same_name_share_entries(self):
+        # Arrange
+        cache = self.create_cache()
+        other = SharedMemoryCache(self.name, directory=self.directory)
+
+        # Act
+        cache.set('key', 'value', ttl=60)
+
+        # Assert
+        self.assertEqual(other.get('key'), 'value')
+
+    def test_get_or_set(self):
+        # Arrange
+        cache = self.create_cache()
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return 'value'
+
+        # Act
+        first = cache.get_or_set('key', loader, ttl=60)
+        second = cache.get_or_set('key', loader, ttl=60)
+
+        # Assert
+        self.assertEqual(first, 'value')
+        self.assertEqual(second, 'value')
+        self.assertEqual(len(loads), 1)
+
+    def test_entries_shared_across_processes(self):
+        # Arrange
+        cache = self.create_cache()
+        context = multiprocessing.get_context('spawn')
+        workers = [context.Process(target=set_values, args=(self.directory, self.name, worker, 50))
+                   for worker in range(4)]
+
+        # Act
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        # Assert
+        self.assertTrue(all(worker.exitcode == 0 for worker in workers))
+        self.assertEqual(len(cache), 200)
+        self.assertEqual(cache.get('3:49'), {'worker': 3, 'index': 49})
+
+    def test_workers_read_values_written_earlier(self):
+        # Arrange
+        cache = self.create_cache()
+        cache.set('key', 'value', ttl=60)
+        context = multiprocessing.get_context('spawn')
+        loads = context.Value('i', 0)
+        workers = [context.Process(target=load_value, args=(self.directory, self.name, loads))
+                   for _ in range(3)]
+
+        # Act
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        # Assert
+        self.assertEqual(loads.value, 0)
@@ -0,0 +1,220 @@
+import asyncio
+import json
+import unittest
+
+from framework.caching.tiered_cache import CacheInvalidationBus, TieredCache
+
+
+class FakeCacheClient:
+    '''
+    An in-process stand-in for CacheClientAsync, counting reads.
+    '''
+
+    def __init__(self, delay: float = 0):
+        self.values = dict()
+        self.reads = 0
+        self.delay = delay
+
+    async def get_cache(self, key: str):
+        self.reads += 1
+        value = self.values.get(key)
+        await asyncio.sleep(self.delay)
+        return value
+
+    async def get_json(self, key: str):
+        value = await self.get_cache(key)
+        return json.loads(value) if value is not None else None
+
+    async def set_cache(self, key: str, value: str, ttl=60):
+        self.values[key] = value
+
+    async def set_json(self, key: str, value, ttl=60):
+        self.values[key] = json.dumps(value)
+
+    async def delete_key(self, key: str):
+        self.values.pop(key, None)
+
+    async def delete_keys(self, keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+
+class TestTieredCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = FakeCacheClient()
+        self.bus = CacheInvalidationBus()
+
+    async def create_cache(self) -> TieredCache:
+        cache = TieredCache(self.client, bus=self.bus)
+        await cache.start()
+        self.addAsyncCleanup(cache.aclose)
+        return cache
+
+    async def test_reads_served_from_l1(self):
+        # Arrange
+        cache = await self.create_cache()
+        await cache.set_json('key', {'value': 1})
+
+        # Act
+        first = await cache.get_json('key')
+        second = await cache.get_json('key')
+
+        # Assert
+        self.assertEqual(first, {'value': 1})
+        self.assertEqual(second, {'value': 1})
+        self.assertEqual(self.client.reads, 1)
+
+    async def test_string_and_json_reads_kept_apart(self):
+        # Arrange
+        cache = await self.create_cache()
+        await cache.set_json('key', [1, 2])
+
+        # Act
+        value = await cache.get_cache('key')
+        parsed = await cache.get_json('key')
+
+        # Assert
+        self.assertEqual(value, '[1, 2]')
+        self.assertEqual(parsed, [1, 2])
+
+    async def test_concurrent_misses_read_l2_once(self):
+        # Arrange
+        self.client.delay = 0.01
+        cache = await self.create_cache()
+        await cache.set_cache('key', 'value')
+
+        # Act
+        values = await asyncio.gather(*[cache.get_cache('key') for _ in range(20)])
+
+        # Assert
+        self.assertEqual(values, ['value'] * 20)
+        self.assertEqual(self.client.reads, 1)
+
+    async def test_write_invalidates_other_caches(self):
+        # Arrange
+        writer = await self.create_cache()
+        reader = await self.create_cache()
+        await writer.set_json('key', {'version': 1})
+        await reader.get_json('key')
+
+        # Act
+        await writer.set_json('key', {'version': 2})
+        value = await reader.get_json('key')
+
+        # Assert
+        self.assertEqual(value, {'version': 2})
+        self.assertEqual(self.client.reads, 2)
+
+    async def test_delete_invalidates_other_caches(self):
+        # Arrange
+        writer = await self.create_cache()
+        reader = await self.create_cache()
+        await writer.set_cache('a', '1')
+        await writer.set_cache('b', '2')
+        await reader.get_cache('a')
+        await reader.get_cache('b')
+
+        # Act
+        await writer.delete_keys(['a', 'b'])
+
+        # Assert
+        self.assertIsNone(await reader.get_cache('a'))
+        self.assertIsNone(await reader.get_cache('b'))
+
+    async def test_read_overlapping_invalidation_not_cached(self):
+        # Arrange
+        self.client.delay = 0.02
+        writer = await self.create_cache()
+        reader = await self.create_cache()
+        await writer.set_cache('key', 'old')
+
+        # Act
+        read = asyncio.create_task(reader.get_cache('key'))
+        await asyncio.sleep(0.005)
+        await writer.set_cache('key', 'new')
+        stale = await read
+        value = await reader.get_cache('key')
+
+        # Assert
+        self.assertEqual(stale, 'old')
+        self.assertEqual(value, 'new')
+
+    async def test_read_after_local_write_not_joined_to_stale_read(self):
+        # Arrange
+        self.client.delay = 0.02
+        cache = await self.create_cache()
+        await cache.set_cache('key', 'old')
+
+        # Act
+        read = asyncio.create_task(cache.get_cache('key'))
+        await asyncio.sleep(0.005)
+        await cache.set_cache('key', 'new')
+        value = await cache.get_cache('key')
+        stale = await read
+        cached = await cache.get_cache('key')
+
+        # Assert
+        self.assertEqual(stale, 'old')
+        self.assertEqual(value, 'new')
+        self.assertEqual(cached, 'new')
+        self.assertEqual(self.client.reads, 2)
+
+    async def test_missing_key_not_cached_in_l1(self):
+        # Arrange
+        cache = await self.create_cache()
+        first = await cache.get_json('key')
+
+        # Act
+        self.client.values['key'] = '{"value": 1}'
+        value = await cache.get_json('key')
+
+        # Assert
+        self.assertIsNone(first)
+        self.assertEqual(value, {'value': 1})
+        self.assertEqual(self.client.reads, 2)
+
+    async def test_l2_error_not_cached_in_l1(self):
+        # Arrange
+        cache = await self.create_cache()
+        self.client.values['key'] = 'value'
+        get_cache = self.client.get_cache
+
+        async def get_cache_failing(key: str):
+            # CacheClientAsync logs a Redis error and returns None
+            return None
+
+        self.client.get_cache = get_cache_failing
+        failed = await cache.get_cache('key')
+
+        # Act
+        self.client.get_cache = get_cache
+        value = await cache.get_cache('key')
+
+        # Assert
+        self.assertIsNone(failed)
+        self.assertEqual(value, 'value')
+
+    async def test_invalidate_all_clears_l1(self):
+        # Arrange
+        cache = await self.create_cache()
+        await cache.set_cache('key', 'value')
+        await cache.get_cache('key')
+
+        # Act
+        self.bus._dispatch(None, None)
+        await cache.get_cache('key')
+
+        # Assert
+        self.assertEqual(self.client.reads, 2)
+
+    async def test_l1_not_used_until_started(self):
+        # Arrange
+        cache = TieredCache(self.client, bus=self.bus)
+        await cache.set_cache('key', 'value')
+
+        # Act
+        await cache.get_cache('key')
+        await cache.get_cache('key')
+
+        # Assert
+        self.assertEqual(self.client.reads, 2)